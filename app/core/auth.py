@@ -1,3 +1,5 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from jose import jwt
 from app.db.models import User
@@ -6,12 +8,16 @@ from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 from app.exceptions.exceptions import UnauthorizedException
-from app.core.logger import logger
+from app.core.logger import get_logger
 from app.core.config import Settings
+from app.core.cache import TTLCache
+from app.core.metrics import register_cache
 from functools import lru_cache
 from app.core.security import verify_password
 from app.service.user_service import UserService
 
+logger = get_logger(__name__)
+
 
 @lru_cache
 def get_settings():
@@ -25,6 +31,15 @@ ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 ALGORITHM = "HS256"
 
 
+@lru_cache
+def get_token_cache() -> TTLCache:
+    """Tokens já verificados (pelo SHA-256 do token), válidos até o `exp`."""
+    return TTLCache(max_size=settings.auth_token_cache_size, ttl_seconds=0.0)
+
+
+register_cache("auth_tokens", lambda: get_token_cache().stats())
+
+
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (
@@ -35,40 +50,52 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
 
 
 def authenticate_user(session: Session, email: str, password: str) -> User:
-    logger.info(f"Autenticando usuário com email: {email}")
+    logger.info("Autenticando usuário com email: %s", email)
     user_service = UserService(session)
     user = user_service.get_user_by_email(email)
     if not user or not verify_password(password, user.hashed_password):
-        logger.warning(f"Usuário com email {email} não encontrado.")
+        logger.warning("Usuário com email %s não encontrado.", email)
         return None
-    logger.info(f"Usuário autenticado com sucesso: {email}")
+    logger.info("Usuário autenticado com sucesso: %s", email)
     return user
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
+def _verify_token(token: str) -> str | None:
+    """Retorna o `sub` de um token válido. Tokens já verificados vêm do cache
+    até expirarem, sem repetir a verificação da assinatura."""
+    cache = get_token_cache()
+    key = hashlib.sha256(token.encode()).hexdigest()
+    email = cache.get(key)
+    if email is not None:
+        return email
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    email = payload.get("sub")
+    expires_at = payload.get("exp")
+    if email is not None and expires_at is not None:
+        cache.set(key, email, ttl_seconds=expires_at - time.time())
+    return email
+
+
 def get_current_user(token: str = Depends(oauth2_scheme)) -> str:
-    logger.info("Validando token JWT.")
+    logger.debug("Validando token JWT.")
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
+        email = _verify_token(token)
         if email is None:
-            logger.warning(f"Token inválido: campo 'sub' ausente. [{email}]")
+            logger.warning("Token inválido: campo 'sub' ausente.")
             raise UnauthorizedException()
         return email
     except JWTError as e:
-        logger.error(f"Erro ao decodificar o token JWT: {e}")
+        logger.error("Erro ao decodificar o token JWT: %s", e)
         raise UnauthorizedException()
 
 
 def decode_access_token(token: str) -> str | None:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            return None
-        return email
+        return _verify_token(token)
     except jwt.ExpiredSignatureError:
         return None
     except jwt.JWTError:
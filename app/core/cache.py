@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    value: Any
+    expires_at: float
+    stale_until: float
+    stale: bool = False
+
+
+class TTLCache:
+    """Cache LRU limitado por tamanho, com expiração por entrada e janela de
+    stale-while-revalidate opcional. Seguro para uso entre threads."""
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        stale_seconds: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_entry(self, key: Hashable, record: bool = True) -> Optional[CacheEntry]:
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now >= entry.stale_until:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                if record:
+                    self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            entry.stale = now >= entry.expires_at
+            if record:
+                if entry.stale:
+                    self.stale_hits += 1
+                else:
+                    self.hits += 1
+            return entry
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self.get_entry(key)
+        if entry is None or entry.stale:
+            return default
+        return entry.value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        now = self.clock()
+        expires_at = now + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            self._entries[key] = CacheEntry(
+                value, expires_at, expires_at + self.stale_seconds
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (
+                round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0
+            ),
+        }
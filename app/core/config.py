@@ -1,12 +1,56 @@
 import os
+from typing import Dict, Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     database_url: str
+    database_echo: bool = False
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout_seconds: float = 30.0
+    database_pool_recycle_seconds: int = 1800
+    database_busy_timeout_ms: int = 5000
     secret_key: str
     access_token_expire_minutes: int = 60
+    auth_token_cache_size: int = 4096
+    user_cache_size: int = 1024
+    user_cache_ttl_seconds: float = 30.0
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 32
+    password_hash_timeout_seconds: float = 10.0
+    login_max_failures_per_email: int = 5
+    login_max_failures_per_ip: int = 20
+    login_failure_window_seconds: float = 300.0
     lci_service_api_url: str
+    lci_timeout_seconds: float = 10.0
+    lci_connect_timeout_seconds: float = 5.0
+    lci_max_connections: int = 20
+    lci_max_keepalive_connections: int = 10
+    lci_max_concurrency: int = 10
+    lci_products_cache_ttl_seconds: float = 300.0
+    lci_flows_cache_ttl_seconds: float = 3600.0
+    lci_flows_cache_max_entries: int = 1024
+    lci_cache_stale_seconds: float = 300.0
+    emergy_result_cache_size: int = 256
+    emergy_result_cache_ttl_seconds: float = 86400.0
+    emergy_result_cache_persist: bool = False
+    emergy_result_cache_max_persisted: int = 10000
+    calculation_executor: Literal["thread", "process"] = "thread"
+    calculation_workers: int = 4
+    calculation_max_queue: int = 16
+    calculation_timeout_seconds: float = 120.0
+    csv_chunk_rows: int = 50_000
+    job_workers: int = 2
+    job_max_queue: int = 32
+    job_lease_seconds: float = 60.0
+    inventory_session_max: int = 256
+    inventory_session_ttl_seconds: float = 1800.0
+    inventory_session_max_per_owner: int = 8
+
+    log_level: str = "INFO"
+    log_levels: Dict[str, str] = {}
+    log_format: Literal["json", "text"] = "json"
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -3,16 +3,18 @@ from fastapi.responses import JSONResponse
 from fastapi.exception_handlers import http_exception_handler
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from app.core.logger import logger
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 async def custom_http_exception_handler(request: Request, exc: StarletteHTTPException):
-    logger.warning(f"HTTPException: {exc.detail} | Path: {request.url.path}")
+    logger.warning("HTTPException: %s | Path: %s", exc.detail, request.url.path)
     return await http_exception_handler(request, exc)
 
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    logger.warning(f"Validation error: {exc.errors()} | Path: {request.url.path}")
+    logger.warning("Validation error: %s | Path: %s", exc.errors(), request.url.path)
     return JSONResponse(
         status_code=422,
         content={"detail": exc.errors()},
@@ -0,0 +1,154 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Optional
+from app.core.config import Settings
+from app.core.logger import get_logger
+from app.core.metrics import EXECUTOR_PENDING, EXECUTOR_QUEUE_DEPTH
+from app.exceptions.exceptions import (
+    ProcessingTimeoutException,
+    TooManyRequestsException,
+)
+
+logger = get_logger(__name__)
+
+
+@lru_cache
+def get_settings():
+    return Settings()
+
+
+class BoundedExecutor:
+    """Pool de workers com fila limitada: rejeita novas tarefas com 429 quando
+    saturado e aplica tempo limite por tarefa."""
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        max_workers: int,
+        max_queue: int,
+        timeout_seconds: float,
+    ):
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def shares_memory(self) -> bool:
+        return self.kind != "process"
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self._pending - self.max_workers)
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                executor_class = (
+                    ProcessPoolExecutor
+                    if self.kind == "process"
+                    else ThreadPoolExecutor
+                )
+                self._executor = executor_class(max_workers=self.max_workers)
+            return self._executor
+
+    def _acquire(self):
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                logger.warning(
+                    "Executor [%s] saturado: %d tarefas pendentes.",
+                    self.name,
+                    self._pending,
+                )
+                raise TooManyRequestsException()
+            self._pending += 1
+
+    def _release(self, _: Future):
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        self._acquire()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=self.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            # Tarefas já em execução não podem ser interrompidas; apenas as que
+            # ainda estão na fila são canceladas
+            future.cancel()
+            logger.error(
+                "Tarefa do executor [%s] excedeu %ss.", self.name, self.timeout_seconds
+            )
+            raise ProcessingTimeoutException()
+
+    async def run_local(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Como `run`, para tarefas que usam objetos deste processo (caches,
+        clientes, sessões): em modo processo elas rodam em uma thread."""
+        if self.shares_memory:
+            return await self.run(fn, *args)
+        return await asyncio.to_thread(fn, *args)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+@lru_cache
+def get_calculation_executor() -> BoundedExecutor:
+    settings = get_settings()
+    return BoundedExecutor(
+        name="calculation",
+        kind=settings.calculation_executor,
+        max_workers=settings.calculation_workers,
+        max_queue=settings.calculation_max_queue,
+        timeout_seconds=settings.calculation_timeout_seconds,
+    )
+
+
+@lru_cache
+def get_password_executor() -> BoundedExecutor:
+    """Threads dedicadas ao bcrypt, que libera o GIL durante o hash: logins e
+    cadastros não bloqueiam o event loop nem disputam os workers de cálculo."""
+    settings = get_settings()
+    return BoundedExecutor(
+        name="password",
+        kind="thread",
+        max_workers=settings.password_hash_workers,
+        max_queue=settings.password_hash_max_queue,
+        timeout_seconds=settings.password_hash_timeout_seconds,
+    )
+
+
+EXECUTOR_PENDING.set_function(
+    lambda: get_calculation_executor().pending, executor="calculation"
+)
+EXECUTOR_QUEUE_DEPTH.set_function(
+    lambda: get_calculation_executor().queue_depth, executor="calculation"
+)
+EXECUTOR_PENDING.set_function(
+    lambda: get_password_executor().pending, executor="password"
+)
+EXECUTOR_QUEUE_DEPTH.set_function(
+    lambda: get_password_executor().queue_depth, executor="password"
+)
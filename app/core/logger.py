@@ -1,31 +1,111 @@
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
+from app.core.config import Settings
 
 LOG_DIR = "logs"
 LOG_FILE = os.path.join(LOG_DIR, "app.log")
+APP_LOGGER = "app"
+
+# Atributos padrão de um LogRecord; os demais vieram de `extra` e entram no JSON
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
 
 # Create logs directory if it doesn't exist
 os.makedirs(LOG_DIR, exist_ok=True)
 
-# Configure logging
-logger = logging.getLogger("app_logger")
-logger.setLevel(logging.INFO)  # Pode ajustar para DEBUG em desenvolvimento
 
-# Log format
-formatter = logging.Formatter(
-    "[%(asctime)s] [%(levelname)s] %(name)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
-)
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro, com os campos passados em `extra`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc)
+            .isoformat(timespec="milliseconds")
+            .replace("+00:00", "Z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(
+            (key, value)
+            for key, value in vars(record).items()
+            if key not in RECORD_ATTRIBUTES and not key.startswith("_")
+        )
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class LogQueueHandler(QueueHandler):
+    """Envia os registros para a fila sem formatá-los: a mensagem é montada
+    aqui só com seus argumentos, e o formatter roda na thread do listener."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(vars(record))
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            # O traceback não pode ser serializado entre threads com segurança
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _build_formatter(log_format: str) -> logging.Formatter:
+    if log_format == "json":
+        return JsonFormatter()
+    return logging.Formatter(
+        "[%(asctime)s] [%(levelname)s] %(name)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+
+def _configure(settings: Settings) -> QueueListener:
+    formatter = _build_formatter(settings.log_format)
+
+    # Log to console
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+
+    # Log para arquivo com rotação (5 arquivos de até 1MB cada)
+    file_handler = RotatingFileHandler(LOG_FILE, maxBytes=1_000_000, backupCount=5)
+    file_handler.setFormatter(formatter)
+
+    # A escrita (e a rotação) dos arquivos acontece na thread do listener, fora
+    # do caminho das requisições
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+
+    app_logger = logging.getLogger(APP_LOGGER)
+    app_logger.setLevel(settings.log_level.upper())
+    # Evitar handlers duplicados
+    if not app_logger.handlers:
+        app_logger.addHandler(LogQueueHandler(log_queue))
+
+    for name, level in settings.log_levels.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
 
-# Log to console
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(formatter)
+def get_logger(name: str) -> logging.Logger:
+    """Logger de um módulo do app (ex.: `get_logger(__name__)`), filho de
+    `app`; o nível pode ser ajustado por módulo em LOG_LEVELS."""
+    if name != APP_LOGGER and not name.startswith(f"{APP_LOGGER}."):
+        name = f"{APP_LOGGER}.{name}"
+    return logging.getLogger(name)
 
-# Log para arquivo com rotação (5 arquivos de até 1MB cada)
-file_handler = RotatingFileHandler(LOG_FILE, maxBytes=1_000_000, backupCount=5)
-file_handler.setFormatter(formatter)
 
-# Evitar handlers duplicados
-if not logger.handlers:
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+listener = _configure(Settings())
+logger = logging.getLogger(APP_LOGGER)
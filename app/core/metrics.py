@@ -0,0 +1,330 @@
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+LabelValues = Tuple[str, ...]
+
+# Limites (em segundos) dos histogramas de latência
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Metric:
+    """Métrica com rótulos, mantida na memória do processo. Valores podem vir
+    de uma função (`set_function`), lida no momento da coleta."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._functions: Dict[LabelValues, Callable[[], float]] = {}
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        if labels.keys() != set(self.labelnames):
+            raise ValueError(
+                f"Rótulos inválidos para {self.name}: esperado {self.labelnames}."
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def set_function(self, function: Callable[[], float], **labels):
+        self._functions[self._key(labels)] = function
+
+    def _values(self) -> Dict[LabelValues, float]:
+        return {}
+
+    def samples(self) -> Iterator[Tuple[str, List[Tuple[str, str]], float]]:
+        values = self._values()
+        for key, function in self._functions.items():
+            try:
+                values[key] = float(function())
+            except Exception:
+                # Uma leitura com erro não pode derrubar a coleta das demais
+                continue
+        for key, value in sorted(values.items()):
+            yield self.name, list(zip(self.labelnames, key)), value
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._counts: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        if amount < 0:
+            raise ValueError("Contadores só podem ser incrementados.")
+        key = self._key(labels)
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._counts.get(self._key(labels), 0.0)
+
+    def _values(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._counts)
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0.0) + amount
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._counts[key] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Por combinação de rótulos: contagem por faixa (não acumulada), soma
+        # e total de observações
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, totals = self._series.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            totals[0] += value
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> Iterator[Tuple[str, List[Tuple[str, str]], float]]:
+        with self._lock:
+            series = {
+                key: (list(counts), totals[0])
+                for key, (counts, totals) in self._series.items()
+            }
+        for key, (counts, total) in sorted(series.items()):
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket",
+                    labels + [("le", _format_value(bound))],
+                    cumulative,
+                )
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Métrica já registrada: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Formato de exposição em texto do Prometheus (versão 0.0.4)."""
+        lines = []
+        for metric in sorted(self._metrics.values(), key=lambda item: item.name):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(
+                f"{name}{_format_labels(labels)} {_format_value(value)}"
+                for name, labels, value in metric.samples()
+            )
+        return "\n".join(lines) + "\n"
+
+
+def timed_iter(iterable: Iterable[T], histogram: Histogram, **labels) -> Iterator[T]:
+    """Repassa os itens medindo apenas o tempo gasto para produzir cada um."""
+    iterator = iter(iterable)
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        histogram.observe(time.perf_counter() - started, **labels)
+        yield item
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP até o envio da resposta.",
+    ["method", "route", "status"],
+)
+UPLOAD_BYTES = REGISTRY.counter(
+    "upload_bytes_total", "Bytes recebidos em uploads multipart."
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    "calculation_stage_duration_seconds",
+    "Tempo das etapas do cálculo: parse, validate, compute e serialize.",
+    ["stage"],
+)
+ROWS_PROCESSED = REGISTRY.counter(
+    "inventory_rows_processed_total", "Linhas de inventário agregadas no cálculo."
+)
+LCI_REQUEST_SECONDS = REGISTRY.histogram(
+    "lci_request_duration_seconds",
+    "Latência das chamadas ao serviço LCI externo.",
+    ["operation"],
+)
+LCI_REQUEST_ERRORS = REGISTRY.counter(
+    "lci_request_errors_total",
+    "Chamadas ao serviço LCI externo que falharam, por status da resposta.",
+    ["operation", "status"],
+)
+PASSWORD_HASH_SECONDS = REGISTRY.histogram(
+    "password_hash_duration_seconds",
+    "Tempo de CPU do bcrypt por operação.",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+EXECUTOR_PENDING = REGISTRY.gauge(
+    "executor_pending_tasks",
+    "Tarefas em execução ou na fila de cada executor.",
+    ["executor"],
+)
+EXECUTOR_QUEUE_DEPTH = REGISTRY.gauge(
+    "executor_queue_depth",
+    "Tarefas aguardando um worker livre em cada executor.",
+    ["executor"],
+)
+CACHE_ENTRIES = REGISTRY.gauge(
+    "cache_entries", "Entradas em cada cache em memória.", ["cache"]
+)
+CACHE_HITS = REGISTRY.counter(
+    "cache_hits_total", "Acertos (incluindo dados expirados servidos).", ["cache"]
+)
+CACHE_MISSES = REGISTRY.counter("cache_misses_total", "Falhas de cache.", ["cache"])
+
+
+def register_cache(name: str, stats: Callable[[], Dict[str, float]]):
+    """Expõe as estatísticas de um TTLCache (`TTLCache.stats`) como métricas."""
+    CACHE_ENTRIES.set_function(lambda: stats()["size"], cache=name)
+    CACHE_HITS.set_function(lambda: stats()["hits"] + stats()["stale_hits"], cache=name)
+    CACHE_MISSES.set_function(lambda: stats()["misses"], cache=name)
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mede a latência das requisições HTTP por rota
+    (o caminho com parâmetros, ex.: /api/calculate/by-lci/{product_id}) e os
+    bytes efetivamente recebidos em uploads multipart, não o Content-Length
+    declarado pelo cliente."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+        headers = dict(scope.get("headers") or [])
+        is_upload = headers.get(b"content-type", b"").startswith(b"multipart/form-data")
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                UPLOAD_BYTES.inc(len(message.get("body", b"")))
+            return message
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(
+                scope, receive_wrapper if is_upload else receive, send_wrapper
+            )
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status["code"],
+            )
@@ -0,0 +1,84 @@
+import math
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Hashable, List, Tuple
+from app.core.cache import TTLCache
+from app.core.config import Settings
+from app.core.logger import get_logger
+from app.exceptions.exceptions import TooManyRequestsException
+
+logger = get_logger(__name__)
+
+# Limite de chaves (IPs e emails) acompanhadas ao mesmo tempo
+MAX_TRACKED_KEYS = 100_000
+
+
+@lru_cache
+def get_settings():
+    return Settings()
+
+
+class LoginRateLimiter:
+    """Conta falhas de login por IP e por email em uma janela deslizante e
+    bloqueia novas tentativas antes que o hash da senha seja verificado."""
+
+    def __init__(
+        self,
+        max_failures_per_email: int,
+        max_failures_per_ip: int,
+        window_seconds: float,
+        max_keys: int = MAX_TRACKED_KEYS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_failures_per_email = max_failures_per_email
+        self.max_failures_per_ip = max_failures_per_ip
+        self.window_seconds = window_seconds
+        self.clock = clock
+        self._failures = TTLCache(max_keys, window_seconds, clock=clock)
+        self._lock = threading.Lock()
+
+    def _keys(self, ip: str, email: str) -> List[Tuple[Hashable, int]]:
+        return [
+            (("email", email.strip().lower()), self.max_failures_per_email),
+            (("ip", ip), self.max_failures_per_ip),
+        ]
+
+    def _recent(self, key: Hashable, now: float) -> List[float]:
+        failures = self._failures.get(key) or []
+        return [moment for moment in failures if now - moment < self.window_seconds]
+
+    def check(self, ip: str, email: str):
+        now = self.clock()
+        with self._lock:
+            for key, limit in self._keys(ip, email):
+                failures = self._recent(key, now)
+                if len(failures) >= limit:
+                    retry_after = failures[-limit] + self.window_seconds - now
+                    logger.warning("Login bloqueado por excesso de falhas: %s", key)
+                    raise TooManyRequestsException(
+                        "Muitas tentativas de login. Tente novamente mais tarde.",
+                        retry_after=max(1, math.ceil(retry_after)),
+                    )
+
+    def record_failure(self, ip: str, email: str):
+        now = self.clock()
+        with self._lock:
+            for key, limit in self._keys(ip, email):
+                self._failures.set(key, (self._recent(key, now) + [now])[-limit:])
+
+    def reset(self, email: str):
+        """Após um login bem-sucedido, esquece as falhas do email; as do IP
+        continuam valendo, pois ele pode ser compartilhado."""
+        with self._lock:
+            self._failures.invalidate(("email", email.strip().lower()))
+
+
+@lru_cache
+def get_login_rate_limiter() -> LoginRateLimiter:
+    settings = get_settings()
+    return LoginRateLimiter(
+        max_failures_per_email=settings.login_max_failures_per_email,
+        max_failures_per_ip=settings.login_max_failures_per_ip,
+        window_seconds=settings.login_failure_window_seconds,
+    )
@@ -1,11 +1,14 @@
 from passlib.context import CryptContext
+from app.core.metrics import PASSWORD_HASH_SECONDS
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    with PASSWORD_HASH_SECONDS.time(operation="verify"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 
 def generate_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    with PASSWORD_HASH_SECONDS.time(operation="hash"):
+        return pwd_context.hash(password)
@@ -1,4 +1,5 @@
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.db.models import User
 from typing import Optional
 from app.core.security import (
@@ -13,16 +14,36 @@ def get_user_by_email(session: Session, email: str) -> Optional[User]:
     return result
 
 
-def create_user(session: Session, user_request: RegisterRequest) -> User:
-    hashed_password = generate_password_hash(user_request.password)
-    user = User(
+async def get_user_by_email_async(session: AsyncSession, email: str) -> Optional[User]:
+    statement = select(User).where(User.email == email)
+    result = await session.exec(statement)
+    return result.first()
+
+
+def _build_user(user_request: RegisterRequest, hashed_password: str) -> User:
+    return User(
         name=user_request.name,
         surname=user_request.surname,
         email=user_request.email,
         hashed_password=hashed_password,
         mobile_number=user_request.mobile_number,
     )
+
+
+def create_user(session: Session, user_request: RegisterRequest) -> User:
+    hashed_password = generate_password_hash(user_request.password)
+    user = _build_user(user_request, hashed_password)
     session.add(user)
     session.commit()
     session.refresh(user)
     return user
+
+
+async def create_user_async(
+    session: AsyncSession, user_request: RegisterRequest, hashed_password: str
+) -> User:
+    user = _build_user(user_request, hashed_password)
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    return user
@@ -1,8 +1,16 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import SQLModel, create_engine, Session
-from app.core.logger import logger
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.logger import get_logger
 from app.core.config import Settings
 from functools import lru_cache
 
+logger = get_logger(__name__)
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite"}
+
 
 @lru_cache
 def get_settings():
@@ -12,7 +20,58 @@ def get_settings():
 settings = get_settings()
 
 DATABASE_URL = settings.database_url
-engine = create_engine(DATABASE_URL, echo=True)
+
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _set_sqlite_pragmas(dbapi_connection, _):
+    # WAL permite leituras concorrentes com uma escrita; com WAL,
+    # synchronous=NORMAL só sincroniza o disco nos checkpoints
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.database_busy_timeout_ms)}")
+    cursor.close()
+
+
+def _engine_options(url: str) -> dict:
+    options = {"echo": settings.database_echo, "pool_pre_ping": True}
+    # Bancos SQLite em memória usam um pool de conexão única, sem dimensionamento
+    if not (_is_sqlite(url) and make_url(url).database in (None, "", ":memory:")):
+        options.update(
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            pool_timeout=settings.database_pool_timeout_seconds,
+            pool_recycle=settings.database_pool_recycle_seconds,
+        )
+    return options
+
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(False) if driver else url
+
+
+def create_db_engine(url: str) -> Engine:
+    db_engine = create_engine(url, **_engine_options(url))
+    if _is_sqlite(url):
+        event.listen(db_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+
+def create_async_db_engine(url: str) -> AsyncEngine:
+    url = async_database_url(url)
+    db_engine = create_async_engine(url, **_engine_options(url))
+    if _is_sqlite(url):
+        event.listen(db_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+
+engine = create_db_engine(DATABASE_URL)
+async_engine = create_async_db_engine(DATABASE_URL)
 
 
 def init_db():
@@ -23,3 +82,8 @@ def init_db():
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session():
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
@@ -1,4 +1,8 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
+from app.models.calculation_job import JobStatus
 
 
 class User(SQLModel, table=True):
@@ -8,3 +12,57 @@ class User(SQLModel, table=True):
     email: str = Field(nullable=False, unique=True)
     hashed_password: str = Field(nullable=False)
     mobile_number: str = Field(nullable=False)
+
+
+class EmergyResultRecord(SQLModel, table=True):
+    fingerprint: str = Field(primary_key=True)
+    result: str = Field(nullable=False)
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), nullable=False, index=True
+    )
+
+
+class CalculationJob(SQLModel, table=True):
+    id: str = Field(primary_key=True)
+    owner: str = Field(nullable=False, index=True)
+    filename: str = Field(nullable=False)
+    file_path: str = Field(nullable=False)
+    precision: int = Field(nullable=False)
+    sheet: Optional[str] = Field(default=None)
+    status: JobStatus = Field(default=JobStatus.PENDING, nullable=False, index=True)
+    result: Optional[str] = Field(default=None)
+    error: Optional[str] = Field(default=None)
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), nullable=False
+    )
+    started_at: Optional[datetime] = Field(default=None)
+    finished_at: Optional[datetime] = Field(default=None)
+    # Instância do servidor que processa o job e validade da sua reserva,
+    # renovada enquanto o job está ativo
+    worker_id: Optional[str] = Field(default=None)
+    lease_expires_at: Optional[datetime] = Field(default=None, index=True)
+
+
+class CalculationRecord(SQLModel, table=True):
+    __table_args__ = (
+        # Paginação por keyset do histórico de um usuário (id decrescente)
+        Index("ix_calculationrecord_owner_id", "owner", "id"),
+        Index("ix_calculationrecord_owner_source", "owner", "source_type", "source"),
+        Index("ix_calculationrecord_owner_created_at", "owner", "created_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    owner: str = Field(nullable=False)
+    source_type: str = Field(nullable=False)
+    source: str = Field(nullable=False)
+    filename: Optional[str] = Field(default=None)
+    # Totais por categoria em JSON, sem arredondamento
+    totals: str = Field(nullable=False)
+    total: float = Field(nullable=False)
+    eyr: float = Field(nullable=False)
+    elr: float = Field(nullable=False)
+    esi: float = Field(nullable=False)
+    classification: str = Field(nullable=False)
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), nullable=False
+    )
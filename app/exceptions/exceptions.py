@@ -1,3 +1,4 @@
+from typing import Optional
 from fastapi import HTTPException, status
 
 
@@ -20,5 +21,36 @@ class LCIServiceException(HTTPException):
         self,
         detail: str = "Erro no serviço LCI",
         status_code: int = status.HTTP_502_BAD_GATEWAY,
+        upstream_status: Optional[int] = None,
     ):
         super().__init__(status_code=status_code, detail=detail)
+        # Status devolvido pelo serviço externo, quando houve resposta
+        self.upstream_status = upstream_status
+
+
+class TooManyRequestsException(HTTPException):
+    def __init__(
+        self,
+        detail: str = "Servidor ocupado. Tente novamente em instantes.",
+        retry_after: int = 5,
+    ):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class ProcessingTimeoutException(HTTPException):
+    def __init__(self, detail: str = "Tempo limite de processamento excedido."):
+        super().__init__(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=detail)
+
+
+class NotFoundException(HTTPException):
+    def __init__(self, detail: str = "Recurso não encontrado."):
+        super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+
+class ConflictException(HTTPException):
+    def __init__(self, detail: str = "Conflito com o estado atual do recurso."):
+        super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
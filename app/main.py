@@ -6,9 +6,22 @@ from app.core.exception_handler import (
 )
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarlletteHTTPException
-from app.routes import calculate, authetication, lci
+from app.routes import (
+    calculate,
+    authetication,
+    history,
+    jobs,
+    lci,
+    metrics,
+    scenarios,
+    sessions,
+)
 from fastapi.middleware.cors import CORSMiddleware
 from app.db.database import init_db
+from app.service.lci_service import async_http_client
+from app.core.executor import get_calculation_executor
+from app.core.metrics import MetricsMiddleware
+from app.service.calculation_job_queue import get_calculation_job_queue
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.openapi.utils import get_openapi
 
@@ -16,7 +29,11 @@ from fastapi.openapi.utils import get_openapi
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    get_calculation_job_queue().recover()
     yield
+    await async_http_client.aclose()
+    get_calculation_executor().shutdown()
+    get_calculation_job_queue().shutdown()
 
 
 # Configuração do esquema OAuth2 para o Swagger
@@ -32,6 +49,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Latência por rota e bytes enviados, expostos em /metrics
+app.add_middleware(MetricsMiddleware)
+
 app.add_exception_handler(StarlletteHTTPException, custom_http_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 
@@ -40,6 +60,17 @@ app.include_router(
 )
 app.include_router(lci.router, prefix="/api/lci", tags=["Dados LCI"])
 app.include_router(calculate.router, prefix="/api/calculate", tags=["Cálculo"])
+app.include_router(jobs.router, prefix="/api/calculate/jobs", tags=["Cálculo"])
+app.include_router(
+    history.router, prefix="/api/calculate/history", tags=["Histórico de Cálculos"]
+)
+app.include_router(
+    scenarios.router, prefix="/api/calculate/scenarios", tags=["Análise de Cenários"]
+)
+app.include_router(
+    sessions.router, prefix="/api/calculate/sessions", tags=["Sessões de Inventário"]
+)
+app.include_router(metrics.router, prefix="/metrics")
 
 
 # Configuração do esquema de segurança no Swagger para realizar a autenticação
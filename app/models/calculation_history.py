@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+SOURCE_FILE = "file"
+SOURCE_LCI = "lci"
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class CalculationRecordResponse(BaseModel):
+    id: int
+    source_type: str
+    source: str
+    filename: Optional[str] = None
+    created_at: datetime
+    emergy: dict
+    sustainability: dict
+
+
+class CalculationHistoryPage(BaseModel):
+    items: List[CalculationRecordResponse]
+    # Id a ser enviado em `before` para buscar a próxima página
+    next_before: Optional[int] = None
@@ -0,0 +1,8 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+MAX_BATCH_PRODUCTS = 200
+
+
+class BatchCalculationRequest(BaseModel):
+    product_ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_PRODUCTS)
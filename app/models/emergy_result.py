@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from typing import Dict, Union
+from app.models.sustainability_classification import SustainabilityClassification
+
+DEFAULT_PRECISION = 2
+MAX_PRECISION = 15
+EMERGY_UNIT = "sej"
+
+
+@dataclass(slots=True)
+class EmergyTotals:
+    by_category: Dict[str, float]
+    total: float
+
+    def get(self, category: str) -> float:
+        return self.by_category.get(category, 0.0)
+
+    def to_dict(self, precision: int = DEFAULT_PRECISION) -> Dict[str, Dict[str, str]]:
+        formatted = {
+            category: {"value": f"{value:.{precision}E}", "unit": EMERGY_UNIT}
+            for category, value in self.by_category.items()
+        }
+        formatted["Total"] = {
+            "value": f"{self.total:.{precision}E}",
+            "unit": EMERGY_UNIT,
+        }
+        return formatted
+
+
+@dataclass(slots=True)
+class SustainabilityIndicators:
+    eyr: float
+    elr: float
+    esi: float
+    classification: SustainabilityClassification
+
+    def to_dict(
+        self, precision: int = DEFAULT_PRECISION
+    ) -> Dict[str, Union[float, str]]:
+        return {
+            "EYR": round(self.eyr, precision),
+            "ELR": round(self.elr, precision),
+            "ESI": round(self.esi, precision),
+            "classification": self.classification,
+        }
+
+
+@dataclass(slots=True)
+class EmergyResult:
+    totals: EmergyTotals
+    indicators: SustainabilityIndicators
+
+    def to_dict(self, precision: int = DEFAULT_PRECISION) -> dict:
+        return {
+            "emergy": self.totals.to_dict(precision),
+            "sustainability": self.indicators.to_dict(precision),
+        }
+
+    def to_record(self) -> dict:
+        return {
+            "totals": self.totals.by_category,
+            "total": self.totals.total,
+            "eyr": self.indicators.eyr,
+            "elr": self.indicators.elr,
+            "esi": self.indicators.esi,
+            "classification": self.indicators.classification.value,
+        }
+
+    @classmethod
+    def from_record(cls, record: dict) -> "EmergyResult":
+        return cls(
+            totals=EmergyTotals(by_category=record["totals"], total=record["total"]),
+            indicators=SustainabilityIndicators(
+                eyr=record["eyr"],
+                elr=record["elr"],
+                esi=record["esi"],
+                classification=SustainabilityClassification(record["classification"]),
+            ),
+        )
+
+
+@dataclass(slots=True)
+class CalculationProgress:
+    rows: int
+    rejected_rows: int
+    totals: EmergyTotals
+
+    def to_dict(self, precision: int = DEFAULT_PRECISION) -> dict:
+        return {
+            "rows_parsed": self.rows,
+            "rows_rejected": self.rejected_rows,
+            "emergy": self.totals.to_dict(precision),
+        }
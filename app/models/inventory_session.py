@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+from pydantic import BaseModel, Field, field_validator
+from app.models.emergy_result import (
+    DEFAULT_PRECISION,
+    EmergyTotals,
+    SustainabilityIndicators,
+)
+
+
+class InventoryFlowUpdate(BaseModel):
+    """Campos de um fluxo do inventário; na atualização, os campos omitidos
+    mantêm o valor atual."""
+
+    flow_name: Optional[str] = Field(None, min_length=1)
+    amount: Optional[float] = None
+    unit: Optional[str] = None
+    flow_direction: Optional[str] = None
+    uev: Optional[float] = Field(None, ge=0)
+    category: Optional[str] = None
+
+    # Mesma normalização aplicada às colunas dos arquivos importados
+    @field_validator("flow_direction")
+    @classmethod
+    def normalize_direction(cls, value: Optional[str]) -> Optional[str]:
+        return value.strip().lower() if value is not None else None
+
+    @field_validator("category")
+    @classmethod
+    def normalize_category(cls, value: Optional[str]) -> Optional[str]:
+        if value is None or not value.strip():
+            return None
+        return value.strip().upper()
+
+
+class InventoryFlow(InventoryFlowUpdate):
+    flow_name: str = Field(..., min_length=1)
+    amount: float
+    unit: str
+    flow_direction: str
+
+
+@dataclass(slots=True)
+class InventorySessionState:
+    rows: int
+    totals: EmergyTotals
+    indicators: Optional[SustainabilityIndicators] = None
+    # Motivo pelo qual os indicadores não podem ser calculados no momento
+    error: Optional[str] = None
+
+    def to_dict(self, precision: int = DEFAULT_PRECISION) -> Dict:
+        return {
+            "rows": self.rows,
+            "emergy": self.totals.to_dict(precision),
+            "sustainability": (
+                self.indicators.to_dict(precision)
+                if self.indicators is not None
+                else None
+            ),
+            "detail": self.error,
+        }
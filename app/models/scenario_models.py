@@ -0,0 +1,108 @@
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, model_validator
+
+MAX_SCENARIOS = 5000
+MAX_ITERATIONS = 10000
+MAX_PERTURBED_FLOWS = 500
+
+DistributionKind = Literal["normal", "lognormal", "uniform", "triangular"]
+
+
+class FlowOverride(BaseModel):
+    """Alteração de um fluxo (pelo Flow Name) em um cenário. Valores absolutos
+    substituem o valor de todas as linhas do fluxo; fatores os multiplicam."""
+
+    flow: str = Field(..., min_length=1)
+    amount: Optional[float] = None
+    uev: Optional[float] = Field(None, ge=0)
+    amount_factor: Optional[float] = None
+    uev_factor: Optional[float] = Field(None, ge=0)
+
+    @model_validator(mode="after")
+    def check_values(self) -> "FlowOverride":
+        if self.amount is not None and self.amount_factor is not None:
+            raise ValueError("Use apenas um de amount ou amount_factor.")
+        if self.uev is not None and self.uev_factor is not None:
+            raise ValueError("Use apenas um de uev ou uev_factor.")
+        if all(
+            value is None
+            for value in (self.amount, self.uev, self.amount_factor, self.uev_factor)
+        ):
+            raise ValueError(
+                "Informe amount, uev, amount_factor ou uev_factor para o fluxo."
+            )
+        return self
+
+
+class Scenario(BaseModel):
+    name: Optional[str] = None
+    overrides: List[FlowOverride] = Field(..., min_length=1)
+
+    @model_validator(mode="after")
+    def check_unique(self) -> "Scenario":
+        flows = [override.flow.strip() for override in self.overrides]
+        if len(set(flows)) != len(flows):
+            raise ValueError("Cada fluxo pode ser alterado apenas uma vez por cenário.")
+        return self
+
+
+class FlowDistribution(BaseModel):
+    """Distribuição de um fator multiplicativo aplicado ao Amount ou ao UEV
+    de um fluxo. O fator é sorteado por iteração e vale para todas as linhas
+    do fluxo.
+
+    - normal: média 1 e desvio padrão relativo `sd`
+    - lognormal: mediana 1 e desvio padrão geométrico `sd` (>= 1)
+    - uniform: entre `low` e `high`
+    - triangular: entre `low` e `high`, com moda 1
+    """
+
+    flow: str = Field(..., min_length=1)
+    field: Literal["amount", "uev"] = "uev"
+    kind: DistributionKind = "lognormal"
+    sd: Optional[float] = Field(None, gt=0)
+    low: Optional[float] = Field(None, ge=0)
+    high: Optional[float] = Field(None, ge=0)
+
+    @model_validator(mode="after")
+    def check_parameters(self) -> "FlowDistribution":
+        if self.kind in ("normal", "lognormal"):
+            if self.sd is None:
+                raise ValueError(f"A distribuição {self.kind} exige o parâmetro sd.")
+            if self.kind == "lognormal" and self.sd < 1:
+                raise ValueError("O desvio padrão geométrico (sd) deve ser >= 1.")
+            return self
+
+        if self.low is None or self.high is None or self.low > self.high:
+            raise ValueError(
+                f"A distribuição {self.kind} exige os parâmetros low <= high."
+            )
+        if self.kind == "triangular" and not self.low <= 1 <= self.high:
+            raise ValueError("A distribuição triangular exige low <= 1 <= high.")
+        return self
+
+
+class MonteCarloSpec(BaseModel):
+    iterations: int = Field(1000, ge=1, le=MAX_ITERATIONS)
+    seed: Optional[int] = None
+    distributions: List[FlowDistribution] = Field(
+        ..., min_length=1, max_length=MAX_PERTURBED_FLOWS
+    )
+
+    @model_validator(mode="after")
+    def check_unique(self) -> "MonteCarloSpec":
+        keys = [(item.flow, item.field) for item in self.distributions]
+        if len(set(keys)) != len(keys):
+            raise ValueError("Cada fluxo pode ter apenas uma distribuição por campo.")
+        return self
+
+
+class ScenarioRequest(BaseModel):
+    scenarios: List[Scenario] = Field(default_factory=list, max_length=MAX_SCENARIOS)
+    monte_carlo: Optional[MonteCarloSpec] = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self) -> "ScenarioRequest":
+        if not self.scenarios and self.monte_carlo is None:
+            raise ValueError("Informe ao menos um cenário ou uma simulação.")
+        return self
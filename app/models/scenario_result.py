@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import numpy as np
+from app.models.emergy_result import DEFAULT_PRECISION, EMERGY_UNIT, EmergyResult
+
+PERCENTILES = (5, 50, 95)
+
+
+@dataclass(slots=True)
+class ScenarioOutcome:
+    name: Optional[str]
+    result: Optional[EmergyResult] = None
+    # Motivo pelo qual os indicadores do cenário não puderam ser calculados
+    error: Optional[str] = None
+
+    def to_dict(self, precision: int = DEFAULT_PRECISION) -> dict:
+        if self.result is None:
+            return {"name": self.name, "detail": self.error}
+        return {"name": self.name, **self.result.to_dict(precision)}
+
+
+@dataclass(slots=True)
+class DistributionSummary:
+    mean: float
+    std: float
+    min: float
+    p5: float
+    p50: float
+    p95: float
+    max: float
+
+    @classmethod
+    def from_matrix(cls, values: np.ndarray) -> List["DistributionSummary"]:
+        """Resumo de cada coluna de uma matriz (iterações × variáveis)."""
+        p5, p50, p95 = np.percentile(values, PERCENTILES, axis=0)
+        columns = zip(
+            values.mean(axis=0),
+            values.std(axis=0),
+            values.min(axis=0),
+            p5,
+            p50,
+            p95,
+            values.max(axis=0),
+        )
+        return [cls(*map(float, column)) for column in columns]
+
+    def to_dict(self, precision: int = DEFAULT_PRECISION, emergy: bool = False):
+        values = {
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.min,
+            "p5": self.p5,
+            "p50": self.p50,
+            "p95": self.p95,
+            "max": self.max,
+        }
+        if emergy:
+            formatted = {key: f"{value:.{precision}E}" for key, value in values.items()}
+            return {**formatted, "unit": EMERGY_UNIT}
+        return {key: round(value, precision) for key, value in values.items()}
+
+
+@dataclass(slots=True)
+class MonteCarloSummary:
+    iterations: int
+    # Iterações em que R ou F ficaram iguais a 0 e os indicadores não existem
+    failed_iterations: int
+    emergy: Dict[str, DistributionSummary]
+    indicators: Dict[str, DistributionSummary]
+    classification: Dict[str, float]
+
+    def to_dict(self, precision: int = DEFAULT_PRECISION) -> dict:
+        return {
+            "iterations": self.iterations,
+            "failed_iterations": self.failed_iterations,
+            "emergy": {
+                key: summary.to_dict(precision, emergy=True)
+                for key, summary in self.emergy.items()
+            },
+            "sustainability": {
+                **{
+                    key: summary.to_dict(precision)
+                    for key, summary in self.indicators.items()
+                },
+                "classification": {
+                    key: round(share, precision)
+                    for key, share in self.classification.items()
+                },
+            },
+        }
+
+
+@dataclass(slots=True)
+class ScenarioAnalysis:
+    base: EmergyResult
+    scenarios: List[ScenarioOutcome]
+    monte_carlo: Optional[MonteCarloSummary] = None
+
+    def to_dict(self, precision: int = DEFAULT_PRECISION) -> dict:
+        return {
+            "base": self.base.to_dict(precision),
+            "scenarios": [scenario.to_dict(precision) for scenario in self.scenarios],
+            "monte_carlo": (
+                self.monte_carlo.to_dict(precision)
+                if self.monte_carlo is not None
+                else None
+            ),
+        }
@@ -0,0 +1,13 @@
+from dataclasses import asdict, dataclass
+from typing import Dict, Union
+
+
+@dataclass(slots=True)
+class SourceTiming:
+    source_type: str
+    source: str
+    rows: int
+    seconds: float
+
+    def to_dict(self) -> Dict[str, Union[str, int, float]]:
+        return {**asdict(self), "seconds": round(self.seconds, 4)}
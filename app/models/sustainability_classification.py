@@ -6,3 +6,14 @@ class SustainabilityClassification(str, Enum):
     SUSTAINABLE = "SUSTAINABLE"
     LOW_SUSTAINABILITY = "LOW_SUSTAINABILITY"
     UNSUSTAINABLE = "UNSUSTAINABLE"
+
+
+# Limites de ESI entre as classes, em ordem crescente; um ESI igual ao limite
+# fica na classe inferior
+ESI_THRESHOLDS = (0.1, 1, 10)
+ESI_CLASSES = (
+    SustainabilityClassification.UNSUSTAINABLE,
+    SustainabilityClassification.LOW_SUSTAINABILITY,
+    SustainabilityClassification.SUSTAINABLE,
+    SustainabilityClassification.HIGHLY_SUSTAINABLE,
+)
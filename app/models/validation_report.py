@@ -0,0 +1,35 @@
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Union
+
+SEVERITY_ERROR = "error"
+SEVERITY_WARNING = "warning"
+
+
+@dataclass(slots=True)
+class ValidationIssue:
+    code: str
+    severity: str
+    message: str
+    count: int = 0
+    # Números das linhas no arquivo, limitados por issue; `count` é o total
+    rows: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Union[str, int, List[int]]]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class InventoryValidationReport:
+    rows: int
+    issues: List[ValidationIssue]
+
+    @property
+    def valid(self) -> bool:
+        return not any(issue.severity == SEVERITY_ERROR for issue in self.issues)
+
+    def to_dict(self) -> dict:
+        return {
+            "valid": self.valid,
+            "rows": self.rows,
+            "issues": [issue.to_dict() for issue in self.issues],
+        }
@@ -1,41 +1,62 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from fastapi.security import HTTPBearer
 from sqlalchemy.orm import Session
-from app.db.database import get_session
-from app.core.auth import create_access_token, authenticate_user, decode_access_token
-from app.core.logger import logger
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.database import get_async_session, get_session
+from app.core import auth
+from app.core.auth import (
+    create_access_token,
+    authenticate_user,
+    decode_access_token,
+    get_token_cache,
+)
+from app.core.executor import get_password_executor
+from app.core.logger import get_logger
+from app.core.rate_limit import LoginRateLimiter, get_login_rate_limiter
 from app.models.authentication import LoginRequest, RegisterRequest, UserResponse
 from app.exceptions.exceptions import UnauthorizedException
 from app.service.user_service import UserService
 
+logger = get_logger(__name__)
+
 router = APIRouter()
 security = HTTPBearer()
 
 
 @router.post("/register")
 async def register_user(
-    register_request: RegisterRequest, session: Session = Depends(get_session)
+    register_request: RegisterRequest,
+    session: AsyncSession = Depends(get_async_session),
 ) -> dict:
     user_service = UserService(session)
-    user = user_service.create_user(register_request)
+    user = await user_service.create_user_async(register_request)
     return {"message": "Usuário registrado com sucesso", "user_id": user.id}
 
 
 @router.post("/login")
 async def login(
     login_request: LoginRequest,
+    request: Request,
     session: Session = Depends(get_session),
+    rate_limiter: LoginRateLimiter = Depends(get_login_rate_limiter),
 ) -> dict:
-    user = authenticate_user(session, login_request.email, login_request.password)
+    ip = request.client.host if request.client else "unknown"
+    rate_limiter.check(ip, login_request.email)
+    user = await get_password_executor().run(
+        authenticate_user, session, login_request.email, login_request.password
+    )
     if not user:
+        rate_limiter.record_failure(ip, login_request.email)
         raise UnauthorizedException(detail="Credenciais inválidas")
+    rate_limiter.reset(login_request.email)
     access_token = create_access_token(data={"sub": user.email})
     return {"access_token": access_token, "token_type": "bearer"}
 
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user(
-    token: str = Depends(security), session: Session = Depends(get_session)
+    token: str = Depends(security),
+    session: AsyncSession = Depends(get_async_session),
 ) -> UserResponse:
     try:
         email = decode_access_token(token.credentials)
@@ -43,7 +64,7 @@ async def get_current_user(
             raise UnauthorizedException(detail="Could not validate credentials")
 
         user_service = UserService(session)
-        user = user_service.get_user_by_email(email)
+        user = await user_service.get_user_by_email_async(email)
 
         if not user:
             raise UnauthorizedException(detail="User not found")
@@ -56,5 +77,12 @@ async def get_current_user(
             mobile_number=user.mobile_number,
         )
     except Exception:
-        logger.error(f"Erro ao buscar informações do usuario[{email}]: ", exc_info=True)
+        logger.error(
+            "Erro ao buscar informações do usuario[%s]: ", email, exc_info=True
+        )
         raise UnauthorizedException(detail="Could not validate credentials")
+
+
+@router.get("/cache/stats", dependencies=[Depends(auth.get_current_user)])
+async def auth_cache_stats() -> dict:
+    return {"tokens": get_token_cache().stats(), "users": UserService.cache_stats()}
@@ -1,58 +1,392 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+import asyncio
+import json
+from contextlib import AsyncExitStack, ExitStack
+from pathlib import Path
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Literal, Optional, Tuple
 from app.service.file.file_validator import validate_file_mime
 from app.models.error_response import ErrorResponse
-from app.exceptions.exceptions import BadRequestException, LCIServiceException
-from app.core.logger import logger
-from app.service.file.file_storage import temporary_upload_file
+from app.exceptions.exceptions import (
+    BadRequestException,
+    LCIServiceException,
+    ProcessingTimeoutException,
+    TooManyRequestsException,
+)
+from app.core.logger import get_logger
+from app.service.file.file_storage import (
+    file_sha256,
+    save_temp_file_async,
+    temporary_upload_file_async,
+)
+from app.service.file.file_parser import (
+    build_csv_validation_report,
+    build_validation_report,
+    iter_csv_chunks,
+    parse_file_to_dataframe,
+)
 from app.core.auth import get_current_user
+from app.core.executor import get_calculation_executor
+from app.core.config import Settings
+from functools import lru_cache
 from app.service.emergy_service import EmergyService
-from app.service.data_source import APIDataSource, FileDataSource
-from app.service.lci_service import LCIService
+from app.service.emergy_result_cache import get_emergy_result_cache
+from app.service.data_source import (
+    APIDataSource,
+    CompositeDataSource,
+    CSVStreamDataSource,
+    FileDataSource,
+    ProductBatchDataSource,
+    PRODUCT_ID_COLUMN,
+    create_data_source,
+)
+from app.service.cached_lci_service import get_lci_service
+from app.service.calculation_history import (
+    CalculationHistory,
+    get_calculation_history,
+)
+from app.models.calculation_history import SOURCE_FILE, SOURCE_LCI
+from app.models.calculation_models import MAX_BATCH_PRODUCTS, BatchCalculationRequest
+from app.models.emergy_result import EmergyResult
+from app.routes.common import UNSUPPORTED_FILE_TYPE_MESSAGE, PrecisionQuery, SheetQuery
+
+logger = get_logger(__name__)
 
 
 router = APIRouter(
     dependencies=[Depends(get_current_user)],
 )
 
+ProgressFormat = Literal["sse", "ndjson"]
+PROGRESS_MEDIA_TYPES = {"sse": "text/event-stream", "ndjson": "application/x-ndjson"}
+
+
+@lru_cache
+def get_settings():
+    return Settings()
+
+
+def _hash_file(path) -> str:
+    with open(path, "rb") as stream:
+        return file_sha256(stream)
+
+
+# Os cálculos por arquivo retornam também o hash do conteúdo, que identifica a
+# origem do resultado no histórico
+def _calculate_file(path, sheet: Optional[str] = None) -> Tuple[str, EmergyResult]:
+    calculator = EmergyService(
+        FileDataSource(path, sheet=sheet), result_cache=get_emergy_result_cache()
+    )
+    return _hash_file(path), calculator.compute()
+
+
+def _calculate_csv_stream(stream) -> Tuple[str, EmergyResult]:
+    digest = file_sha256(stream)
+    calculator = EmergyService(
+        CSVStreamDataSource(stream, chunk_rows=get_settings().csv_chunk_rows)
+    )
+    return digest, calculator.compute()
+
+
+def _validate_file(path, sheet: Optional[str] = None) -> dict:
+    return build_validation_report(path, sheet).to_dict()
+
+
+def _validate_csv_stream(stream) -> dict:
+    return build_csv_validation_report(
+        stream, chunk_rows=get_settings().csv_chunk_rows
+    ).to_dict()
+
+
+def _is_csv_upload(file: UploadFile) -> bool:
+    return (file.filename or "").lower().endswith(".csv")
+
+
+def _format_event(progress: ProgressFormat, event: str, data: dict) -> str:
+    if progress == "sse":
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({"event": event, **data}) + "\n"
+
+
+async def _progress_events(
+    path: Path,
+    filename: str,
+    precision: int,
+    sheet: Optional[str],
+    progress: ProgressFormat,
+    owner: str,
+    history: CalculationHistory,
+) -> AsyncIterator[str]:
+    """Eventos de progresso do cálculo: bytes recebidos, um evento por bloco
+    agregado com linhas lidas, rejeitadas e totais parciais, e o resultado. Se
+    o cliente desconectar, nenhum bloco adicional é processado."""
+    executor = get_calculation_executor()
+    bytes_total = path.stat().st_size
+    with ExitStack() as stack:
+        # O upload é fechado pelo FastAPI antes do corpo da resposta ser
+        # enviado, então o cálculo lê a cópia em disco, removida ao final
+        stack.callback(path.unlink, missing_ok=True)
+        yield _format_event(progress, "received", {"bytes_received": bytes_total})
+
+        if path.suffix.lower() == ".csv":
+            stream = stack.enter_context(open(path, "rb"))
+            chunks = iter_csv_chunks(stream, get_settings().csv_chunk_rows)
+            bytes_processed = stream.tell
+        else:
+            chunks = (parse_file_to_dataframe(path, sheet) for _ in range(1))
+            bytes_processed = lambda: bytes_total  # noqa: E731
+        events = EmergyService.iter_compute_chunks(chunks)
+
+        try:
+            while True:
+                # Cada bloco passa pelo executor, que limita a concorrência
+                item = await executor.run_local(next, events, None)
+                if item is None:
+                    break
+                if isinstance(item, EmergyResult):
+                    digest = await asyncio.to_thread(_hash_file, path)
+                    await asyncio.to_thread(
+                        history.record, owner, SOURCE_FILE, digest, item, filename
+                    )
+                    data = {"filename": filename, **item.to_dict(precision)}
+                    yield _format_event(progress, "result", data)
+                else:
+                    data = {
+                        "bytes_processed": min(bytes_processed(), bytes_total),
+                        "bytes_total": bytes_total,
+                        **item.to_dict(precision),
+                    }
+                    yield _format_event(progress, "progress", data)
+        except (
+            BadRequestException,
+            TooManyRequestsException,
+            ProcessingTimeoutException,
+        ) as e:
+            yield _format_event(
+                progress, "error", {"status_code": e.status_code, "detail": e.detail}
+            )
+        except Exception:
+            logger.error(
+                "Erro ao calcular LCI pelo arquivo [%s] importado: ",
+                filename,
+                exc_info=True,
+            )
+            yield _format_event(
+                progress,
+                "error",
+                {"status_code": 500, "detail": "Internal Server Error"},
+            )
+
 
 @router.post(
     "/by-file",
     responses={
         400: {"description": "Arquivo inválido", "model": ErrorResponse},
+        429: {"description": "Servidor ocupado", "model": ErrorResponse},
+        504: {"description": "Tempo limite excedido", "model": ErrorResponse},
     },
 )
-async def calculate_emergy_by_file(file: UploadFile = File(...)):
-    logger.info(f"Validando tipo[{file.content_type}] do arquivo: {file.filename}")
+async def calculate_emergy_by_file(
+    file: UploadFile = File(...),
+    precision: int = PrecisionQuery,
+    sheet: Optional[str] = SheetQuery,
+    validate_only: bool = Query(
+        False,
+        description="Apenas valida o inventário e retorna todos os problemas "
+        "por linha, sem calcular a emergia.",
+    ),
+    progress: Optional[ProgressFormat] = Query(
+        None,
+        description="Retorna o progresso do cálculo como eventos SSE (sse) ou "
+        "NDJSON (ndjson), terminando com o resultado.",
+    ),
+    owner: str = Depends(get_current_user),
+    history: CalculationHistory = Depends(get_calculation_history),
+):
+    logger.info("Validando tipo[%s] do arquivo: %s", file.content_type, file.filename)
     if not validate_file_mime(file):
-        raise BadRequestException(
-            "Tipo de arquivo não suportado. Use .csv, .xls ou .xlsx."
+        raise BadRequestException(UNSUPPORTED_FILE_TYPE_MESSAGE)
+
+    if progress is not None and not validate_only:
+        path = await save_temp_file_async(file)
+        return StreamingResponse(
+            _progress_events(
+                path, file.filename, precision, sheet, progress, owner, history
+            ),
+            media_type=PROGRESS_MEDIA_TYPES[progress],
         )
 
     try:
-        with temporary_upload_file(file) as path:
-            calculator = EmergyService(FileDataSource(path))
-            result = calculator.calculate()
-            return {"filename": file.filename, **result}
+        executor = get_calculation_executor()
+        # CSVs são lidos em blocos direto do upload, sem cópia para disco
+        if _is_csv_upload(file) and executor.shares_memory:
+            if validate_only:
+                report = await executor.run(_validate_csv_stream, file.file)
+                return {"filename": file.filename, **report}
+            digest, result = await executor.run(_calculate_csv_stream, file.file)
+        else:
+            async with temporary_upload_file_async(file) as path:
+                if validate_only:
+                    report = await executor.run(_validate_file, path, sheet)
+                    return {"filename": file.filename, **report}
+                digest, result = await executor.run(_calculate_file, path, sheet)
 
-    except BadRequestException:
+        # A gravação do histórico é síncrona e roda fora do event loop
+        await asyncio.to_thread(
+            history.record, owner, SOURCE_FILE, digest, result, file.filename
+        )
+        return {"filename": file.filename, **result.to_dict(precision)}
+
+    except (
+        BadRequestException,
+        TooManyRequestsException,
+        ProcessingTimeoutException,
+    ):
         raise
     except Exception:
         logger.error(
-            f"Erro ao calcular LCI pelo arquivo [{file.filename}] importado: ",
+            "Erro ao calcular LCI pelo arquivo [%s] importado: ",
+            file.filename,
             exc_info=True,
         )
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
 @router.get("/by-lci/{product_id}")
-async def calculate_emergy_by_lci(product_id: int):
+async def calculate_emergy_by_lci(
+    product_id: int,
+    precision: int = PrecisionQuery,
+    owner: str = Depends(get_current_user),
+    history: CalculationHistory = Depends(get_calculation_history),
+):
     try:
-        calculator = EmergyService(APIDataSource(product_id, LCIService()))
-        result = calculator.calculate()
-        return {"product_id: ": product_id, **result}
+        calculator = EmergyService(
+            APIDataSource(product_id, get_lci_service()),
+            result_cache=get_emergy_result_cache(),
+        )
+        result = await calculator.compute_async()
+        await asyncio.to_thread(
+            history.record, owner, SOURCE_LCI, str(product_id), result
+        )
+        return {"product_id: ": product_id, **result.to_dict(precision)}
 
-    except BadRequestException or LCIServiceException:
+    except (
+        BadRequestException,
+        LCIServiceException,
+        TooManyRequestsException,
+        ProcessingTimeoutException,
+    ):
         raise
     except Exception:
         logger.error("Erro ao calcular LCI pela base externa: ", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post("/by-lci/batch")
+async def calculate_emergy_by_lci_batch(
+    batch_request: BatchCalculationRequest,
+    precision: int = PrecisionQuery,
+    owner: str = Depends(get_current_user),
+    history: CalculationHistory = Depends(get_calculation_history),
+):
+    try:
+        data_source = ProductBatchDataSource(
+            batch_request.product_ids, get_lci_service()
+        )
+        calculator = EmergyService(data_source)
+        results, errors = await calculator.compute_grouped_async(PRODUCT_ID_COLUMN)
+        errors = {**data_source.errors, **errors}
+        await asyncio.to_thread(
+            history.record_many,
+            owner,
+            SOURCE_LCI,
+            [(str(product_id), result) for product_id, result in results.items()],
+        )
+
+        return {
+            "results": [
+                {"product_id": product_id, **results[product_id].to_dict(precision)}
+                for product_id in data_source.product_ids
+                if product_id in results
+            ],
+            "errors": [
+                {"product_id": product_id, "detail": errors[product_id]}
+                for product_id in data_source.product_ids
+                if product_id in errors
+            ],
+        }
+
+    except (
+        BadRequestException,
+        LCIServiceException,
+        TooManyRequestsException,
+        ProcessingTimeoutException,
+    ):
+        raise
+    except Exception:
+        logger.error("Erro ao calcular LCI em lote pela base externa: ", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post(
+    "/combined",
+    responses={
+        400: {"description": "Fontes inválidas", "model": ErrorResponse},
+        429: {"description": "Servidor ocupado", "model": ErrorResponse},
+        502: {"description": "Erro no serviço LCI", "model": ErrorResponse},
+        504: {"description": "Tempo limite excedido", "model": ErrorResponse},
+    },
+)
+async def calculate_emergy_combined(
+    file: Optional[UploadFile] = File(None),
+    product_ids: List[int] = Query(
+        [],
+        max_length=MAX_BATCH_PRODUCTS,
+        description="Produtos LCI combinados com os flows do arquivo.",
+    ),
+    sheet: Optional[str] = SheetQuery,
+    precision: int = PrecisionQuery,
+):
+    if file is None and not product_ids:
+        raise BadRequestException("Informe um arquivo ou ao menos um produto LCI.")
+    if file is not None and not validate_file_mime(file):
+        raise BadRequestException(UNSUPPORTED_FILE_TYPE_MESSAGE)
+
+    try:
+        async with AsyncExitStack() as stack:
+            sources = []
+            if file is not None:
+                path = await stack.enter_async_context(
+                    temporary_upload_file_async(file)
+                )
+                sources.append(
+                    create_data_source(
+                        "file", file_path=path, sheet=sheet, name=file.filename
+                    )
+                )
+            sources.extend(
+                create_data_source("lci", product_id=product_id)
+                for product_id in dict.fromkeys(product_ids)
+            )
+
+            # As fontes são buscadas em paralelo; o tempo de cada uma volta na
+            # resposta. A leitura do arquivo, a combinação e o cálculo rodam no
+            # executor de cálculo
+            data_source = CompositeDataSource(sources)
+            result = await EmergyService(data_source).compute_async()
+
+        return {
+            "sources": [timing.to_dict() for timing in data_source.timings],
+            **result.to_dict(precision),
+        }
+
+    except (
+        BadRequestException,
+        LCIServiceException,
+        TooManyRequestsException,
+        ProcessingTimeoutException,
+    ):
+        raise
+    except Exception:
+        logger.error("Erro ao calcular a combinação de fontes: ", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
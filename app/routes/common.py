@@ -0,0 +1,17 @@
+from fastapi import Query
+from app.models.emergy_result import DEFAULT_PRECISION, MAX_PRECISION
+
+UNSUPPORTED_FILE_TYPE_MESSAGE = (
+    "Tipo de arquivo não suportado. Use .csv, .xls, .xlsx, .parquet ou .arrow."
+)
+
+PrecisionQuery = Query(
+    DEFAULT_PRECISION,
+    ge=0,
+    le=MAX_PRECISION,
+    description="Casas decimais usadas na formatação dos resultados.",
+)
+
+SheetQuery = Query(
+    None, description="Planilha a ser lida em arquivos Excel (padrão: a primeira)."
+)
@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Depends, Query
+from typing import Literal, Optional
+from app.core.auth import get_current_user
+from app.db.models import CalculationRecord
+from app.models.calculation_history import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    CalculationHistoryPage,
+    CalculationRecordResponse,
+)
+from app.routes.common import PrecisionQuery
+from app.models.error_response import ErrorResponse
+from app.service.calculation_history import (
+    CalculationHistory,
+    get_calculation_history,
+    to_emergy_result,
+)
+
+router = APIRouter()
+
+
+def _record_response(
+    record: CalculationRecord, precision: int
+) -> CalculationRecordResponse:
+    return CalculationRecordResponse(
+        id=record.id,
+        source_type=record.source_type,
+        source=record.source,
+        filename=record.filename,
+        created_at=record.created_at,
+        **to_emergy_result(record).to_dict(precision),
+    )
+
+
+@router.get("", response_model=CalculationHistoryPage)
+def list_calculations(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    before: Optional[int] = Query(
+        None, description="Id retornado em `next_before` pela página anterior."
+    ),
+    source_type: Optional[Literal["file", "lci"]] = Query(None),
+    source: Optional[str] = Query(
+        None, description="Hash SHA-256 do arquivo ou id do produto LCI."
+    ),
+    precision: int = PrecisionQuery,
+    owner: str = Depends(get_current_user),
+    history: CalculationHistory = Depends(get_calculation_history),
+):
+    records, next_before = history.list_records(
+        owner, limit, before, source_type, source
+    )
+    return CalculationHistoryPage(
+        items=[_record_response(record, precision) for record in records],
+        next_before=next_before,
+    )
+
+
+@router.get(
+    "/{record_id}",
+    response_model=CalculationRecordResponse,
+    responses={404: {"description": "Cálculo não encontrado", "model": ErrorResponse}},
+)
+def get_calculation(
+    record_id: int,
+    precision: int = PrecisionQuery,
+    owner: str = Depends(get_current_user),
+    history: CalculationHistory = Depends(get_calculation_history),
+):
+    return _record_response(history.get(owner, record_id), precision)
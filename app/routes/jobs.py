@@ -0,0 +1,98 @@
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from typing import Optional
+from app.core.auth import get_current_user
+from app.core.logger import get_logger
+from app.db.models import CalculationJob
+from app.exceptions.exceptions import BadRequestException, TooManyRequestsException
+from app.models.calculation_job import CalculationJobResponse
+from app.routes.common import UNSUPPORTED_FILE_TYPE_MESSAGE, PrecisionQuery, SheetQuery
+from app.models.error_response import ErrorResponse
+from app.service.calculation_job_queue import get_calculation_job_queue
+from app.service.file.file_storage import save_temp_file
+from app.service.file.file_validator import validate_file_mime
+
+logger = get_logger(__name__)
+
+router = APIRouter()
+
+JOB_RESPONSES = {404: {"description": "Job não encontrado", "model": ErrorResponse}}
+
+
+def _job_response(job: CalculationJob) -> CalculationJobResponse:
+    return CalculationJobResponse(
+        job_id=job.id,
+        filename=job.filename,
+        status=job.status,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        error=job.error,
+    )
+
+
+@router.post(
+    "",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=CalculationJobResponse,
+    responses={
+        400: {"description": "Arquivo inválido", "model": ErrorResponse},
+        429: {"description": "Fila de jobs cheia", "model": ErrorResponse},
+    },
+)
+def submit_calculation_job(
+    file: UploadFile = File(...),
+    precision: int = PrecisionQuery,
+    sheet: Optional[str] = SheetQuery,
+    owner: str = Depends(get_current_user),
+):
+    logger.info("Validando tipo[%s] do arquivo: %s", file.content_type, file.filename)
+    if not validate_file_mime(file):
+        raise BadRequestException(UNSUPPORTED_FILE_TYPE_MESSAGE)
+
+    # O arquivo pertence ao job a partir daqui e é removido pelo worker
+    path = save_temp_file(file)
+    try:
+        job = get_calculation_job_queue().submit(
+            owner, file.filename, path, precision, sheet
+        )
+    except TooManyRequestsException:
+        path.unlink(missing_ok=True)
+        raise
+    except Exception:
+        path.unlink(missing_ok=True)
+        logger.error(
+            "Erro ao criar job para o arquivo [%s]: ", file.filename, exc_info=True
+        )
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+    return _job_response(job)
+
+
+@router.get("/{job_id}", response_model=CalculationJobResponse, responses=JOB_RESPONSES)
+def get_calculation_job(job_id: str, owner: str = Depends(get_current_user)):
+    return _job_response(get_calculation_job_queue().get(job_id, owner))
+
+
+@router.get(
+    "/{job_id}/result",
+    responses={
+        **JOB_RESPONSES,
+        409: {"description": "Job sem resultado", "model": ErrorResponse},
+    },
+)
+def get_calculation_job_result(job_id: str, owner: str = Depends(get_current_user)):
+    queue = get_calculation_job_queue()
+    result = queue.result(job_id, owner)
+    job = queue.get(job_id, owner)
+    return {"job_id": job.id, "filename": job.filename, **result}
+
+
+@router.delete(
+    "/{job_id}",
+    response_model=CalculationJobResponse,
+    responses={
+        **JOB_RESPONSES,
+        409: {"description": "Job já finalizado", "model": ErrorResponse},
+    },
+)
+def cancel_calculation_job(job_id: str, owner: str = Depends(get_current_user)):
+    return _job_response(get_calculation_job_queue().cancel(job_id, owner))
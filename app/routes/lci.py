@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
 from app.models.lci_models import LCIProduct
-from app.service.lci_service import LCIService
+from app.service.cached_lci_service import get_lci_service
 from app.core.auth import get_current_user
 from app.exceptions.exceptions import LCIServiceException
 
@@ -9,12 +9,17 @@ router = APIRouter(
 )
 
 
-lci_service = LCIService()
+lci_service = get_lci_service()
 
 
 @router.get("/products", response_model=list[LCIProduct])
 async def list_lci_products():
     try:
-        return lci_service.list_products()
+        return await lci_service.list_products_async()
     except LCIServiceException:
         raise
+
+
+@router.get("/cache/stats")
+async def lci_cache_stats() -> dict:
+    return lci_service.cache_stats()
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from app.core.auth import get_current_user
+from app.core.metrics import REGISTRY
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get(
+    "",
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+    dependencies=[Depends(get_current_user)],
+)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,116 @@
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from typing import Optional
+import pandas as pd
+from app.core.auth import get_current_user
+from app.core.executor import get_calculation_executor
+from app.core.logger import get_logger
+from app.exceptions.exceptions import (
+    BadRequestException,
+    LCIServiceException,
+    ProcessingTimeoutException,
+    TooManyRequestsException,
+)
+from app.routes.common import UNSUPPORTED_FILE_TYPE_MESSAGE, PrecisionQuery, SheetQuery
+from app.models.error_response import ErrorResponse
+from app.models.scenario_models import ScenarioRequest
+from app.models.scenario_result import ScenarioAnalysis
+from app.service.cached_lci_service import get_lci_service
+from app.service.data_source import APIDataSource, FileDataSource
+from app.service.file.file_storage import temporary_upload_file_async
+from app.service.file.file_validator import validate_file_mime
+from app.service.scenario_service import ScenarioService
+
+logger = get_logger(__name__)
+
+router = APIRouter(
+    dependencies=[Depends(get_current_user)],
+)
+
+SCENARIO_RESPONSES = {
+    400: {"description": "Inventário ou cenário inválido", "model": ErrorResponse},
+    429: {"description": "Servidor ocupado", "model": ErrorResponse},
+    504: {"description": "Tempo limite excedido", "model": ErrorResponse},
+}
+
+
+def _analyze_inventory(
+    inventory: pd.DataFrame, request: ScenarioRequest
+) -> ScenarioAnalysis:
+    return ScenarioService(inventory).analyze(request)
+
+
+def _analyze_file(
+    path, sheet: Optional[str], request: ScenarioRequest
+) -> ScenarioAnalysis:
+    return _analyze_inventory(FileDataSource(path, sheet=sheet).fetch_data(), request)
+
+
+def _parse_request(spec: str) -> ScenarioRequest:
+    # O formulário multipart traz os cenários como JSON; os erros seguem o
+    # mesmo formato das validações do corpo das requisições
+    try:
+        return ScenarioRequest.model_validate_json(spec)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False, include_context=False))
+
+
+@router.post("/by-file", responses=SCENARIO_RESPONSES)
+async def analyze_scenarios_by_file(
+    file: UploadFile = File(...),
+    spec: str = Form(
+        ...,
+        description="Cenários e simulação de Monte Carlo em JSON, no mesmo "
+        "formato do corpo de /scenarios/by-lci.",
+    ),
+    precision: int = PrecisionQuery,
+    sheet: Optional[str] = SheetQuery,
+):
+    request = _parse_request(spec)
+    if not validate_file_mime(file):
+        raise BadRequestException(UNSUPPORTED_FILE_TYPE_MESSAGE)
+
+    try:
+        async with temporary_upload_file_async(file) as path:
+            analysis = await get_calculation_executor().run(
+                _analyze_file, path, sheet, request
+            )
+        return {"filename": file.filename, **analysis.to_dict(precision)}
+
+    except (
+        BadRequestException,
+        TooManyRequestsException,
+        ProcessingTimeoutException,
+    ):
+        raise
+    except Exception:
+        logger.error(
+            "Erro ao analisar cenários do arquivo [%s]: ", file.filename, exc_info=True
+        )
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post("/by-lci/{product_id}", responses=SCENARIO_RESPONSES)
+async def analyze_scenarios_by_lci(
+    product_id: int, request: ScenarioRequest, precision: int = PrecisionQuery
+):
+    try:
+        inventory = await APIDataSource(
+            product_id, get_lci_service()
+        ).fetch_data_async()
+        analysis = await get_calculation_executor().run(
+            _analyze_inventory, inventory, request
+        )
+        return {"product_id": product_id, **analysis.to_dict(precision)}
+
+    except (
+        BadRequestException,
+        LCIServiceException,
+        TooManyRequestsException,
+        ProcessingTimeoutException,
+    ):
+        raise
+    except Exception:
+        logger.error("Erro ao analisar cenários do LCI: ", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
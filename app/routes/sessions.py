@@ -0,0 +1,181 @@
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from typing import Optional
+from app.core.auth import get_current_user
+from app.core.executor import get_calculation_executor
+from app.core.logger import get_logger
+from app.exceptions.exceptions import (
+    BadRequestException,
+    ProcessingTimeoutException,
+    TooManyRequestsException,
+)
+from app.routes.common import UNSUPPORTED_FILE_TYPE_MESSAGE, PrecisionQuery, SheetQuery
+from app.models.error_response import ErrorResponse
+from app.models.inventory_session import InventoryFlow, InventoryFlowUpdate
+from app.service.file.file_parser import parse_file_to_dataframe
+from app.service.file.file_storage import temporary_upload_file_async
+from app.service.file.file_validator import validate_file_mime
+from app.service.inventory_session import (
+    InventorySession,
+    InventorySessionStore,
+    get_inventory_session_store,
+)
+
+logger = get_logger(__name__)
+
+router = APIRouter()
+
+SESSION_RESPONSES = {
+    404: {"description": "Sessão ou fluxo não encontrado", "model": ErrorResponse}
+}
+
+
+def _load_session(
+    store: InventorySessionStore,
+    owner: str,
+    path,
+    sheet: Optional[str],
+    filename: str,
+) -> InventorySession:
+    return store.create(owner, parse_file_to_dataframe(path, sheet), filename)
+
+
+@router.post(
+    "",
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        400: {"description": "Arquivo inválido", "model": ErrorResponse},
+        429: {"description": "Servidor ocupado", "model": ErrorResponse},
+    },
+)
+async def create_inventory_session(
+    file: UploadFile = File(...),
+    sheet: Optional[str] = SheetQuery,
+    precision: int = PrecisionQuery,
+    owner: str = Depends(get_current_user),
+    store: InventorySessionStore = Depends(get_inventory_session_store),
+):
+    logger.info("Validando tipo[%s] do arquivo: %s", file.content_type, file.filename)
+    if not validate_file_mime(file):
+        raise BadRequestException(UNSUPPORTED_FILE_TYPE_MESSAGE)
+
+    try:
+        executor = get_calculation_executor()
+        async with temporary_upload_file_async(file) as path:
+            # A sessão fica na memória deste processo
+            session = await executor.run_local(
+                _load_session, store, owner, path, sheet, file.filename
+            )
+        return {
+            "session_id": session.id,
+            "filename": session.filename,
+            **session.state().to_dict(precision),
+        }
+
+    except (
+        BadRequestException,
+        TooManyRequestsException,
+        ProcessingTimeoutException,
+    ):
+        raise
+    except Exception:
+        logger.error(
+            "Erro ao criar sessão para o arquivo [%s]: ", file.filename, exc_info=True
+        )
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/{session_id}", responses=SESSION_RESPONSES)
+async def get_inventory_session(
+    session_id: str,
+    precision: int = PrecisionQuery,
+    owner: str = Depends(get_current_user),
+    store: InventorySessionStore = Depends(get_inventory_session_store),
+):
+    session = store.get(owner, session_id)
+    return {
+        "session_id": session.id,
+        "filename": session.filename,
+        **session.state().to_dict(precision),
+    }
+
+
+@router.delete(
+    "/{session_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses=SESSION_RESPONSES,
+)
+async def close_inventory_session(
+    session_id: str,
+    owner: str = Depends(get_current_user),
+    store: InventorySessionStore = Depends(get_inventory_session_store),
+):
+    store.close(owner, session_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/{session_id}/flows", responses=SESSION_RESPONSES)
+async def list_inventory_session_flows(
+    session_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    owner: str = Depends(get_current_user),
+    store: InventorySessionStore = Depends(get_inventory_session_store),
+):
+    session = store.get(owner, session_id)
+    return {
+        "session_id": session.id,
+        "flows": [
+            {"flow_id": flow_id, **flow.to_dict()}
+            for flow_id, flow in session.list_flows(offset, limit)
+        ],
+    }
+
+
+@router.post(
+    "/{session_id}/flows",
+    status_code=status.HTTP_201_CREATED,
+    responses=SESSION_RESPONSES,
+)
+async def add_inventory_session_flow(
+    session_id: str,
+    flow: InventoryFlow,
+    precision: int = PrecisionQuery,
+    owner: str = Depends(get_current_user),
+    store: InventorySessionStore = Depends(get_inventory_session_store),
+):
+    flow_id, state = store.get(owner, session_id).add(flow)
+    return {"session_id": session_id, "flow_id": flow_id, **state.to_dict(precision)}
+
+
+@router.patch("/{session_id}/flows/{flow_id}", responses=SESSION_RESPONSES)
+async def update_inventory_session_flow(
+    session_id: str,
+    flow_id: int,
+    changes: InventoryFlowUpdate,
+    precision: int = PrecisionQuery,
+    owner: str = Depends(get_current_user),
+    store: InventorySessionStore = Depends(get_inventory_session_store),
+):
+    state = store.get(owner, session_id).update(flow_id, changes)
+    return {"session_id": session_id, "flow_id": flow_id, **state.to_dict(precision)}
+
+
+@router.delete("/{session_id}/flows/{flow_id}", responses=SESSION_RESPONSES)
+async def delete_inventory_session_flow(
+    session_id: str,
+    flow_id: int,
+    precision: int = PrecisionQuery,
+    owner: str = Depends(get_current_user),
+    store: InventorySessionStore = Depends(get_inventory_session_store),
+):
+    state = store.get(owner, session_id).delete(flow_id)
+    return {"session_id": session_id, "flow_id": flow_id, **state.to_dict(precision)}
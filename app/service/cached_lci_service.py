@@ -0,0 +1,170 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, List, Tuple
+from app.core.cache import TTLCache
+from app.core.logger import get_logger
+from app.core.metrics import register_cache
+from app.models.lci_models import LCIFlow, LCIProduct
+from app.service.lci_service import LCIService, get_settings
+
+logger = get_logger(__name__)
+
+PRODUCTS_KEY = "products"
+
+
+class CachedLCIService(LCIService):
+    def __init__(self):
+        super().__init__()
+        settings = get_settings()
+        self.products_cache = TTLCache(
+            max_size=1,
+            ttl_seconds=settings.lci_products_cache_ttl_seconds,
+            stale_seconds=settings.lci_cache_stale_seconds,
+        )
+        self.flows_cache = TTLCache(
+            max_size=settings.lci_flows_cache_max_entries,
+            ttl_seconds=settings.lci_flows_cache_ttl_seconds,
+            stale_seconds=settings.lci_cache_stale_seconds,
+        )
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        # Trava por chave e quantas threads a usam; removida quando ninguém
+        # mais espera por ela, para o dicionário não crescer sem limite
+        self._key_locks: Dict[Hashable, Tuple[threading.Lock, int]] = {}
+        self._key_locks_guard = threading.Lock()
+
+    def list_products(self) -> List[LCIProduct]:
+        return self._get_sync(self.products_cache, PRODUCTS_KEY, super().list_products)
+
+    async def list_products_async(self) -> List[LCIProduct]:
+        return await self._get_async(
+            self.products_cache, PRODUCTS_KEY, super().list_products_async
+        )
+
+    def get_flows_by_product_id(self, product_id: int) -> List[LCIFlow]:
+        return self._get_sync(
+            self.flows_cache,
+            product_id,
+            lambda: super(CachedLCIService, self).get_flows_by_product_id(product_id),
+        )
+
+    async def get_flows_by_product_id_async(self, product_id: int) -> List[LCIFlow]:
+        return await self._get_async(
+            self.flows_cache,
+            product_id,
+            lambda: super(CachedLCIService, self).get_flows_by_product_id_async(
+                product_id
+            ),
+        )
+
+    def cache_stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            "products": self.products_cache.stats(),
+            "flows": self.flows_cache.stats(),
+        }
+
+    def clear_cache(self):
+        self.products_cache.clear()
+        self.flows_cache.clear()
+
+    def _get_sync(self, cache: TTLCache, key: Hashable, loader: Callable[[], Any]):
+        entry = cache.get_entry(key)
+        if entry is not None and not entry.stale:
+            return list(entry.value)
+
+        # Requisições concorrentes para a mesma chave aguardam uma única busca
+        with self._key_lock(cache, key):
+            current = cache.get_entry(key, record=False)
+            if current is not None and not current.stale:
+                return list(current.value)
+            try:
+                value = loader()
+            except Exception:
+                if current is None:
+                    raise
+                logger.warning(
+                    "Falha ao revalidar cache LCI [%s], servindo dado expirado.", key
+                )
+                return list(current.value)
+            cache.set(key, value)
+            return list(value)
+
+    async def _get_async(
+        self,
+        cache: TTLCache,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+    ):
+        entry = cache.get_entry(key)
+        if entry is not None:
+            if entry.stale:
+                self._load_coalesced(cache, key, loader, background=True)
+            return list(entry.value)
+
+        return list(await asyncio.shield(self._load_coalesced(cache, key, loader)))
+
+    def _load_coalesced(
+        self,
+        cache: TTLCache,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        background: bool = False,
+    ) -> asyncio.Task:
+        inflight_key = (id(cache), key)
+        task = self._inflight.get(inflight_key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self._load(cache, key, loader, inflight_key))
+            self._inflight[inflight_key] = task
+            if background:
+                task.add_done_callback(self._log_background_failure)
+        return task
+
+    async def _load(
+        self,
+        cache: TTLCache,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        inflight_key: Hashable,
+    ):
+        try:
+            value = await loader()
+            cache.set(key, value)
+            return value
+        finally:
+            self._inflight.pop(inflight_key, None)
+
+    @staticmethod
+    def _log_background_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(
+                "Falha ao revalidar cache LCI em segundo plano: %s", task.exception()
+            )
+
+    @contextmanager
+    def _key_lock(self, cache: TTLCache, key: Hashable) -> Iterator[None]:
+        lock_key = (id(cache), key)
+        with self._key_locks_guard:
+            lock, users = self._key_locks.get(lock_key, (None, 0))
+            if lock is None:
+                lock = threading.Lock()
+            self._key_locks[lock_key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._key_locks_guard:
+                lock, users = self._key_locks[lock_key]
+                if users == 1:
+                    del self._key_locks[lock_key]
+                else:
+                    self._key_locks[lock_key] = (lock, users - 1)
+
+
+@lru_cache
+def get_lci_service() -> CachedLCIService:
+    return CachedLCIService()
+
+
+register_cache("lci_products", lambda: get_lci_service().products_cache.stats())
+register_cache("lci_flows", lambda: get_lci_service().flows_cache.stats())
@@ -0,0 +1,127 @@
+import json
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, select
+from app.core.logger import get_logger
+from app.db.database import engine
+from app.db.models import CalculationRecord
+from app.exceptions.exceptions import NotFoundException
+from app.models.calculation_history import DEFAULT_PAGE_SIZE
+from app.models.emergy_result import EmergyResult
+
+logger = get_logger(__name__)
+
+
+def to_emergy_result(record: CalculationRecord) -> EmergyResult:
+    return EmergyResult.from_record(
+        {
+            "totals": json.loads(record.totals),
+            "total": record.total,
+            "eyr": record.eyr,
+            "elr": record.elr,
+            "esi": record.esi,
+            "classification": record.classification,
+        }
+    )
+
+
+class CalculationHistory:
+    """Histórico de resultados por usuário. Os registros guardam os totais sem
+    arredondamento, então podem ser reformatados com qualquer precisão."""
+
+    def __init__(self, db_engine: Engine):
+        self.engine = db_engine
+
+    def record(
+        self,
+        owner: str,
+        source_type: str,
+        source: str,
+        result: EmergyResult,
+        filename: Optional[str] = None,
+    ) -> Optional[int]:
+        ids = self.record_many(owner, source_type, [(source, result)], filename)
+        return ids[0] if ids else None
+
+    def record_many(
+        self,
+        owner: str,
+        source_type: str,
+        results: Iterable[Tuple[str, EmergyResult]],
+        filename: Optional[str] = None,
+    ) -> List[int]:
+        # Falhas ao gravar o histórico não devem invalidar o cálculo já feito
+        try:
+            with Session(self.engine) as session:
+                records = [
+                    self._build_record(owner, source_type, source, result, filename)
+                    for source, result in results
+                ]
+                session.add_all(records)
+                # Os ids são lidos após o flush: depois do commit os objetos
+                # expiram e cada acesso faria um novo SELECT
+                session.flush()
+                ids = [record.id for record in records]
+                session.commit()
+                return ids
+        except SQLAlchemyError:
+            logger.warning("Falha ao gravar o histórico de cálculos.", exc_info=True)
+            return []
+
+    def get(self, owner: str, record_id: int) -> CalculationRecord:
+        with Session(self.engine) as session:
+            record = session.get(CalculationRecord, record_id)
+        if record is None or record.owner != owner:
+            raise NotFoundException("Cálculo não encontrado.")
+        return record
+
+    def list_records(
+        self,
+        owner: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        before: Optional[int] = None,
+        source_type: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> Tuple[List[CalculationRecord], Optional[int]]:
+        """Página do histórico, do mais recente para o mais antigo. A
+        paginação é por keyset: `before` é o id do último item da página
+        anterior, e o id de cada registro cresce com a data de criação."""
+        statement = select(CalculationRecord).where(CalculationRecord.owner == owner)
+        if source_type is not None:
+            statement = statement.where(CalculationRecord.source_type == source_type)
+        if source is not None:
+            statement = statement.where(CalculationRecord.source == source)
+        if before is not None:
+            statement = statement.where(CalculationRecord.id < before)
+        statement = statement.order_by(CalculationRecord.id.desc()).limit(limit + 1)
+
+        with Session(self.engine) as session:
+            records = session.exec(statement).all()
+        has_more = len(records) > limit
+        records = records[:limit]
+        return records, records[-1].id if has_more else None
+
+    @staticmethod
+    def _build_record(
+        owner: str,
+        source_type: str,
+        source: str,
+        result: EmergyResult,
+        filename: Optional[str],
+    ) -> CalculationRecord:
+        values = result.to_record()
+        values["totals"] = json.dumps(values["totals"])
+        return CalculationRecord(
+            owner=owner,
+            source_type=source_type,
+            source=source,
+            filename=filename,
+            **values
+        )
+
+
+@lru_cache
+def get_calculation_history() -> CalculationHistory:
+    return CalculationHistory(engine)
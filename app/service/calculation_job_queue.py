@@ -0,0 +1,339 @@
+import json
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+import pandas as pd
+from fastapi import HTTPException
+from sqlalchemy import or_
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, select, update
+from app.core.config import Settings
+from app.core.logger import get_logger
+from app.db.database import engine
+from app.db.models import CalculationJob
+from app.exceptions.exceptions import (
+    ConflictException,
+    NotFoundException,
+    TooManyRequestsException,
+)
+from app.models.calculation_job import ACTIVE_JOB_STATUSES, JobStatus
+from app.service.data_source import CSVStreamDataSource, FileDataSource
+from app.service.emergy_result_cache import get_emergy_result_cache
+from app.service.emergy_service import EmergyService
+
+logger = get_logger(__name__)
+
+
+@lru_cache
+def get_settings():
+    return Settings()
+
+
+class JobCancelledError(Exception):
+    """Interrompe, entre blocos de linhas, um job cancelado durante a execução."""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _until_cancelled(
+    chunks: Iterable[pd.DataFrame], cancelled: threading.Event
+) -> Iterator[pd.DataFrame]:
+    for chunk in chunks:
+        if cancelled.is_set():
+            raise JobCancelledError()
+        yield chunk
+
+
+def calculate_job_file(
+    path: Path, precision: int, sheet: Optional[str], cancelled: threading.Event
+) -> dict:
+    # CSVs são lidos em blocos e podem ser interrompidos entre eles; os demais
+    # formatos são lidos de uma vez
+    if path.suffix.lower() == ".csv":
+        with open(path, "rb") as stream:
+            data_source = CSVStreamDataSource(
+                stream, chunk_rows=get_settings().csv_chunk_rows
+            )
+            return EmergyService(data_source).calculate_chunks(
+                _until_cancelled(data_source.iter_chunks(), cancelled), precision
+            )
+
+    calculator = EmergyService(
+        FileDataSource(path, sheet=sheet), result_cache=get_emergy_result_cache()
+    )
+    return calculator.calculate(precision)
+
+
+class CalculationJobQueue:
+    """Fila de cálculos em segundo plano. O estado e o resultado de cada job
+    ficam no banco; a fila em memória só guarda os jobs em andamento.
+
+    Cada job é reservado pela instância que o recebeu (`worker_id`) até
+    `lease_expires_at`; a reserva é renovada enquanto o job está ativo, para
+    que outras instâncias saibam que ele não foi interrompido."""
+
+    def __init__(
+        self,
+        db_engine: Engine,
+        max_workers: int,
+        max_queue: int,
+        lease_seconds: float = 60.0,
+        worker_id: Optional[str] = None,
+    ):
+        self.engine = db_engine
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id or _default_worker_id()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._lock = threading.RLock()
+        self._heartbeat: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def pending(self) -> int:
+        return len(self._futures)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="calculation-job"
+            )
+        return self._executor
+
+    def submit(
+        self,
+        owner: str,
+        filename: str,
+        file_path: Path,
+        precision: int,
+        sheet: Optional[str] = None,
+    ) -> CalculationJob:
+        with self._lock:
+            if len(self._futures) >= self.max_workers + self.max_queue:
+                logger.warning(
+                    "Fila de jobs saturada: %d jobs pendentes.", len(self._futures)
+                )
+                raise TooManyRequestsException()
+
+            job = CalculationJob(
+                id=uuid.uuid4().hex,
+                owner=owner,
+                filename=filename,
+                file_path=str(file_path),
+                precision=precision,
+                sheet=sheet,
+                worker_id=self.worker_id,
+                lease_expires_at=self._lease_deadline(),
+            )
+            with Session(self.engine) as session:
+                session.add(job)
+                session.commit()
+                session.refresh(job)
+
+            cancelled = threading.Event()
+            self._cancel_events[job.id] = cancelled
+            future = self._get_executor().submit(
+                self._run, job.id, Path(file_path), precision, sheet, cancelled
+            )
+            self._futures[job.id] = future
+            self._start_heartbeat()
+
+        job_id = job.id
+        future.add_done_callback(lambda _: self._forget(job_id))
+        logger.info("Job [%s] criado para o arquivo [%s].", job.id, filename)
+        return job
+
+    def get(self, job_id: str, owner: str) -> CalculationJob:
+        with Session(self.engine) as session:
+            job = session.get(CalculationJob, job_id)
+        # Jobs de outros usuários são tratados como inexistentes
+        if job is None or job.owner != owner:
+            raise NotFoundException("Job não encontrado.")
+        return job
+
+    def result(self, job_id: str, owner: str) -> dict:
+        job = self.get(job_id, owner)
+        if job.status == JobStatus.COMPLETED:
+            return json.loads(job.result)
+        if job.status == JobStatus.FAILED:
+            raise ConflictException(f"O job falhou: {job.error}")
+        raise ConflictException(
+            f"O job não possui resultado (status: {job.status.value})."
+        )
+
+    def cancel(self, job_id: str, owner: str) -> CalculationJob:
+        job = self.get(job_id, owner)
+        if job.status not in ACTIVE_JOB_STATUSES or not self._transition(
+            job_id, job.status, JobStatus.CANCELLED, finished_at=_now()
+        ):
+            job = self.get(job_id, owner)
+            raise ConflictException(
+                f"O job já foi finalizado (status: {job.status.value})."
+            )
+
+        with self._lock:
+            cancelled = self._cancel_events.get(job_id)
+            future = self._futures.get(job_id)
+        if cancelled is not None:
+            cancelled.set()
+        # Jobs ainda na fila nunca chegam a rodar, então o arquivo é removido aqui
+        if future is not None and future.cancel():
+            Path(job.file_path).unlink(missing_ok=True)
+
+        logger.info("Job [%s] cancelado.", job_id)
+        return self.get(job_id, owner)
+
+    def recover(self):
+        """Marca como falhos os jobs interrompidos por um reinício do servidor:
+        os jobs ativos cuja reserva expirou. Jobs de outras instâncias em
+        execução continuam com a reserva renovada e não são afetados."""
+        with Session(self.engine) as session:
+            jobs = session.exec(
+                select(CalculationJob).where(
+                    CalculationJob.status.in_(ACTIVE_JOB_STATUSES),
+                    or_(
+                        CalculationJob.lease_expires_at.is_(None),
+                        CalculationJob.lease_expires_at < _now(),
+                    ),
+                )
+            ).all()
+            for job in jobs:
+                job.status = JobStatus.FAILED
+                job.error = "Processamento interrompido pelo reinício do servidor."
+                job.finished_at = _now()
+                Path(job.file_path).unlink(missing_ok=True)
+                session.add(job)
+            session.commit()
+        if jobs:
+            logger.warning("%d jobs interrompidos marcados como falhos.", len(jobs))
+
+    def renew_leases(self) -> int:
+        """Estende a reserva dos jobs ativos desta instância."""
+        with Session(self.engine) as session:
+            result = session.exec(
+                update(CalculationJob)
+                .where(
+                    CalculationJob.worker_id == self.worker_id,
+                    CalculationJob.status.in_(ACTIVE_JOB_STATUSES),
+                )
+                .values(lease_expires_at=self._lease_deadline())
+            )
+            session.commit()
+            return result.rowcount
+
+    def shutdown(self):
+        self._stopped.set()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._heartbeat = None
+
+    def _lease_deadline(self) -> datetime:
+        return _now() + timedelta(seconds=self.lease_seconds)
+
+    def _start_heartbeat(self):
+        if self._heartbeat is None:
+            self._stopped.clear()
+            self._heartbeat = threading.Thread(
+                target=self._renew_leases_periodically,
+                name="calculation-job-lease",
+                daemon=True,
+            )
+            self._heartbeat.start()
+
+    def _renew_leases_periodically(self):
+        # Renova com folga: três vezes dentro de cada período de reserva
+        while not self._stopped.wait(self.lease_seconds / 3):
+            try:
+                self.renew_leases()
+            except SQLAlchemyError:
+                logger.warning("Falha ao renovar a reserva dos jobs.", exc_info=True)
+
+    def _run(
+        self,
+        job_id: str,
+        file_path: Path,
+        precision: int,
+        sheet: Optional[str],
+        cancelled: threading.Event,
+    ):
+        try:
+            if not self._transition(
+                job_id, JobStatus.PENDING, JobStatus.RUNNING, started_at=_now()
+            ):
+                return
+
+            try:
+                result = calculate_job_file(file_path, precision, sheet, cancelled)
+            finally:
+                # Removido antes de o job ser publicado como finalizado
+                file_path.unlink(missing_ok=True)
+            self._transition(
+                job_id,
+                JobStatus.RUNNING,
+                JobStatus.COMPLETED,
+                result=json.dumps(result),
+                finished_at=_now(),
+            )
+            logger.info("Job [%s] concluído.", job_id)
+        except JobCancelledError:
+            logger.info("Job [%s] interrompido após o cancelamento.", job_id)
+        except HTTPException as e:
+            self._fail(job_id, e.detail)
+        except Exception:
+            logger.error("Erro ao processar o job [%s]", job_id, exc_info=True)
+            self._fail(job_id, "Erro ao processar o cálculo.")
+        finally:
+            file_path.unlink(missing_ok=True)
+
+    def _fail(self, job_id: str, error: str):
+        self._transition(
+            job_id, JobStatus.RUNNING, JobStatus.FAILED, error=error, finished_at=_now()
+        )
+
+    def _transition(
+        self, job_id: str, current: JobStatus, new: JobStatus, **values
+    ) -> bool:
+        # A troca condicional evita que um job cancelado seja sobrescrito pelo
+        # worker que terminou em paralelo
+        with Session(self.engine) as session:
+            result = session.exec(
+                update(CalculationJob)
+                .where(CalculationJob.id == job_id, CalculationJob.status == current)
+                .values(status=new, **values)
+            )
+            session.commit()
+            return result.rowcount == 1
+
+    def _forget(self, job_id: str):
+        with self._lock:
+            self._futures.pop(job_id, None)
+            self._cancel_events.pop(job_id, None)
+
+
+@lru_cache
+def get_calculation_job_queue() -> CalculationJobQueue:
+    settings = get_settings()
+    return CalculationJobQueue(
+        engine,
+        max_workers=settings.job_workers,
+        max_queue=settings.job_max_queue,
+        lease_seconds=settings.job_lease_seconds,
+    )
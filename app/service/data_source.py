@@ -1,48 +1,299 @@
+import asyncio
+import time
 import pandas as pd
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from app.service.file.file_parser import parse_file_to_dataframe
-from app.exceptions.exceptions import LCIServiceException
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from app.service.file.file_parser import iter_csv_chunks, parse_file_to_dataframe
+from app.exceptions.exceptions import BadRequestException, LCIServiceException
+from app.models.lci_models import LCIFlow
+from app.models.source_timing import SourceTiming
+from app.service.cached_lci_service import get_lci_service
 from app.service.lci_service import LCIService
+from app.core.executor import get_calculation_executor
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+PRODUCT_ID_COLUMN = "Product ID"
+# Colunas de origem adicionadas por CompositeDataSource a cada linha
+SOURCE_TYPE_COLUMN = "Source Type"
+SOURCE_COLUMN = "Source"
 
 
 class DataSource(ABC):
+    # Tipo e identificador da fonte, usados nas colunas de origem
+    source_type: str = "custom"
+
+    @property
+    def source_id(self) -> str:
+        return type(self).__name__
+
     @abstractmethod
     def fetch_data(self) -> pd.DataFrame:
         """Método para buscar dados e retornar um DataFrame."""
         pass
 
+    async def fetch_data_async(self) -> pd.DataFrame:
+        """Variante assíncrona; por padrão executa fetch_data no executor de
+        cálculo."""
+        return await get_calculation_executor().run_local(self.fetch_data)
+
+
+class StreamingDataSource(DataSource):
+    @abstractmethod
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """Método para buscar dados em blocos de linhas."""
+        pass
+
+    def fetch_data(self) -> pd.DataFrame:
+        return pd.concat(self.iter_chunks(), ignore_index=True)
+
 
 class FileDataSource(DataSource):
-    def __init__(self, file_path: Path):
+    source_type = "file"
+
+    def __init__(
+        self, file_path: Path, sheet: Optional[str] = None, name: Optional[str] = None
+    ):
         self.file_path = file_path
+        self.sheet = sheet
+        # Nome original do arquivo, já que uploads são salvos com nomes aleatórios
+        self.name = name
+
+    @property
+    def source_id(self) -> str:
+        return self.name or Path(self.file_path).name
 
     def fetch_data(self) -> pd.DataFrame:
-        return parse_file_to_dataframe(self.file_path)
+        return parse_file_to_dataframe(self.file_path, sheet=self.sheet)
+
+
+class CSVStreamDataSource(StreamingDataSource):
+    source_type = "csv_stream"
+
+    def __init__(self, stream: BinaryIO, chunk_rows: int = 50_000):
+        self.stream = stream
+        self.chunk_rows = chunk_rows
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        return iter_csv_chunks(self.stream, self.chunk_rows)
 
 
 class APIDataSource(DataSource):
+    source_type = "lci"
+
     def __init__(self, product_id: int, lci_service: LCIService):
         self.product_id = product_id
         self.lci_service = lci_service
 
+    @property
+    def source_id(self) -> str:
+        return str(self.product_id)
+
     def fetch_data(self) -> pd.DataFrame:
         try:
             flows = self.lci_service.get_flows_by_product_id(self.product_id)
-            data = [flow.model_dump() for flow in flows]
-            df = pd.DataFrame(data)
-
-            column_mapping = {
-                "flow_name": "Flow Name",
-                "amount": "Amount",
-                "unit": "Unit",
-                "flow_direction": "Flow Direction",
-                "uev": "UEV",
-                "category": "Category",
-            }
-
-            df = df.rename(columns=column_mapping)
+            return self._flows_to_dataframe(flows)
+        except LCIServiceException:
+            raise
 
-            return df
+    async def fetch_data_async(self) -> pd.DataFrame:
+        try:
+            flows = await self.lci_service.get_flows_by_product_id_async(
+                self.product_id
+            )
+            return self._flows_to_dataframe(flows)
         except LCIServiceException:
             raise
+
+    @staticmethod
+    def _flows_to_dataframe(flows: List[LCIFlow]) -> pd.DataFrame:
+        data = [flow.model_dump() for flow in flows]
+        df = pd.DataFrame(data)
+
+        column_mapping = {
+            "flow_name": "Flow Name",
+            "amount": "Amount",
+            "unit": "Unit",
+            "flow_direction": "Flow Direction",
+            "uev": "UEV",
+            "category": "Category",
+        }
+
+        return df.rename(columns=column_mapping)
+
+
+class ProductBatchDataSource(DataSource):
+    source_type = "lci_batch"
+
+    def __init__(
+        self, product_ids: List[int], lci_service: LCIService, max_workers: int = 8
+    ):
+        self.product_ids = list(dict.fromkeys(product_ids))
+        self.lci_service = lci_service
+        self.max_workers = max_workers
+        self.errors: Dict[int, str] = {}
+
+    def fetch_data(self) -> pd.DataFrame:
+        workers = max(1, min(self.max_workers, len(self.product_ids)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(APIDataSource(product_id, self.lci_service).fetch_data)
+                for product_id in self.product_ids
+            ]
+            outcomes = []
+            for future in futures:
+                try:
+                    outcomes.append(future.result())
+                except LCIServiceException as e:
+                    outcomes.append(e)
+
+        return self._merge(zip(self.product_ids, outcomes))
+
+    async def fetch_data_async(self) -> pd.DataFrame:
+        outcomes = await asyncio.gather(
+            *(
+                APIDataSource(product_id, self.lci_service).fetch_data_async()
+                for product_id in self.product_ids
+            ),
+            return_exceptions=True,
+        )
+        return self._merge(zip(self.product_ids, outcomes))
+
+    def _merge(
+        self, outcomes: Iterable[Tuple[int, Union[pd.DataFrame, BaseException]]]
+    ) -> pd.DataFrame:
+        self.errors = {}
+        frames = []
+
+        for product_id, outcome in outcomes:
+            if isinstance(outcome, LCIServiceException):
+                logger.warning(
+                    "Falha ao buscar flows do produto LCI [%s]: %s",
+                    product_id,
+                    outcome.detail,
+                )
+                self.errors[product_id] = outcome.detail
+                continue
+            if isinstance(outcome, BaseException):
+                raise outcome
+
+            if outcome.empty:
+                self.errors[product_id] = "Nenhum flow encontrado para o produto."
+                continue
+            frames.append(outcome.assign(**{PRODUCT_ID_COLUMN: product_id}))
+
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+
+class CompositeDataSource(DataSource):
+    """Busca várias fontes em paralelo e concatena os resultados, com o tipo e
+    o identificador da fonte de cada linha. O tempo de cada busca fica em
+    `timings`. Uma falha em qualquer fonte interrompe a combinação."""
+
+    source_type = "composite"
+
+    def __init__(self, sources: Iterable[DataSource], max_workers: int = 8):
+        self.sources = list(sources)
+        self.max_workers = max_workers
+        self.timings: List[SourceTiming] = []
+
+    def fetch_data(self) -> pd.DataFrame:
+        workers = max(1, min(self.max_workers, len(self.sources)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(self._timed_fetch, self.sources))
+        return self._merge(outcomes)
+
+    async def fetch_data_async(self) -> pd.DataFrame:
+        # Fontes remotas são aguardadas no event loop; leituras de arquivo e a
+        # concatenação rodam no executor de cálculo
+        outcomes = await asyncio.gather(
+            *(self._timed_fetch_async(source) for source in self.sources)
+        )
+        return await get_calculation_executor().run_local(self._merge, outcomes)
+
+    @staticmethod
+    def _timed_fetch(source: DataSource) -> Tuple[pd.DataFrame, float]:
+        start = time.perf_counter()
+        df = source.fetch_data()
+        return df, time.perf_counter() - start
+
+    @staticmethod
+    async def _timed_fetch_async(source: DataSource) -> Tuple[pd.DataFrame, float]:
+        start = time.perf_counter()
+        df = await source.fetch_data_async()
+        return df, time.perf_counter() - start
+
+    def _merge(self, outcomes: List[Tuple[pd.DataFrame, float]]) -> pd.DataFrame:
+        self.timings = []
+        frames = []
+        for source, (df, seconds) in zip(self.sources, outcomes):
+            timing = SourceTiming(
+                source.source_type, source.source_id, len(df), seconds
+            )
+            self.timings.append(timing)
+            logger.info(
+                "Fonte [%s:%s] buscada em %.3fs com %d linhas.",
+                timing.source_type,
+                timing.source,
+                seconds,
+                timing.rows,
+            )
+            if not df.empty:
+                frames.append(
+                    df.assign(
+                        **{
+                            SOURCE_TYPE_COLUMN: source.source_type,
+                            SOURCE_COLUMN: source.source_id,
+                        }
+                    )
+                )
+
+        if not frames:
+            raise BadRequestException("Nenhum flow encontrado nas fontes informadas.")
+        return pd.concat(frames, ignore_index=True)
+
+
+DataSourceFactory = Callable[..., DataSource]
+
+_DATA_SOURCE_FACTORIES: Dict[str, DataSourceFactory] = {}
+
+
+def register_data_source(source_type: str, factory: DataSourceFactory):
+    """Registra uma fábrica de fontes de dados, chamada com os parâmetros da
+    fonte por `create_data_source`."""
+    _DATA_SOURCE_FACTORIES[source_type] = factory
+
+
+def registered_data_sources() -> List[str]:
+    return sorted(_DATA_SOURCE_FACTORIES)
+
+
+def create_data_source(source_type: str, **params) -> DataSource:
+    factory = _DATA_SOURCE_FACTORIES.get(source_type)
+    if factory is None:
+        raise BadRequestException(
+            f"Tipo de fonte de dados desconhecido: {source_type}. "
+            f"Use um de: {', '.join(registered_data_sources())}."
+        )
+    return factory(**params)
+
+
+register_data_source("file", FileDataSource)
+register_data_source(
+    "lci", lambda product_id: APIDataSource(product_id, get_lci_service())
+)
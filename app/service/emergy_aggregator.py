@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Tuple
+from app.exceptions.exceptions import BadRequestException
+from app.models.emergy_result import CalculationProgress, EmergyTotals
+from app.service.inventory import (
+    CATEGORY_COLUMN,
+    DIRECTION_COLUMN,
+    INPUT_DIRECTION,
+    OUTPUT_DIRECTION,
+    normalize_inventory,
+)
+
+ChunkPartials = Tuple[Dict[str, float], float, int, int, int]
+
+
+class NeumaierSum:
+    """Soma compensada (Kahan-Babuška/Neumaier) de valores float."""
+
+    __slots__ = ("_sum", "_compensation")
+
+    def __init__(self):
+        self._sum = 0.0
+        self._compensation = 0.0
+
+    def add(self, value: float):
+        value = float(value)
+        total = self._sum + value
+        if abs(self._sum) >= abs(value):
+            self._compensation += (self._sum - total) + value
+        else:
+            self._compensation += (value - total) + self._sum
+        self._sum = total
+
+    @property
+    def value(self) -> float:
+        return self._sum + self._compensation
+
+
+class EmergyAggregator:
+    def __init__(self):
+        self.totals_by_category: Dict[str, NeumaierSum] = {}
+        self.total = NeumaierSum()
+        self.rows = 0
+        self.output_rows = 0
+        self.input_rows = 0
+        self.valid_rows = 0
+
+    @property
+    def rejected_rows(self) -> int:
+        """Linhas que não são saídas e não entraram na soma: direção
+        desconhecida ou entrada sem Amount e UEV válidos."""
+        return self.rows - self.output_rows - self.valid_rows
+
+    def add_chunk(self, chunk: pd.DataFrame):
+        # Blocos vindos do parser já estão normalizados e não são convertidos
+        # de novo
+        partials, total, output_rows, input_rows, valid_rows = self._partials(
+            normalize_inventory(chunk)
+        )
+
+        self.rows += len(chunk)
+        self.output_rows += output_rows
+        self.input_rows += input_rows
+        self.valid_rows += valid_rows
+        for category, value in partials.items():
+            self.totals_by_category.setdefault(category, NeumaierSum()).add(value)
+        if valid_rows:
+            self.total.add(total)
+
+    def add_chunks(self, chunks: Iterable[pd.DataFrame]) -> "EmergyAggregator":
+        for chunk in chunks:
+            self.add_chunk(chunk)
+        return self
+
+    def result(self) -> Tuple[Dict[str, float], float]:
+        if self.input_rows == 0:
+            raise BadRequestException(
+                "Nenhuma entrada válida com Flow Direction = 'Input' encontrada."
+            )
+        if self.valid_rows == 0:
+            raise BadRequestException("Nenhuma linha com Amount e UEV válidos.")
+
+        totals = {
+            category: accumulator.value
+            for category, accumulator in sorted(self.totals_by_category.items())
+        }
+        return totals, self.total.value
+
+    def progress(self) -> CalculationProgress:
+        """Totais parciais acumulados até o último bloco, sem validação."""
+        return CalculationProgress(
+            rows=self.rows,
+            rejected_rows=self.rejected_rows,
+            totals=EmergyTotals(
+                by_category={
+                    category: accumulator.value
+                    for category, accumulator in sorted(self.totals_by_category.items())
+                },
+                total=self.total.value,
+            ),
+        )
+
+    @staticmethod
+    def _partials(inventory: pd.DataFrame) -> ChunkPartials:
+        # Direções e categorias já são códigos inteiros; as somas por categoria
+        # são feitas com bincount
+        directions = inventory[DIRECTION_COLUMN].array
+        output_rows = (
+            int(
+                np.count_nonzero(
+                    directions.codes == directions.categories.get_loc(OUTPUT_DIRECTION)
+                )
+            )
+            if OUTPUT_DIRECTION in directions.categories
+            else 0
+        )
+        if INPUT_DIRECTION not in directions.categories:
+            return {}, 0.0, output_rows, 0, 0
+        is_input = directions.codes == directions.categories.get_loc(INPUT_DIRECTION)
+        input_rows = int(np.count_nonzero(is_input))
+        if not input_rows:
+            return {}, 0.0, output_rows, 0, 0
+
+        emergy = (
+            inventory["Amount"].to_numpy()[is_input]
+            * inventory["UEV"].to_numpy()[is_input]
+        )
+        valid = ~np.isnan(emergy)
+        valid_rows = int(np.count_nonzero(valid))
+        if not valid_rows:
+            return {}, 0.0, output_rows, input_rows, 0
+
+        emergy = emergy[valid]
+        categories = inventory[CATEGORY_COLUMN].array
+        category_codes = categories.codes[is_input][valid]
+        has_category = category_codes >= 0
+
+        codes = category_codes[has_category]
+        sums = np.bincount(
+            codes, weights=emergy[has_category], minlength=len(categories.categories)
+        )
+        counts = np.bincount(codes, minlength=len(categories.categories))
+        partials = {
+            category: sums[index]
+            for index, category in enumerate(categories.categories)
+            if counts[index]
+        }
+        return partials, emergy.sum(), output_rows, input_rows, valid_rows
@@ -0,0 +1,137 @@
+import copy
+import hashlib
+import json
+from functools import lru_cache
+from typing import Optional
+import pandas as pd
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, delete, select
+from app.core.cache import TTLCache
+from app.core.config import Settings
+from app.core.logger import get_logger
+from app.core.metrics import register_cache
+from app.db.database import engine
+from app.db.models import EmergyResultRecord
+from app.models.emergy_result import EmergyResult
+
+logger = get_logger(__name__)
+
+# Incrementar quando a regra de cálculo mudar para invalidar resultados antigos
+CACHE_VERSION = "2"
+
+INVENTORY_COLUMNS = ["Flow Name", "Amount", "Unit", "Flow Direction", "UEV", "Category"]
+NUMERIC_COLUMNS = {"Amount", "UEV"}
+
+
+@lru_cache
+def get_settings():
+    return Settings()
+
+
+def inventory_fingerprint(df: pd.DataFrame) -> str:
+    # Colunas categóricas do inventário normalizado são hasheadas pelas
+    # categorias, sem materializar uma string por linha
+    normalized = pd.DataFrame(
+        {
+            column: (
+                pd.to_numeric(df[column], errors="coerce").astype("float64")
+                if column in NUMERIC_COLUMNS
+                else (
+                    df[column]
+                    if isinstance(df[column].dtype, pd.CategoricalDtype)
+                    else df[column].astype("string")
+                )
+            )
+            for column in INVENTORY_COLUMNS
+            if column in df.columns
+        }
+    )
+    digest = hashlib.sha256(CACHE_VERSION.encode())
+    digest.update("|".join(normalized.columns).encode())
+    digest.update(pd.util.hash_pandas_object(normalized, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+class EmergyResultCache:
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        persist: bool = False,
+        max_persisted: int = 10000,
+    ):
+        self.memory = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.persist = persist
+        self.max_persisted = max_persisted
+
+    def get(self, fingerprint: str) -> Optional[EmergyResult]:
+        result = self.memory.get(fingerprint)
+        if result is None and self.persist:
+            result = self._load(fingerprint)
+            if result is not None:
+                self.memory.set(fingerprint, result)
+        return copy.deepcopy(result) if result is not None else None
+
+    def set(self, fingerprint: str, result: EmergyResult):
+        self.memory.set(fingerprint, copy.deepcopy(result))
+        if self.persist:
+            self._store(fingerprint, result)
+
+    def clear(self):
+        self.memory.clear()
+
+    def stats(self) -> dict:
+        return self.memory.stats()
+
+    def _load(self, fingerprint: str) -> Optional[EmergyResult]:
+        try:
+            with Session(engine) as session:
+                record = session.get(EmergyResultRecord, fingerprint)
+                if record is None:
+                    return None
+                return EmergyResult.from_record(json.loads(record.result))
+        except SQLAlchemyError:
+            logger.warning("Falha ao ler resultado de emergia em cache.", exc_info=True)
+            return None
+
+    def _store(self, fingerprint: str, result: EmergyResult):
+        try:
+            with Session(engine) as session:
+                session.merge(
+                    EmergyResultRecord(
+                        fingerprint=fingerprint, result=json.dumps(result.to_record())
+                    )
+                )
+                session.commit()
+                self._prune(session)
+        except SQLAlchemyError:
+            logger.warning(
+                "Falha ao persistir resultado de emergia em cache.", exc_info=True
+            )
+
+    def _prune(self, session: Session):
+        newest = (
+            select(EmergyResultRecord.fingerprint)
+            .order_by(EmergyResultRecord.created_at.desc())
+            .limit(self.max_persisted)
+        )
+        session.exec(
+            delete(EmergyResultRecord).where(
+                EmergyResultRecord.fingerprint.not_in(newest.scalar_subquery())
+            )
+        )
+        session.commit()
+
+
+@lru_cache
+def get_emergy_result_cache() -> EmergyResultCache:
+    settings = get_settings()
+    return EmergyResultCache(
+        max_size=settings.emergy_result_cache_size,
+        ttl_seconds=settings.emergy_result_cache_ttl_seconds,
+        persist=settings.emergy_result_cache_persist,
+        max_persisted=settings.emergy_result_cache_max_persisted,
+    )
+
+
+register_cache("emergy_results", lambda: get_emergy_result_cache().stats())
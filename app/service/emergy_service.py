@@ -1,55 +1,239 @@
+import bisect
+import time
 import pandas as pd
-from typing import Dict, Union
-from app.service.data_source import DataSource
+from typing import Dict, Hashable, Iterable, Iterator, Optional, Tuple, Union
+from app.service.data_source import DataSource, StreamingDataSource
+from app.service.emergy_aggregator import EmergyAggregator
+from app.service.emergy_result_cache import EmergyResultCache, inventory_fingerprint
+from app.service.inventory import (
+    CATEGORY_COLUMN,
+    DIRECTION_COLUMN,
+    INPUT_DIRECTION,
+    normalize_inventory,
+)
 from app.exceptions.exceptions import BadRequestException
-from app.core.logger import logger
-from app.models.sustainability_classification import SustainabilityClassification
+from app.core.executor import get_calculation_executor
+from app.core.logger import get_logger
+from app.core.metrics import ROWS_PROCESSED, STAGE_SECONDS
+from app.models.sustainability_classification import (
+    ESI_CLASSES,
+    ESI_THRESHOLDS,
+    SustainabilityClassification,
+)
+from app.models.emergy_result import (
+    DEFAULT_PRECISION,
+    CalculationProgress,
+    EmergyResult,
+    EmergyTotals,
+    SustainabilityIndicators,
+)
+
+logger = get_logger(__name__)
 
 
 class EmergyService:
-    def __init__(self, data_source: DataSource):
+    def __init__(
+        self,
+        data_source: DataSource,
+        result_cache: Optional[EmergyResultCache] = None,
+    ):
         self.data_source = data_source
+        self.result_cache = result_cache
+
+    def calculate(self, precision: int = DEFAULT_PRECISION) -> dict:
+        return self._serialize(self.compute(), precision)
+
+    def calculate_chunks(
+        self, chunks: Iterable[pd.DataFrame], precision: int = DEFAULT_PRECISION
+    ) -> dict:
+        return self._serialize(self.compute_chunks(chunks), precision)
+
+    async def calculate_async(self, precision: int = DEFAULT_PRECISION) -> dict:
+        return self._serialize(await self.compute_async(), precision)
+
+    def calculate_grouped(
+        self, group_column: str, precision: int = DEFAULT_PRECISION
+    ) -> Tuple[Dict[Hashable, dict], Dict[Hashable, str]]:
+        results, errors = self.compute_grouped(group_column)
+        return self._format_grouped(results, precision), errors
+
+    async def calculate_grouped_async(
+        self, group_column: str, precision: int = DEFAULT_PRECISION
+    ) -> Tuple[Dict[Hashable, dict], Dict[Hashable, str]]:
+        results, errors = await self.compute_grouped_async(group_column)
+        return self._format_grouped(results, precision), errors
+
+    def compute(self) -> EmergyResult:
+        if isinstance(self.data_source, StreamingDataSource):
+            return self.compute_chunks(self.data_source.iter_chunks())
+        return self._compute_dataframe(self.data_source.fetch_data())
+
+    def compute_chunks(self, chunks: Iterable[pd.DataFrame]) -> EmergyResult:
+        totals = self._calculate_emergy_chunks(chunks)
+        indicators = self.calculate_sustainability_indicators(totals)
+        return EmergyResult(totals, indicators)
+
+    @staticmethod
+    def iter_compute_chunks(
+        chunks: Iterable[pd.DataFrame],
+    ) -> Iterator[Union[CalculationProgress, EmergyResult]]:
+        """Emite o progresso após cada bloco agregado e, por último, o
+        resultado completo. Não depende da fonte de dados: os blocos vêm do
+        chamador."""
+        totals = None
+        for item in EmergyService._iter_emergy_chunks(chunks):
+            if isinstance(item, EmergyTotals):
+                totals = item
+            else:
+                yield item
+        indicators = EmergyService.calculate_sustainability_indicators(totals)
+        yield EmergyResult(totals, indicators)
+
+    async def compute_async(self) -> EmergyResult:
+        # Só a busca dos dados é assíncrona; o cálculo roda no executor
+        df = await self.data_source.fetch_data_async()
+        return await get_calculation_executor().run_local(self._compute_dataframe, df)
+
+    def compute_grouped(
+        self, group_column: str
+    ) -> Tuple[Dict[Hashable, EmergyResult], Dict[Hashable, str]]:
+        return self._compute_grouped_dataframe(
+            self.data_source.fetch_data(), group_column
+        )
+
+    async def compute_grouped_async(
+        self, group_column: str
+    ) -> Tuple[Dict[Hashable, EmergyResult], Dict[Hashable, str]]:
+        df = await self.data_source.fetch_data_async()
+        return await get_calculation_executor().run_local(
+            self._compute_grouped_dataframe, df, group_column
+        )
+
+    @staticmethod
+    def _serialize(result: EmergyResult, precision: int) -> dict:
+        with STAGE_SECONDS.time(stage="serialize"):
+            return result.to_dict(precision)
+
+    @staticmethod
+    def _format_grouped(
+        results: Dict[Hashable, EmergyResult], precision: int
+    ) -> Dict[Hashable, dict]:
+        with STAGE_SECONDS.time(stage="serialize"):
+            return {key: result.to_dict(precision) for key, result in results.items()}
+
+    def _compute_dataframe(self, df: pd.DataFrame) -> EmergyResult:
+        df = normalize_inventory(df)
+        fingerprint = None
+        if self.result_cache is not None:
+            fingerprint = inventory_fingerprint(df)
+            cached = self.result_cache.get(fingerprint)
+            if cached is not None:
+                logger.info("Resultado de emergia obtido do cache [%s].", fingerprint)
+                return cached
 
-    def calculate(self) -> dict:
-        df = self.data_source.fetch_data()
         totals = self._calculate_emergy(df)
-        indicators = self._calculate_sustainability_indicators(totals)
-        return {"emergy": totals, "sustainability": indicators}
+        indicators = self.calculate_sustainability_indicators(totals)
+        result = EmergyResult(totals, indicators)
+
+        if fingerprint is not None:
+            self.result_cache.set(fingerprint, result)
+        return result
+
+    def _compute_grouped_dataframe(
+        self, df: pd.DataFrame, group_column: str
+    ) -> Tuple[Dict[Hashable, EmergyResult], Dict[Hashable, str]]:
+        results: Dict[Hashable, EmergyResult] = {}
+        errors: Dict[Hashable, str] = {}
+        if df.empty:
+            return results, errors
+
+        started = time.perf_counter()
+        ROWS_PROCESSED.inc(len(df))
+        keys = df[group_column].drop_duplicates().tolist()
+        try:
+            prepared = self._prepare_inputs(df)
+        except BadRequestException as e:
+            return results, {key: e.detail for key in keys}
+
+        totals_by_group = prepared.groupby(
+            [group_column, CATEGORY_COLUMN], observed=True
+        )["Emergy"].sum()
+        total_by_group = prepared.groupby(group_column)["Emergy"].sum()
+
+        for key in keys:
+            if key not in total_by_group.index:
+                errors[key] = "Nenhuma linha de entrada com Amount e UEV válidos."
+                continue
+
+            totals = EmergyTotals(
+                by_category={
+                    category: float(value)
+                    for category, value in totals_by_group.loc[key].items()
+                },
+                total=float(total_by_group.loc[key]),
+            )
+            try:
+                indicators = self.calculate_sustainability_indicators(totals)
+            except BadRequestException as e:
+                errors[key] = e.detail
+                continue
+            results[key] = EmergyResult(totals, indicators)
+
+        STAGE_SECONDS.observe(time.perf_counter() - started, stage="compute")
+        logger.info(
+            "Cálculo agrupado por [%s]: %d resultados, %d erros.",
+            group_column,
+            len(results),
+            len(errors),
+        )
+        return results, errors
 
     def _filter_valid_inputs(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df[df["Flow Direction"].str.strip().str.lower() == "input"].copy()
+        df = normalize_inventory(df)
+        df = df[df[DIRECTION_COLUMN] == INPUT_DIRECTION]
         if df.empty:
             raise BadRequestException(
                 "Nenhuma entrada válida com Flow Direction = 'Input' encontrada."
             )
         return df
 
-    def _calculate_emergy(self, df: pd.DataFrame) -> Dict[str, Dict[str, str]]:
-        try:
-            df = self._filter_valid_inputs(df)
-
-            df["Amount"] = pd.to_numeric(df["Amount"], errors="coerce")
-            df["UEV"] = pd.to_numeric(df["UEV"], errors="coerce")
-            df.dropna(subset=["Amount", "UEV"], inplace=True)
-
-            if df.empty:
-                raise BadRequestException("Nenhuma linha com Amount e UEV válidos.")
+    def _prepare_inputs(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = self._filter_valid_inputs(df).dropna(subset=["Amount", "UEV"])
+        if df.empty:
+            raise BadRequestException("Nenhuma linha com Amount e UEV válidos.")
 
-            df["Emergy"] = df["Amount"] * df["UEV"]
+        return df.assign(Emergy=df["Amount"] * df["UEV"])
 
-            df["Category"] = df["Category"].str.strip().str.upper()
-            totals_by_category = df.groupby("Category")["Emergy"].sum().to_dict()
-            total_unique = df["Emergy"].sum()
+    def _calculate_emergy(self, df: pd.DataFrame) -> EmergyTotals:
+        return self._calculate_emergy_chunks([df])
 
-            formatted_totals = {
-                category: {"value": f"{value:.2E}", "unit": "sej"}
-                for category, value in totals_by_category.items()
-            }
+    def _calculate_emergy_chunks(self, chunks: Iterable[pd.DataFrame]) -> EmergyTotals:
+        *_, totals = self._iter_emergy_chunks(chunks)
+        return totals
 
-            formatted_totals["Total"] = {"value": f"{total_unique:.2E}", "unit": "sej"}
+    @staticmethod
+    def _iter_emergy_chunks(
+        chunks: Iterable[pd.DataFrame],
+    ) -> Iterator[Union[CalculationProgress, EmergyTotals]]:
+        try:
+            # Só o tempo da agregação conta como "compute"; a leitura dos blocos
+            # é medida como "parse" e "validate"
+            elapsed = 0.0
+            aggregator = EmergyAggregator()
+            for chunk in chunks:
+                started = time.perf_counter()
+                aggregator.add_chunk(chunk)
+                elapsed += time.perf_counter() - started
+                ROWS_PROCESSED.inc(len(chunk))
+                yield aggregator.progress()
+            started = time.perf_counter()
+            totals_by_category, total_unique = aggregator.result()
+            STAGE_SECONDS.observe(
+                elapsed + time.perf_counter() - started, stage="compute"
+            )
 
-            logger.info(f"Emergia total por categoria: {totals_by_category}")
-            return formatted_totals
+            logger.debug("Emergia total por categoria: %s", totals_by_category)
+            yield EmergyTotals(by_category=totals_by_category, total=total_unique)
 
         except BadRequestException:
             raise
@@ -57,20 +241,16 @@ class EmergyService:
             logger.error("Erro ao calcular a emergia", exc_info=True)
             raise BadRequestException("Erro ao calcular a emergia.")
 
-    def _calculate_sustainability_indicators(
-        self,
-        emergy_totals: Dict[str, Dict[str, str]],
-    ) -> Dict[str, Union[float, str]]:
+    @staticmethod
+    def calculate_sustainability_indicators(
+        emergy_totals: EmergyTotals,
+    ) -> SustainabilityIndicators:
         try:
+            R = emergy_totals.get("R")
+            N = emergy_totals.get("N")
+            F = emergy_totals.get("F")
 
-            def parse_value(v: Dict[str, str]) -> float:
-                return float(v["value"])
-
-            R = parse_value(emergy_totals.get("R", {"value": "0"}))
-            N = parse_value(emergy_totals.get("N", {"value": "0"}))
-            F = parse_value(emergy_totals.get("F", {"value": "0"}))
-
-            logger.info(f"Totals de emergia: R: {R}, N: {N}, F: {F}")
+            logger.debug("Totals de emergia: R: %s, N: %s, F: %s", R, N, F)
 
             if F == 0 or R == 0:
                 raise BadRequestException(
@@ -81,16 +261,19 @@ class EmergyService:
             ELR = (N + F) / R
             ESI = EYR / ELR
 
-            logger.info(
-                f"Indicadores calculados - EYR: {EYR:.2f}, ELR: {ELR:.2f}, ESI: {ESI:.2f}"
+            logger.debug(
+                "Indicadores calculados - EYR: %.2f, ELR: %.2f, ESI: %.2f",
+                EYR,
+                ELR,
+                ESI,
             )
 
-            return {
-                "EYR": round(EYR, 2),
-                "ELR": round(ELR, 2),
-                "ESI": round(ESI, 2),
-                "classification": self.classify_esi(ESI),
-            }
+            return SustainabilityIndicators(
+                eyr=EYR,
+                elr=ELR,
+                esi=ESI,
+                classification=EmergyService.classify_esi(ESI),
+            )
 
         except BadRequestException:
             raise
@@ -104,11 +287,4 @@ class EmergyService:
 
     @staticmethod
     def classify_esi(esi: float) -> SustainabilityClassification:
-        if esi > 10:
-            return SustainabilityClassification.HIGHLY_SUSTAINABLE
-        elif esi > 1:
-            return SustainabilityClassification.SUSTAINABLE
-        elif esi > 0.1:
-            return SustainabilityClassification.LOW_SUSTAINABILITY
-        else:
-            return SustainabilityClassification.UNSUSTAINABLE
+        return ESI_CLASSES[bisect.bisect_left(ESI_THRESHOLDS, esi)]
@@ -1,9 +1,28 @@
 import pandas as pd
 from pathlib import Path
 import csv
+import io
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import zipfile
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+from app.core.metrics import STAGE_SECONDS, timed_iter
 from app.exceptions.exceptions import BadRequestException
+from app.models.validation_report import InventoryValidationReport
+from app.service.inventory import (
+    REQUIRED_COLUMNS,
+    InventoryValidator,
+    validate_inventory,
+)
 
-REQUIRED_COLUMNS = {"Flow Name", "Amount", "Unit", "Flow Direction", "UEV", "Category"}
+CSV_SNIFF_BYTES = 64 * 1024
+CSV_ENCODING = "utf-8"
+ARROW_EXTENSIONS = {".arrow", ".feather", ".ipc"}
+# Linhas iniciais da planilha em que o cabeçalho é procurado
+XLSX_HEADER_SCAN_ROWS = 20
 
 
 def detect_delimiter(file_path: Path) -> str:
@@ -13,47 +32,215 @@ def detect_delimiter(file_path: Path) -> str:
         return sniffer.sniff(sample).delimiter
 
 
-def resolve_dataframe(file_path: Path) -> pd.DataFrame:
+def detect_stream_delimiter(stream: BinaryIO) -> str:
+    start = stream.tell()
+    sample = stream.read(CSV_SNIFF_BYTES)
+    stream.seek(start)
+
+    header = sample.split(b"\n", 1)[0].decode(CSV_ENCODING, errors="ignore")
+    try:
+        return csv.Sniffer().sniff(header).delimiter
+    except csv.Error:
+        raise BadRequestException("Não foi possível identificar o delimitador do CSV.")
+
+
+def iter_csv_chunks(stream: BinaryIO, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    for chunk in iter_raw_csv_chunks(stream, chunk_rows):
+        with STAGE_SECONDS.time(stage="validate"):
+            chunk = validate_inventory(chunk)
+        yield chunk
+
+
+def iter_raw_csv_chunks(stream: BinaryIO, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    delimiter = detect_stream_delimiter(stream)
+    text_stream = io.TextIOWrapper(stream, encoding=CSV_ENCODING, newline="")
+    try:
+        with pd.read_csv(text_stream, sep=delimiter, chunksize=chunk_rows) as reader:
+            yield from timed_iter(reader, STAGE_SECONDS, stage="parse")
+    finally:
+        # Evita que o wrapper feche o arquivo enviado, que pertence ao UploadFile
+        text_stream.detach()
+
+
+def resolve_dataframe(file_path: Path, sheet: Optional[str] = None) -> pd.DataFrame:
     file_extension = file_path.suffix.lower()
 
     if file_extension == ".csv":
         delimiter = detect_delimiter(file_path)
         return pd.read_csv(file_path, sep=delimiter)
 
-    if file_extension in {".xls", ".xlsx"}:
-        return pd.read_excel(file_path)
+    if file_extension == ".xlsx":
+        return read_xlsx(file_path, sheet)
+
+    if file_extension == ".xls":
+        return _read_xls(file_path, sheet)
+
+    if file_extension == ".parquet":
+        return read_parquet(file_path)
+
+    if file_extension in ARROW_EXTENSIONS:
+        return read_arrow(file_path)
 
     raise BadRequestException("Extensão de arquivo não suportada.")
 
 
-def parse_file_to_dataframe(file_path: Path) -> pd.DataFrame:
-    df = resolve_dataframe(file_path)
+def read_xlsx(file_path: Path, sheet: Optional[str] = None) -> pd.DataFrame:
+    """Lê a planilha em modo somente leitura e guarda apenas as colunas
+    obrigatórias. O cabeçalho é procurado nas primeiras linhas, e o índice do
+    DataFrame segue a numeração da planilha (linha - 2), mantendo corretas as
+    linhas citadas nos erros de validação."""
+    try:
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+    except (InvalidFileException, zipfile.BadZipFile, KeyError, OSError):
+        raise BadRequestException("Arquivo Excel inválido.")
 
-    df.columns = [col.strip() for col in df.columns]
+    try:
+        if sheet is None:
+            worksheet = workbook.worksheets[0]
+        elif sheet in workbook.sheetnames:
+            worksheet = workbook[sheet]
+        else:
+            raise BadRequestException(f"Planilha '{sheet}' não encontrada no arquivo.")
+        # As dimensões gravadas no arquivo podem estar erradas; sem elas, as
+        # linhas têm o tamanho real
+        worksheet.reset_dimensions()
+        columns, row_numbers = _read_required_columns(worksheet)
+    except (KeyError, IndexError, ValueError):
+        raise BadRequestException("Arquivo Excel inválido.")
+    finally:
+        workbook.close()
 
-    missing_columns = REQUIRED_COLUMNS - set(df.columns)
-    if missing_columns:
+    index = pd.Index(row_numbers, dtype="int64") - 2
+    return pd.DataFrame(columns, index=index)
+
+
+def _read_required_columns(worksheet) -> Tuple[Dict[str, list], List[int]]:
+    required_columns = sorted(REQUIRED_COLUMNS)
+    header_row = None
+    positions: Dict[str, int] = {}
+    first_header = None
+    header_rows = worksheet.iter_rows(max_row=XLSX_HEADER_SCAN_ROWS, values_only=True)
+    for row_number, row in enumerate(header_rows, start=1):
+        names = [value.strip() if isinstance(value, str) else value for value in row]
+        if REQUIRED_COLUMNS.issubset(names):
+            header_row = row_number
+            positions = {column: names.index(column) for column in required_columns}
+            break
+        if first_header is None and any(name is not None for name in names):
+            first_header = names
+
+    if header_row is None:
+        missing_columns = REQUIRED_COLUMNS - set(first_header or [])
         raise BadRequestException(
             f"Colunas obrigatórias ausentes: {', '.join(missing_columns)}"
         )
 
-    try:
-        df["Amount"] = pd.to_numeric(df["Amount"])
-    except ValueError:
-        raise BadRequestException("Valores inválidos encontrados na coluna 'Amount'.")
+    # Só o intervalo de colunas obrigatórias é convertido pelo openpyxl
+    first_column = min(positions.values())
+    rows = worksheet.iter_rows(
+        min_row=header_row + 1,
+        min_col=first_column + 1,
+        max_col=max(positions.values()) + 1,
+        values_only=True,
+    )
+    columns: Dict[str, list] = {column: [] for column in required_columns}
+    row_numbers: List[int] = []
+    for row_number, row in enumerate(rows, start=header_row + 1):
+        values = [
+            row[position - first_column] if position - first_column < len(row) else None
+            for position in positions.values()
+        ]
+        # Linhas sem nenhum valor nas colunas obrigatórias são ignoradas
+        if all(value is None for value in values):
+            continue
+        row_numbers.append(row_number)
+        for column, value in zip(positions, values):
+            columns[column].append(value)
+    return columns, row_numbers
 
-    input_rows = df[df["Flow Direction"] != "Output"].copy()
+
+def _read_xls(file_path: Path, sheet: Optional[str]) -> pd.DataFrame:
     try:
-        input_rows["UEV"] = pd.to_numeric(input_rows["UEV"])
-        if input_rows["UEV"].isna().any():
-            null_rows = input_rows[input_rows["UEV"].isna()]
-            row_numbers = [str(int(idx) + 2) for idx in null_rows.index]
-            raise BadRequestException(
-                f"Valores de UEV ausentes para entradas nas linhas: {', '.join(row_numbers)}"
-            )
+        return pd.read_excel(file_path, sheet_name=sheet if sheet is not None else 0)
     except ValueError:
+        if sheet is None:
+            raise
+        raise BadRequestException(f"Planilha '{sheet}' não encontrada no arquivo.")
+
+
+def project_required_columns(schema: pa.Schema) -> Dict[str, str]:
+    """Mapeia as colunas obrigatórias para os nomes no arquivo, que podem ter
+    espaços extras, falhando antes de qualquer leitura de dados."""
+    columns = {name.strip(): name for name in schema.names}
+    missing_columns = REQUIRED_COLUMNS - set(columns)
+    if missing_columns:
         raise BadRequestException(
-            "Valores inválidos encontrados na coluna 'UEV' para as entradas."
+            f"Colunas obrigatórias ausentes: {', '.join(missing_columns)}"
         )
+    return {column: columns[column] for column in sorted(REQUIRED_COLUMNS)}
+
+
+def read_parquet(file_path: Path) -> pd.DataFrame:
+    try:
+        columns = project_required_columns(pq.read_schema(file_path, memory_map=True))
+        table = pq.read_table(
+            file_path, columns=list(columns.values()), memory_map=True
+        )
+    except (pa.ArrowException, OSError):
+        raise BadRequestException("Arquivo Parquet inválido.")
+    return _table_to_dataframe(table)
+
+
+def read_arrow(file_path: Path) -> pd.DataFrame:
+    # Arquivos IPC (Feather v2) são mapeados em memória e só as colunas
+    # projetadas são materializadas; o formato stream é lido sequencialmente
+    try:
+        with pa.memory_map(str(file_path)) as source:
+            try:
+                schema = pa.ipc.open_file(source).schema
+                columns = project_required_columns(schema)
+                table = feather.read_table(
+                    file_path, columns=list(columns.values()), memory_map=True
+                )
+            except pa.ArrowInvalid:
+                source.seek(0)
+                reader = pa.ipc.open_stream(source)
+                columns = project_required_columns(reader.schema)
+                table = reader.read_all().select(list(columns.values()))
+    except (pa.ArrowException, OSError):
+        raise BadRequestException("Arquivo Arrow inválido.")
+    return _table_to_dataframe(table)
+
+
+def _table_to_dataframe(table: pa.Table) -> pd.DataFrame:
+    return table.rename_columns(
+        [name.strip() for name in table.column_names]
+    ).to_pandas()
+
+
+def parse_file_to_dataframe(
+    file_path: Path, sheet: Optional[str] = None
+) -> pd.DataFrame:
+    """Lê e valida o inventário, que já sai normalizado para o cálculo."""
+    with STAGE_SECONDS.time(stage="parse"):
+        df = resolve_dataframe(file_path, sheet)
+    with STAGE_SECONDS.time(stage="validate"):
+        return validate_inventory(df)
+
+
+def build_validation_report(
+    file_path: Path, sheet: Optional[str] = None
+) -> InventoryValidationReport:
+    return (
+        InventoryValidator().add_chunks([resolve_dataframe(file_path, sheet)]).report()
+    )
+
 
-    return df
+def build_csv_validation_report(
+    stream: BinaryIO, chunk_rows: int
+) -> InventoryValidationReport:
+    return (
+        InventoryValidator()
+        .add_chunks(iter_raw_csv_chunks(stream, chunk_rows))
+        .report()
+    )
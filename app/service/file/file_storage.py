@@ -1,12 +1,18 @@
+import asyncio
+import hashlib
 import uuid
 from pathlib import Path
+from typing import BinaryIO
 from fastapi import UploadFile
 import shutil
-from app.core.logger import logger
-from contextlib import contextmanager
+from app.core.logger import get_logger
+from contextlib import asynccontextmanager, contextmanager
+
+logger = get_logger(__name__)
 
 UPLOAD_DIR = Path("tmp/uploads")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+HASH_BLOCK_BYTES = 1024 * 1024
 
 
 def save_temp_file(file: UploadFile) -> Path:
@@ -17,18 +23,46 @@ def save_temp_file(file: UploadFile) -> Path:
     with open(temp_path, "wb") as buffer:
         shutil.copyfileobj(file.file, buffer)
 
-    logger.info(f"Arquivo[{file.filename}] temporário salvo em: {temp_path}")
+    logger.info("Arquivo[%s] temporário salvo em: %s", file.filename, temp_path)
     return temp_path
 
 
+async def save_temp_file_async(file: UploadFile) -> Path:
+    """Como `save_temp_file`, com a cópia do upload fora do event loop."""
+    return await asyncio.to_thread(save_temp_file, file)
+
+
+def _remove_temp_file(path: Path):
+    if path.exists():
+        path.unlink()
+        logger.info("Arquivo temporário removido: %s", path)
+    else:
+        logger.warning("Tentativa de remover arquivo que não existe: %s", path)
+
+
 @contextmanager
 def temporary_upload_file(file: UploadFile):
     path = save_temp_file(file)
     try:
         yield path
     finally:
-        if path.exists():
-            path.unlink()
-            logger.info(f"Arquivo temporário removido: {path}")
-        else:
-            logger.warning(f"Tentativa de remover arquivo que não existe: {path}")
+        _remove_temp_file(path)
+
+
+@asynccontextmanager
+async def temporary_upload_file_async(file: UploadFile):
+    path = await save_temp_file_async(file)
+    try:
+        yield path
+    finally:
+        _remove_temp_file(path)
+
+
+def file_sha256(stream: BinaryIO) -> str:
+    """Hash do conteúdo do stream, que volta à posição inicial ao final."""
+    start = stream.tell()
+    digest = hashlib.sha256()
+    for block in iter(lambda: stream.read(HASH_BLOCK_BYTES), b""):
+        digest.update(block)
+    stream.seek(start)
+    return digest.hexdigest()
@@ -1,9 +1,23 @@
+from pathlib import PurePath
+
 ALLOWED_MIME_TYPES = {
     "text/csv",
     "application/vnd.ms-excel",
     "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "application/vnd.apache.parquet",
+    "application/x-parquet",
+    "application/vnd.apache.arrow.file",
+    "application/vnd.apache.arrow.stream",
 }
 
+# Navegadores e clientes HTTP costumam enviar formatos binários sem um tipo
+# específico, então estes são aceitos pela extensão
+GENERIC_MIME_TYPES = {"application/octet-stream"}
+BINARY_EXTENSIONS = {".parquet", ".arrow", ".feather", ".ipc"}
+
 
 def validate_file_mime(file) -> bool:
-    return file.content_type in ALLOWED_MIME_TYPES
+    if file.content_type in ALLOWED_MIME_TYPES:
+        return True
+    extension = PurePath(file.filename or "").suffix.lower()
+    return file.content_type in GENERIC_MIME_TYPES and extension in BINARY_EXTENSIONS
@@ -0,0 +1,263 @@
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Iterable, Tuple
+from pandas.api.types import CategoricalDtype, is_numeric_dtype
+from app.exceptions.exceptions import BadRequestException
+from app.models.validation_report import (
+    SEVERITY_ERROR,
+    SEVERITY_WARNING,
+    InventoryValidationReport,
+    ValidationIssue,
+)
+
+REQUIRED_COLUMNS = {"Flow Name", "Amount", "Unit", "Flow Direction", "UEV", "Category"}
+DIRECTION_COLUMN = "Flow Direction"
+CATEGORY_COLUMN = "Category"
+NUMERIC_COLUMNS = ("Amount", "UEV")
+INPUT_DIRECTION = "input"
+OUTPUT_DIRECTION = "output"
+KNOWN_DIRECTIONS = (INPUT_DIRECTION, OUTPUT_DIRECTION)
+KNOWN_CATEGORIES = ("R", "N", "F")
+# Limite de linhas citadas em uma mensagem de erro
+MAX_REPORTED_ROWS = 20
+# Limite de linhas listadas por problema no relatório de validação
+REPORT_MAX_ROWS = 1000
+# Marca, em `DataFrame.attrs`, os inventários produzidos por validate_inventory
+VALIDATED_ATTR = "inventory_validated"
+
+INVALID_AMOUNT = "invalid_amount"
+INVALID_UEV = "invalid_uev"
+MISSING_UEV = "missing_uev"
+UNKNOWN_DIRECTION = "unknown_direction"
+UNKNOWN_CATEGORY = "unknown_category"
+
+# Problemas na ordem em que `validate_inventory` os verifica; os avisos não
+# impedem o cálculo
+ISSUES = {
+    INVALID_AMOUNT: (
+        SEVERITY_ERROR,
+        "Valores inválidos encontrados na coluna 'Amount'.",
+    ),
+    INVALID_UEV: (
+        SEVERITY_ERROR,
+        "Valores inválidos encontrados na coluna 'UEV' para as entradas.",
+    ),
+    MISSING_UEV: (SEVERITY_ERROR, "Valores de UEV ausentes para entradas."),
+    UNKNOWN_DIRECTION: (
+        SEVERITY_WARNING,
+        "Flow Direction diferente de 'Input' ou 'Output'; a linha não entra no "
+        "cálculo.",
+    ),
+    UNKNOWN_CATEGORY: (
+        SEVERITY_WARNING,
+        "Categoria diferente de R, N ou F; a entrada não é usada nos "
+        "indicadores de sustentabilidade.",
+    ),
+}
+
+
+def _normalize_direction(value: str) -> str:
+    return value.strip().lower()
+
+
+def _normalize_category(value: str) -> str:
+    return value.strip().upper()
+
+
+def is_normalized(df: pd.DataFrame) -> bool:
+    """Verifica, só pelos tipos e categorias, se o inventário já passou por
+    `normalize_inventory`."""
+    try:
+        return (
+            _is_normalized_categorical(df[DIRECTION_COLUMN], _normalize_direction)
+            and _is_normalized_categorical(df[CATEGORY_COLUMN], _normalize_category)
+            and all(df[column].dtype == np.float64 for column in NUMERIC_COLUMNS)
+        )
+    except KeyError:
+        return False
+
+
+def _is_normalized_categorical(
+    column: pd.Series, normalize: Callable[[str], str]
+) -> bool:
+    if not isinstance(column.dtype, CategoricalDtype):
+        return False
+    return all(
+        isinstance(value, str) and normalize(value) == value
+        for value in column.cat.categories
+    )
+
+
+def normalize_inventory(df: pd.DataFrame) -> pd.DataFrame:
+    """Inventário com Flow Direction e Category normalizados como categóricos
+    e Amount/UEV em float64 (valores inválidos viram NaN). Não altera o
+    DataFrame recebido e retorna o mesmo objeto se ele já estiver normalizado."""
+    if is_normalized(df):
+        return df
+    return _normalize(df)[0]
+
+
+def validate_inventory(df: pd.DataFrame) -> pd.DataFrame:
+    """Normaliza o inventário em uma única passada e rejeita Amount inválido
+    em qualquer linha e UEV inválido ou ausente em linhas que não são saída.
+    As linhas citadas seguem a numeração do arquivo (índice + 2). Só é
+    dispensado para inventários que esta função já retornou: tipos já
+    normalizados (ex.: categóricos de Parquet/Arrow) não provam que os valores
+    foram verificados."""
+    if df.attrs.get(VALIDATED_ATTR):
+        return df
+    _check_required_columns(df)
+    inventory, invalid_amount, invalid_uev = _normalize(df)
+    masks = _issue_masks(inventory, invalid_amount, invalid_uev)
+
+    if masks[INVALID_AMOUNT].any():
+        raise BadRequestException(
+            "Valores inválidos encontrados na coluna 'Amount' nas linhas: "
+            f"{format_row_numbers(inventory.index[masks[INVALID_AMOUNT]])}"
+        )
+    if masks[INVALID_UEV].any():
+        raise BadRequestException(
+            "Valores inválidos encontrados na coluna 'UEV' para as entradas nas "
+            f"linhas: {format_row_numbers(inventory.index[masks[INVALID_UEV]])}"
+        )
+    if masks[MISSING_UEV].any():
+        raise BadRequestException(
+            "Valores de UEV ausentes para entradas nas linhas: "
+            f"{format_row_numbers(inventory.index[masks[MISSING_UEV]])}"
+        )
+
+    inventory.attrs[VALIDATED_ATTR] = True
+    return inventory
+
+
+class InventoryValidator:
+    """Reúne todos os problemas por linha de um inventário, bloco a bloco,
+    sem interromper no primeiro erro e sem calcular a emergia."""
+
+    def __init__(self, max_rows: int = REPORT_MAX_ROWS):
+        self.max_rows = max_rows
+        self.rows = 0
+        self.issues = {
+            code: ValidationIssue(code, severity, message)
+            for code, (severity, message) in ISSUES.items()
+        }
+
+    def add_chunk(self, chunk: pd.DataFrame):
+        _check_required_columns(chunk)
+        inventory, invalid_amount, invalid_uev = _normalize(chunk)
+        self.rows += len(inventory)
+
+        for code, mask in _issue_masks(inventory, invalid_amount, invalid_uev).items():
+            count = int(np.count_nonzero(mask))
+            if not count:
+                continue
+            issue = self.issues[code]
+            issue.count += count
+            remaining = self.max_rows - len(issue.rows)
+            if remaining > 0:
+                issue.rows.extend(
+                    int(label) + 2 for label in inventory.index[mask][:remaining]
+                )
+
+    def add_chunks(self, chunks: Iterable[pd.DataFrame]) -> "InventoryValidator":
+        for chunk in chunks:
+            self.add_chunk(chunk)
+        return self
+
+    def report(self) -> InventoryValidationReport:
+        return InventoryValidationReport(
+            rows=self.rows,
+            issues=[issue for issue in self.issues.values() if issue.count],
+        )
+
+
+def format_row_numbers(index: pd.Index) -> str:
+    row_numbers = [str(int(label) + 2) for label in index[:MAX_REPORTED_ROWS]]
+    remaining = len(index) - len(row_numbers)
+    if remaining > 0:
+        row_numbers.append(f"e mais {remaining}")
+    return ", ".join(row_numbers)
+
+
+def _check_required_columns(df: pd.DataFrame):
+    missing_columns = REQUIRED_COLUMNS - {str(column).strip() for column in df.columns}
+    if missing_columns:
+        raise BadRequestException(
+            f"Colunas obrigatórias ausentes: {', '.join(missing_columns)}"
+        )
+
+
+def _issue_masks(
+    inventory: pd.DataFrame, invalid_amount: np.ndarray, invalid_uev: np.ndarray
+) -> Dict[str, np.ndarray]:
+    directions = inventory[DIRECTION_COLUMN].array
+    # Direções desconhecidas ou ausentes também exigem UEV, como entradas
+    requires_uev = np.asarray(directions != OUTPUT_DIRECTION)
+    is_input = np.asarray(directions == INPUT_DIRECTION)
+    invalid_uev = invalid_uev & requires_uev
+    return {
+        INVALID_AMOUNT: invalid_amount,
+        INVALID_UEV: invalid_uev,
+        MISSING_UEV: np.isnan(inventory["UEV"].to_numpy())
+        & requires_uev
+        & ~invalid_uev,
+        UNKNOWN_DIRECTION: ~_in_categories(directions, KNOWN_DIRECTIONS),
+        UNKNOWN_CATEGORY: is_input
+        & ~_in_categories(inventory[CATEGORY_COLUMN].array, KNOWN_CATEGORIES),
+    }
+
+
+def _in_categories(values: pd.Categorical, allowed: Tuple[str, ...]) -> np.ndarray:
+    # O código -1 (nulo) indexa a última posição, que é sempre False
+    known = np.append(values.categories.isin(allowed), False)
+    return known[values.codes]
+
+
+def _normalize(df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    inventory = df.copy(deep=False)
+    inventory.columns = [str(column).strip() for column in df.columns]
+    inventory[DIRECTION_COLUMN] = _normalized_categorical(
+        inventory[DIRECTION_COLUMN], _normalize_direction
+    )
+    inventory[CATEGORY_COLUMN] = _normalized_categorical(
+        inventory[CATEGORY_COLUMN], _normalize_category
+    )
+
+    invalid = {}
+    for column in NUMERIC_COLUMNS:
+        inventory[column], invalid[column] = _to_float(inventory[column])
+    return inventory, invalid["Amount"], invalid["UEV"]
+
+
+def _normalized_categorical(
+    column: pd.Series, normalize: Callable[[str], str]
+) -> pd.Categorical:
+    # Normaliza apenas os valores distintos e reaplica pelos códigos; valores
+    # que não são texto viram nulos
+    codes, uniques = pd.factorize(column, use_na_sentinel=True)
+    categories = []
+    positions = {}
+    mapping = np.full(len(uniques) + 1, -1, dtype=np.int32)
+    for index, value in enumerate(uniques):
+        if not isinstance(value, str):
+            continue
+        value = normalize(value)
+        if value not in positions:
+            positions[value] = len(categories)
+            categories.append(value)
+        mapping[index] = positions[value]
+    return pd.Categorical.from_codes(
+        mapping[codes], categories=pd.Index(categories, dtype=object)
+    )
+
+
+def _to_float(column: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Converte para float64 e retorna também a máscara de valores presentes
+    que não puderam ser convertidos."""
+    if is_numeric_dtype(column.dtype):
+        values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+        return values, np.zeros(len(values), dtype=bool)
+    values = pd.to_numeric(column, errors="coerce").to_numpy(
+        dtype=np.float64, na_value=np.nan
+    )
+    return values, np.isnan(values) & column.notna().to_numpy()
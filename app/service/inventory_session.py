@@ -0,0 +1,307 @@
+import math
+import threading
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+import pandas as pd
+from app.core.cache import TTLCache
+from app.core.config import Settings
+from app.core.logger import get_logger
+from app.exceptions.exceptions import (
+    BadRequestException,
+    NotFoundException,
+    TooManyRequestsException,
+)
+from app.models.emergy_result import EmergyTotals
+from app.models.inventory_session import (
+    InventoryFlow,
+    InventoryFlowUpdate,
+    InventorySessionState,
+)
+from app.service.emergy_aggregator import NeumaierSum
+from app.service.emergy_service import EmergyService
+from app.service.inventory import (
+    CATEGORY_COLUMN,
+    DIRECTION_COLUMN,
+    INPUT_DIRECTION,
+    normalize_inventory,
+)
+
+logger = get_logger(__name__)
+
+
+@lru_cache
+def get_settings():
+    return Settings()
+
+
+@dataclass(slots=True)
+class SessionFlow:
+    flow_name: str
+    amount: Optional[float]
+    unit: str
+    flow_direction: Optional[str]
+    uev: Optional[float]
+    category: Optional[str]
+
+    @property
+    def emergy(self) -> Optional[float]:
+        """Contribuição do fluxo para os totais; None se não entra no cálculo."""
+        if (
+            self.flow_direction != INPUT_DIRECTION
+            or self.amount is None
+            or self.uev is None
+        ):
+            return None
+        return self.amount * self.uev
+
+    def to_dict(self) -> dict:
+        return {
+            "flow_name": self.flow_name,
+            "amount": self.amount,
+            "unit": self.unit,
+            "flow_direction": self.flow_direction,
+            "uev": self.uev,
+            "category": self.category,
+        }
+
+
+def _optional(value) -> Optional:
+    return None if pd.isna(value) else value
+
+
+class InventorySession:
+    """Inventário mantido em memória para edições interativas. Os totais por
+    categoria são somas compensadas atualizadas pela diferença de cada fluxo
+    alterado, então cada operação custa O(1), independente do tamanho do
+    inventário."""
+
+    def __init__(self, session_id: str, owner: str, filename: Optional[str]):
+        self.id = session_id
+        self.owner = owner
+        self.filename = filename
+        self.flows: Dict[int, SessionFlow] = {}
+        self._next_id = 1
+        self._by_category: Dict[str, NeumaierSum] = {}
+        self._category_rows: Dict[str, int] = {}
+        self._total = NeumaierSum()
+        self._input_rows = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_inventory(
+        cls,
+        session_id: str,
+        owner: str,
+        inventory: pd.DataFrame,
+        filename: Optional[str] = None,
+    ) -> "InventorySession":
+        session = cls(session_id, owner, filename)
+        inventory = normalize_inventory(inventory)
+        columns = zip(
+            inventory["Flow Name"].astype(str),
+            inventory["Amount"].to_numpy(),
+            inventory["Unit"].astype(str),
+            inventory[DIRECTION_COLUMN].astype(object),
+            inventory["UEV"].to_numpy(),
+            inventory[CATEGORY_COLUMN].astype(object),
+        )
+        for name, amount, unit, direction, uev, category in columns:
+            session._insert(
+                SessionFlow(
+                    name.strip(),
+                    None if np.isnan(amount) else float(amount),
+                    unit,
+                    _optional(direction),
+                    None if np.isnan(uev) else float(uev),
+                    _optional(category),
+                )
+            )
+        return session
+
+    def list_flows(self, offset: int, limit: int) -> List[Tuple[int, SessionFlow]]:
+        with self._lock:
+            ids = sorted(self.flows)[offset : offset + limit]
+            return [(flow_id, self.flows[flow_id]) for flow_id in ids]
+
+    def add(self, flow: InventoryFlow) -> Tuple[int, InventorySessionState]:
+        new = SessionFlow(**flow.model_dump())
+        self._check(new)
+        with self._lock:
+            flow_id = self._insert(new)
+            return flow_id, self._state()
+
+    def update(
+        self, flow_id: int, changes: InventoryFlowUpdate
+    ) -> InventorySessionState:
+        with self._lock:
+            current = self._get_flow(flow_id)
+            new = SessionFlow(
+                **{**current.to_dict(), **changes.model_dump(exclude_unset=True)}
+            )
+            self._check(new)
+            self._remove(flow_id)
+            self._insert(new, flow_id)
+            return self._state()
+
+    def delete(self, flow_id: int) -> InventorySessionState:
+        with self._lock:
+            self._get_flow(flow_id)
+            self._remove(flow_id)
+            return self._state()
+
+    def state(self) -> InventorySessionState:
+        with self._lock:
+            return self._state()
+
+    def _get_flow(self, flow_id: int) -> SessionFlow:
+        flow = self.flows.get(flow_id)
+        if flow is None:
+            raise NotFoundException("Fluxo não encontrado na sessão.")
+        return flow
+
+    @staticmethod
+    def _check(flow: SessionFlow):
+        if flow.flow_direction == INPUT_DIRECTION and flow.uev is None:
+            raise BadRequestException("Fluxos de entrada precisam de UEV.")
+
+    def _insert(self, flow: SessionFlow, flow_id: Optional[int] = None) -> int:
+        if flow_id is None:
+            flow_id = self._next_id
+            self._next_id += 1
+        self.flows[flow_id] = flow
+        self._apply(flow, 1)
+        return flow_id
+
+    def _remove(self, flow_id: int):
+        self._apply(self.flows.pop(flow_id), -1)
+
+    def _apply(self, flow: SessionFlow, sign: int):
+        emergy = flow.emergy
+        if emergy is None:
+            return
+        self._input_rows += sign
+        self._total.add(sign * emergy)
+        if flow.category is None:
+            return
+        rows = self._category_rows.get(flow.category, 0) + sign
+        if rows:
+            self._category_rows[flow.category] = rows
+            self._by_category.setdefault(flow.category, NeumaierSum()).add(
+                sign * emergy
+            )
+        else:
+            # Sem linhas, a categoria sai dos totais em vez de ficar com o
+            # resíduo de arredondamento
+            self._category_rows.pop(flow.category, None)
+            self._by_category.pop(flow.category, None)
+
+    def _state(self) -> InventorySessionState:
+        totals = EmergyTotals(
+            by_category={
+                category: accumulator.value
+                for category, accumulator in sorted(self._by_category.items())
+            },
+            total=self._total.value if self._input_rows else 0.0,
+        )
+        state = InventorySessionState(rows=len(self.flows), totals=totals)
+        if not self._input_rows:
+            state.error = (
+                "Nenhuma entrada válida com Flow Direction = 'Input' encontrada."
+            )
+            return state
+        try:
+            state.indicators = EmergyService.calculate_sustainability_indicators(totals)
+        except BadRequestException as e:
+            state.error = e.detail
+        return state
+
+
+class InventorySessionStore:
+    """Sessões em memória por usuário, expiradas após um período sem uso. Com
+    um dos limites atingido, novas sessões são recusadas: as sessões abertas,
+    inclusive as de outros usuários, nunca são descartadas para dar lugar."""
+
+    def __init__(
+        self,
+        max_sessions: int,
+        ttl_seconds: float,
+        max_sessions_per_owner: Optional[int] = None,
+    ):
+        self.max_sessions = max_sessions
+        self.max_sessions_per_owner = max_sessions_per_owner or max_sessions
+        self.sessions = TTLCache(max_size=max_sessions, ttl_seconds=ttl_seconds)
+        self._owners: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def create(
+        self, owner: str, inventory: pd.DataFrame, filename: Optional[str] = None
+    ) -> InventorySession:
+        session = InventorySession.from_inventory(
+            uuid.uuid4().hex, owner, inventory, filename
+        )
+        with self._lock:
+            self._check_capacity(owner)
+            self.sessions.set(session.id, session)
+            self._owners.setdefault(owner, set()).add(session.id)
+        logger.info(
+            "Sessão de inventário [%s] criada com %d fluxos.",
+            session.id,
+            len(session.flows),
+        )
+        return session
+
+    def get(self, owner: str, session_id: str) -> InventorySession:
+        session = self.sessions.get(session_id)
+        # Sessões de outros usuários são tratadas como inexistentes
+        if session is None or session.owner != owner:
+            raise NotFoundException("Sessão de inventário não encontrada.")
+        # Cada acesso renova o prazo de expiração
+        self.sessions.set(session_id, session)
+        return session
+
+    def close(self, owner: str, session_id: str):
+        self.get(owner, session_id)
+        self.sessions.invalidate(session_id)
+        with self._lock:
+            self._open_sessions(owner)
+
+    def _check_capacity(self, owner: str):
+        # As sessões expiram por inatividade, então esse é o maior tempo de
+        # espera até uma vaga ser liberada
+        retry_after = max(1, math.ceil(self.sessions.ttl_seconds))
+        if self._open_sessions(owner) >= self.max_sessions_per_owner:
+            raise TooManyRequestsException(
+                "Limite de sessões de inventário abertas atingido. Encerre uma "
+                "sessão antes de criar outra.",
+                retry_after=retry_after,
+            )
+        if sum(map(self._open_sessions, list(self._owners))) >= self.max_sessions:
+            logger.warning("Limite global de sessões de inventário atingido.")
+            raise TooManyRequestsException(retry_after=retry_after)
+
+    def _open_sessions(self, owner: str) -> int:
+        """Esquece as sessões encerradas ou expiradas do usuário e retorna
+        quantas continuam abertas."""
+        session_ids = {
+            session_id
+            for session_id in self._owners.get(owner, ())
+            if self.sessions.get_entry(session_id, record=False) is not None
+        }
+        if session_ids:
+            self._owners[owner] = session_ids
+        else:
+            self._owners.pop(owner, None)
+        return len(session_ids)
+
+
+@lru_cache
+def get_inventory_session_store() -> InventorySessionStore:
+    settings = get_settings()
+    return InventorySessionStore(
+        max_sessions=settings.inventory_session_max,
+        ttl_seconds=settings.inventory_session_ttl_seconds,
+        max_sessions_per_owner=settings.inventory_session_max_per_owner,
+    )
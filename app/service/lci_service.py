@@ -1,72 +1,224 @@
-from typing import List
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 from app.models.lci_models import LCIProduct, LCIFlow
-from app.core.logger import logger
+from app.core.logger import get_logger
+from app.core.metrics import LCI_REQUEST_ERRORS, LCI_REQUEST_SECONDS
 from app.core.config import Settings
 from functools import lru_cache
 from app.exceptions.exceptions import LCIServiceException
 
+logger = get_logger(__name__)
+
 
 @lru_cache
 def get_settings():
     return Settings()
 
 
+def _create_http_session(settings: Settings) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=settings.lci_max_keepalive_connections,
+        pool_maxsize=settings.lci_max_connections,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class AsyncLCIClient:
+    def __init__(
+        self, settings: Settings, transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.timeout = httpx.Timeout(
+            settings.lci_timeout_seconds,
+            connect=settings.lci_connect_timeout_seconds,
+        )
+        self.limits = httpx.Limits(
+            max_connections=settings.lci_max_connections,
+            max_keepalive_connections=settings.lci_max_keepalive_connections,
+        )
+        self.max_concurrency = settings.lci_max_concurrency
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _ensure_client(self) -> httpx.AsyncClient:
+        # O pool de conexões fica preso ao event loop em que foi criado
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            stale_client, stale_loop = self._client, self._loop
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout, limits=self.limits, transport=self.transport
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+            if stale_client is not None:
+                await self._close_stale_client(stale_client, stale_loop)
+        return self._client
+
+    @staticmethod
+    async def _close_stale_client(
+        client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]
+    ):
+        # O cliente antigo é fechado no próprio loop, se ele ainda estiver
+        # rodando; se já foi encerrado, as conexões são descartadas aqui
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+        try:
+            await client.aclose()
+        except RuntimeError:
+            logger.debug("Conexões do cliente LCI anterior descartadas.", exc_info=True)
+
+    async def get(self, url: str) -> httpx.Response:
+        client = await self._ensure_client()
+        async with self._semaphore:
+            return await client.get(url)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+            self._loop = None
+
+
+http_session = _create_http_session(get_settings())
+async_http_client = AsyncLCIClient(get_settings())
+
+
+def _parse_products(products: list) -> List[LCIProduct]:
+    return [LCIProduct(**item) for item in products]
+
+
+def _parse_flows(flows: list) -> List[LCIFlow]:
+    return [
+        LCIFlow(
+            **{
+                "flow_name": f["Flow Name"],
+                "amount": f["Amount"],
+                "unit": f["Unit"],
+                "flow_direction": f["Flow Direction"],
+                "uev": f["UEV"],
+                "category": f["Category"],
+            }
+        )
+        for f in flows
+    ]
+
+
+def _upstream_error(response) -> LCIServiceException:
+    """Falhas do serviço externo são sempre 502 para o cliente; o status
+    original fica em `upstream_status` para logs e métricas."""
+    if response is None:
+        return LCIServiceException("Erro desconhecido na API externa.")
+    return LCIServiceException(response.text, upstream_status=response.status_code)
+
+
+@contextmanager
+def _track_call(operation: str):
+    """Registra a latência da chamada ao serviço LCI e, em caso de erro, o
+    status devolvido pelo serviço (502 quando ele não respondeu)."""
+    started = time.perf_counter()
+    try:
+        yield
+    except LCIServiceException as e:
+        LCI_REQUEST_ERRORS.inc(
+            operation=operation, status=e.upstream_status or e.status_code
+        )
+        raise
+    finally:
+        LCI_REQUEST_SECONDS.observe(time.perf_counter() - started, operation=operation)
+
+
 class LCIService:
     def __init__(self):
-        self.api_url = get_settings().lci_service_api_url
+        settings = get_settings()
+        self.api_url = settings.lci_service_api_url
+        self.timeout = (
+            settings.lci_connect_timeout_seconds,
+            settings.lci_timeout_seconds,
+        )
 
     def list_products(self) -> List[LCIProduct]:
-        try:
-            response = requests.get(f"{self.api_url}/products")
-            response.raise_for_status()
-            products = response.json()
-            return [LCIProduct(**item) for item in products]
-        except requests.HTTPError as e:
-            logger.error("Erro na chamada a API externa: ", exc_info=True)
-            detail = (
-                e.response.text if e.response else "Erro desconhecido na API externa."
-            )
-            raise LCIServiceException(
-                detail, status_code=e.response.status_code if e.response else 502
-            )
-        except requests.RequestException:
-            logger.error(
-                "Erro ao buscar produtos LCI no serviço externo: ", exc_info=True
-            )
-            raise LCIServiceException("Erro ao buscar produtos LCI no serviço externo.")
+        with _track_call("list_products"):
+            try:
+                response = http_session.get(
+                    f"{self.api_url}/products", timeout=self.timeout
+                )
+                response.raise_for_status()
+                return _parse_products(response.json())
+            except requests.HTTPError as e:
+                logger.error("Erro na chamada a API externa: ", exc_info=True)
+                raise _upstream_error(e.response)
+            except requests.RequestException:
+                logger.error(
+                    "Erro ao buscar produtos LCI no serviço externo: ", exc_info=True
+                )
+                raise LCIServiceException(
+                    "Erro ao buscar produtos LCI no serviço externo."
+                )
+
+    async def list_products_async(self) -> List[LCIProduct]:
+        with _track_call("list_products"):
+            try:
+                response = await async_http_client.get(f"{self.api_url}/products")
+                response.raise_for_status()
+                return _parse_products(response.json())
+            except httpx.HTTPStatusError as e:
+                logger.error("Erro na chamada a API externa: ", exc_info=True)
+                raise _upstream_error(e.response)
+            except httpx.HTTPError:
+                logger.error(
+                    "Erro ao buscar produtos LCI no serviço externo: ", exc_info=True
+                )
+                raise LCIServiceException(
+                    "Erro ao buscar produtos LCI no serviço externo."
+                )
 
     def get_flows_by_product_id(self, product_id: int) -> List[LCIFlow]:
-        try:
-            response = requests.get(f"{self.api_url}/products/{product_id}")
-            response.raise_for_status()
-            flows = response.json()
-            return [
-                LCIFlow(
-                    **{
-                        "flow_name": f["Flow Name"],
-                        "amount": f["Amount"],
-                        "unit": f["Unit"],
-                        "flow_direction": f["Flow Direction"],
-                        "uev": f["UEV"],
-                        "category": f["Category"],
-                    }
+        with _track_call("get_flows"):
+            try:
+                response = http_session.get(
+                    f"{self.api_url}/products/{product_id}", timeout=self.timeout
+                )
+                response.raise_for_status()
+                return _parse_flows(response.json())
+            except requests.HTTPError as e:
+                logger.error("Erro ao buscar flows do produto LCI: ", exc_info=True)
+                raise _upstream_error(e.response)
+            except requests.RequestException:
+                logger.error(
+                    "Erro ao buscar flows do produto LCI no serviço externo: ",
+                    exc_info=True,
+                )
+                raise LCIServiceException(
+                    "Erro ao buscar flows do produto LCI no serviço externo.",
+                )
+
+    async def get_flows_by_product_id_async(self, product_id: int) -> List[LCIFlow]:
+        with _track_call("get_flows"):
+            try:
+                response = await async_http_client.get(
+                    f"{self.api_url}/products/{product_id}"
+                )
+                response.raise_for_status()
+                return _parse_flows(response.json())
+            except httpx.HTTPStatusError as e:
+                logger.error("Erro ao buscar flows do produto LCI: ", exc_info=True)
+                raise _upstream_error(e.response)
+            except httpx.HTTPError:
+                logger.error(
+                    "Erro ao buscar flows do produto LCI no serviço externo: ",
+                    exc_info=True,
+                )
+                raise LCIServiceException(
+                    "Erro ao buscar flows do produto LCI no serviço externo.",
                 )
-                for f in flows
-            ]
-        except requests.HTTPError as e:
-            logger.error("Erro ao buscar flows do produto LCI: ", exc_info=True)
-            detail = (
-                e.response.text if e.response else "Erro desconhecido na API externa."
-            )
-            raise LCIServiceException(
-                detail, status_code=e.response.status_code if e.response else 502
-            )
-        except requests.RequestException:
-            logger.error(
-                "Erro ao buscar flows do produto LCI no serviço externo: ",
-                exc_info=True,
-            )
-            raise LCIServiceException(
-                "Erro ao buscar flows do produto LCI no serviço externo.",
-            )
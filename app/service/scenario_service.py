@@ -0,0 +1,312 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from app.core.logger import get_logger
+from app.exceptions.exceptions import BadRequestException
+from app.models.emergy_result import (
+    EmergyResult,
+    EmergyTotals,
+    SustainabilityIndicators,
+)
+from app.models.scenario_models import (
+    FlowDistribution,
+    MonteCarloSpec,
+    Scenario,
+    ScenarioRequest,
+)
+from app.models.scenario_result import (
+    DistributionSummary,
+    MonteCarloSummary,
+    ScenarioAnalysis,
+    ScenarioOutcome,
+)
+from app.models.sustainability_classification import ESI_CLASSES, ESI_THRESHOLDS
+from app.service.inventory import (
+    CATEGORY_COLUMN,
+    DIRECTION_COLUMN,
+    INPUT_DIRECTION,
+    normalize_inventory,
+)
+
+logger = get_logger(__name__)
+
+FLOW_COLUMN = "Flow Name"
+
+INDICATORS_ERROR = "Não é possível calcular EYR/ELR/ESI com R ou F igual a 0."
+
+
+def _sample_factors(
+    distribution: FlowDistribution, size: int, rng: np.random.Generator
+) -> np.ndarray:
+    if distribution.kind == "normal":
+        return rng.normal(1.0, distribution.sd, size)
+    if distribution.kind == "lognormal":
+        return rng.lognormal(0.0, np.log(distribution.sd), size)
+    if distribution.kind == "uniform":
+        return rng.uniform(distribution.low, distribution.high, size)
+    if distribution.low == distribution.high:
+        return np.full(size, distribution.low)
+    return rng.triangular(distribution.low, 1.0, distribution.high, size)
+
+
+class ScenarioService:
+    """Avalia cenários sobre um inventário base sem recalcular o inventário.
+
+    As linhas de entrada são agregadas por fluxo (Flow Name) e categoria, e
+    cada cenário é a emergia base somada às diferenças dos fluxos alterados.
+    Os cenários explícitos formam uma matriz esparsa cenários × fluxos; as
+    iterações de Monte Carlo, uma matriz densa de fatores iterações × fluxos
+    multiplicada pela emergia de cada fluxo por categoria.
+    """
+
+    def __init__(self, inventory: pd.DataFrame):
+        inventory = normalize_inventory(inventory)
+        inputs = inventory[inventory[DIRECTION_COLUMN] == INPUT_DIRECTION]
+        if inputs.empty:
+            raise BadRequestException(
+                "Nenhuma entrada válida com Flow Direction = 'Input' encontrada."
+            )
+        inputs = inputs.dropna(subset=["Amount", "UEV"])
+        if inputs.empty:
+            raise BadRequestException("Nenhuma linha com Amount e UEV válidos.")
+
+        categories = inputs[CATEGORY_COLUMN].array
+        present = np.bincount(
+            categories.codes[categories.codes >= 0],
+            minlength=len(categories.categories),
+        )
+        self.categories: List[str] = sorted(
+            category
+            for index, category in enumerate(categories.categories)
+            if present[index]
+        )
+        # Coluna de cada linha nas matrizes de totais; a última coluna acumula
+        # as linhas sem categoria, que só entram no total
+        column_of = {category: i for i, category in enumerate(self.categories)}
+        self.width = len(self.categories) + 1
+        lookup = np.array(
+            [
+                column_of.get(category, self.width - 1)
+                for category in categories.categories
+            ]
+            + [self.width - 1]
+        )
+        self.columns = lookup[categories.codes]
+        self.flow_codes, flow_names = pd.factorize(
+            inputs[FLOW_COLUMN].astype(str).str.strip()
+        )
+        self.flow_index = {flow: code for code, flow in enumerate(flow_names)}
+        self.amount = inputs["Amount"].to_numpy()
+        self.uev = inputs["UEV"].to_numpy()
+        self.base = np.bincount(
+            self.columns, weights=self.amount * self.uev, minlength=self.width
+        )
+
+    def analyze(self, request: ScenarioRequest) -> ScenarioAnalysis:
+        base = self._outcomes(self._with_total(self.base[None]), [None])[0]
+        if base.result is None:
+            raise BadRequestException(INDICATORS_ERROR)
+
+        scenarios = self._evaluate_scenarios(request.scenarios)
+        monte_carlo = (
+            self._simulate(request.monte_carlo)
+            if request.monte_carlo is not None
+            else None
+        )
+        logger.info(
+            "Análise de cenários: %d cenários, %d iterações.",
+            len(scenarios),
+            request.monte_carlo.iterations if monte_carlo else 0,
+        )
+        return ScenarioAnalysis(base.result, scenarios, monte_carlo)
+
+    def _flow_sums(self, flows: List[str]) -> Dict[str, np.ndarray]:
+        """Somas por fluxo e coluna (fluxos × colunas) usadas para recalcular
+        a emergia de um fluxo com Amount ou UEV substituídos."""
+        unknown = sorted(set(flows) - self.flow_index.keys())
+        if unknown:
+            raise BadRequestException(
+                "Fluxos não encontrados nas entradas do inventário: "
+                f"{', '.join(unknown)}"
+            )
+
+        # Posição de cada fluxo do inventário na lista pedida (-1 se ausente)
+        position = np.full(len(self.flow_index), -1)
+        position[[self.flow_index[flow] for flow in flows]] = np.arange(len(flows))
+        flow_index = position[self.flow_codes]
+        rows = flow_index >= 0
+        flow_index = flow_index[rows]
+        keys = flow_index * self.width + self.columns[rows]
+        amount = self.amount[rows]
+        uev = self.uev[rows]
+
+        def by_flow(weights=None) -> np.ndarray:
+            sums = np.bincount(keys, weights=weights, minlength=len(flows) * self.width)
+            return sums.reshape(len(flows), self.width).astype(float)
+
+        return {
+            "emergy": by_flow(amount * uev),
+            "amount": by_flow(amount),
+            "uev": by_flow(uev),
+            "rows": by_flow(),
+        }
+
+    def _evaluate_scenarios(self, scenarios: List[Scenario]) -> List[ScenarioOutcome]:
+        if not scenarios:
+            return []
+
+        flows = list(
+            dict.fromkeys(
+                override.flow.strip()
+                for scenario in scenarios
+                for override in scenario.overrides
+            )
+        )
+        sums = self._flow_sums(flows)
+        column = {flow: i for i, flow in enumerate(flows)}
+
+        # Uma entrada por alteração: cenário, fluxo, valores absolutos (NaN
+        # mantém o valor de cada linha) e fatores
+        entries = [
+            (
+                i,
+                column[override.flow.strip()],
+                np.nan if override.amount is None else override.amount,
+                np.nan if override.uev is None else override.uev,
+                1.0 if override.amount_factor is None else override.amount_factor,
+                1.0 if override.uev_factor is None else override.uev_factor,
+            )
+            for i, scenario in enumerate(scenarios)
+            for override in scenario.overrides
+        ]
+        scenario, flow, amount, uev, amount_factor, uev_factor = (
+            np.array(values) for values in zip(*entries)
+        )
+        flow = flow.astype(int)
+        amount, uev = amount[:, None], uev[:, None]
+        has_amount, has_uev = ~np.isnan(amount), ~np.isnan(uev)
+
+        base = sums["emergy"][flow]
+        emergy = (
+            np.where(
+                has_amount & has_uev,
+                amount * uev * sums["rows"][flow],
+                np.where(
+                    has_amount,
+                    amount * sums["uev"][flow],
+                    np.where(has_uev, uev * sums["amount"][flow], base),
+                ),
+            )
+            * (amount_factor * uev_factor)[:, None]
+        )
+
+        by_column = np.tile(self.base, (len(scenarios), 1))
+        np.add.at(by_column, scenario.astype(int), emergy - base)
+        return self._outcomes(
+            self._with_total(by_column), [item.name for item in scenarios]
+        )
+
+    def _simulate(self, spec: MonteCarloSpec) -> MonteCarloSummary:
+        flows = list(dict.fromkeys(item.flow.strip() for item in spec.distributions))
+        emergy = self._flow_sums(flows)["emergy"]
+        column = {flow: i for i, flow in enumerate(flows)}
+
+        rng = np.random.default_rng(spec.seed)
+        shape = (spec.iterations, len(flows))
+        factors = {"amount": np.ones(shape), "uev": np.ones(shape)}
+        for distribution in spec.distributions:
+            factors[distribution.field][:, column[distribution.flow.strip()]] = (
+                _sample_factors(distribution, spec.iterations, rng)
+            )
+
+        # Iterações × fluxos @ fluxos × colunas: só a variação da emergia dos
+        # fluxos sorteados é somada aos totais base
+        by_column = self.base + (factors["amount"] * factors["uev"] - 1) @ emergy
+        totals = self._with_total(by_column)
+        eyr, elr, esi, valid = self._indicators(totals)
+
+        indicators = {}
+        classification = {}
+        valid_count = int(np.count_nonzero(valid))
+        if valid_count:
+            indicators = dict(
+                zip(
+                    ("EYR", "ELR", "ESI"),
+                    DistributionSummary.from_matrix(
+                        np.column_stack((eyr[valid], elr[valid], esi[valid]))
+                    ),
+                )
+            )
+            counts = np.bincount(
+                np.searchsorted(ESI_THRESHOLDS, esi[valid]),
+                minlength=len(ESI_CLASSES),
+            )
+            # Parcela das iterações com indicadores; as que falharam já são
+            # contadas em failed_iterations
+            classification = {
+                ESI_CLASSES[index].value: count / valid_count
+                for index, count in enumerate(counts)
+                if count
+            }
+
+        return MonteCarloSummary(
+            iterations=spec.iterations,
+            failed_iterations=spec.iterations - valid_count,
+            emergy=dict(
+                zip(
+                    [*self.categories, "Total"], DistributionSummary.from_matrix(totals)
+                )
+            ),
+            indicators=indicators,
+            classification=classification,
+        )
+
+    @staticmethod
+    def _with_total(by_column: np.ndarray) -> np.ndarray:
+        """Totais por categoria seguidos do total geral, que inclui as linhas
+        sem categoria."""
+        return np.column_stack((by_column[:, :-1], by_column.sum(axis=1)))
+
+    def _indicators(
+        self, totals: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        R, N, F = (
+            (
+                totals[:, self.categories.index(category)]
+                if category in self.categories
+                else np.zeros(len(totals))
+            )
+            for category in ("R", "N", "F")
+        )
+        valid = (R != 0) & (F != 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            eyr = (R + N + F) / F
+            elr = (N + F) / R
+            esi = eyr / elr
+        return eyr, elr, esi, valid
+
+    def _outcomes(
+        self, totals: np.ndarray, names: List[Optional[str]]
+    ) -> List[ScenarioOutcome]:
+        eyr, elr, esi, valid = self._indicators(totals)
+        classes = np.searchsorted(ESI_THRESHOLDS, esi)
+        outcomes = []
+        for i, name in enumerate(names):
+            if not valid[i]:
+                outcomes.append(ScenarioOutcome(name, error=INDICATORS_ERROR))
+                continue
+            by_category: Dict[str, float] = {
+                category: float(totals[i, j])
+                for j, category in enumerate(self.categories)
+            }
+            result = EmergyResult(
+                EmergyTotals(by_category=by_category, total=float(totals[i, -1])),
+                SustainabilityIndicators(
+                    eyr=float(eyr[i]),
+                    elr=float(elr[i]),
+                    esi=float(esi[i]),
+                    classification=ESI_CLASSES[classes[i]],
+                ),
+            )
+            outcomes.append(ScenarioOutcome(name, result))
+        return outcomes
@@ -1,20 +1,92 @@
+from functools import lru_cache
+from typing import Dict
+from app.core.cache import TTLCache
+from app.core.config import Settings
+from app.core.metrics import register_cache
+from app.core.executor import get_password_executor
+from app.core.security import generate_password_hash
 from app.db.models import User
-from app.db.crud import get_user_by_email, create_user
+from app.db.crud import (
+    get_user_by_email,
+    get_user_by_email_async,
+    create_user,
+    create_user_async,
+)
 from app.models.authentication import RegisterRequest
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.exceptions.exceptions import BadRequestException
 
 
+@lru_cache
+def get_settings():
+    return Settings()
+
+
+@lru_cache
+def get_user_cache() -> TTLCache:
+    settings = get_settings()
+    return TTLCache(
+        max_size=settings.user_cache_size,
+        ttl_seconds=settings.user_cache_ttl_seconds,
+    )
+
+
 class UserService:
-    def __init__(self, session: Session):
+    def __init__(self, session: Session | AsyncSession):
         self.session = session
 
     def get_user_by_email(self, email: str) -> User | None:
-        return get_user_by_email(self.session, email)
+        cache = get_user_cache()
+        user = cache.get(email)
+        if user is not None:
+            return user
+
+        user = get_user_by_email(self.session, email)
+        if user is not None:
+            # Desvincula o registro da sessão para que um commit posterior não
+            # expire os atributos do objeto em cache
+            self.session.expunge(user)
+            cache.set(email, user)
+        return user
 
     def create_user(self, register_request: RegisterRequest) -> User:
         existing_user = self.get_user_by_email(register_request.email)
         if existing_user:
             raise BadRequestException("Email já está em uso")
 
-        return create_user(self.session, register_request)
+        user = create_user(self.session, register_request)
+        get_user_cache().invalidate(register_request.email)
+        return user
+
+    async def get_user_by_email_async(self, email: str) -> User | None:
+        cache = get_user_cache()
+        user = cache.get(email)
+        if user is not None:
+            return user
+
+        user = await get_user_by_email_async(self.session, email)
+        if user is not None:
+            self.session.expunge(user)
+            cache.set(email, user)
+        return user
+
+    async def create_user_async(self, register_request: RegisterRequest) -> User:
+        existing_user = await self.get_user_by_email_async(register_request.email)
+        if existing_user:
+            raise BadRequestException("Email já está em uso")
+
+        # O bcrypt roda no pool dedicado a senhas, fora do event loop
+        hashed_password = await get_password_executor().run(
+            generate_password_hash, register_request.password
+        )
+        user = await create_user_async(self.session, register_request, hashed_password)
+        get_user_cache().invalidate(register_request.email)
+        return user
+
+    @staticmethod
+    def cache_stats() -> Dict[str, float]:
+        return get_user_cache().stats()
+
+
+register_cache("users", lambda: get_user_cache().stats())
@@ -0,0 +1,257 @@
+"""Benchmarks ponta a ponta pela aplicação ASGI (app.main:app), com a API LCI
+externa substituída por um servidor HTTP local.
+
+Uso: python -m benchmarks.bench_e2e [--rows 1000 100000] [--concurrency 16]
+       [--output resultados.json] [--baseline baseline.json]
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List
+from benchmarks.harness import (
+    BenchmarkResult,
+    add_report_arguments,
+    configure_logging,
+    finish,
+    measure_async,
+    measure_concurrent,
+)
+from benchmarks.inventory import inventory_flows, write_inventory
+
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "benchmark-password"
+
+
+class StubLCIServer:
+    """Servidor local que responde como a API LCI externa, com produtos e
+    flows pré-serializados para não medir a geração dos dados."""
+
+    def __init__(self, products: Dict[int, List[dict]]):
+        self.payloads = {
+            "/products": json.dumps(
+                [
+                    {
+                        "id": product_id,
+                        "name": f"Produto {product_id}",
+                        "description": "",
+                    }
+                    for product_id in products
+                ]
+            ).encode(),
+            **{
+                f"/products/{product_id}": json.dumps(flows).encode()
+                for product_id, flows in products.items()
+            },
+        }
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        payloads = self.payloads
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                body = payloads.get(self.path)
+                self.send_response(200 if body is not None else 404)
+                body = body if body is not None else b"[]"
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "StubLCIServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@contextmanager
+def bench_environment(lci_url: str) -> Iterator[Path]:
+    # As configurações são lidas na importação da aplicação, então o ambiente
+    # precisa estar pronto antes de importar app.main
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{directory}/bench.db"
+        os.environ["LCI_SERVICE_API_URL"] = lci_url
+        yield Path(directory)
+
+
+async def run_benchmarks(
+    args: argparse.Namespace, directory: Path
+) -> List[BenchmarkResult]:
+    import httpx
+    from app.db.database import engine, init_db
+    from app.main import app
+    from app.service.cached_lci_service import get_lci_service
+    from app.service.emergy_result_cache import get_emergy_result_cache
+
+    engine.echo = False
+    init_db()
+
+    def clear_caches():
+        get_lci_service().clear_cache()
+        get_emergy_result_cache().clear()
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        credentials = {"email": BENCH_EMAIL, "password": BENCH_PASSWORD}
+        response = await client.post(
+            "/api/auth/register",
+            json={
+                **credentials,
+                "name": "Benchmark",
+                "surname": "Suite",
+                "mobile_number": "0000000000",
+            },
+        )
+        response.raise_for_status()
+
+        async def login():
+            response = await client.post("/api/auth/login", json=credentials)
+            response.raise_for_status()
+            return response
+
+        results.append(await measure_async("POST /api/auth/login", login, args.repeat))
+        token = (await login()).json()["access_token"]
+        client.headers["Authorization"] = f"Bearer {token}"
+
+        async def get(url: str):
+            response = await client.get(url)
+            response.raise_for_status()
+            return response
+
+        results.append(
+            await measure_async(
+                "GET /api/lci/products",
+                lambda: get("/api/lci/products"),
+                args.repeat,
+                setup=clear_caches,
+            )
+        )
+
+        for product_id, row_count in enumerate(args.rows, start=1):
+            url = f"/api/calculate/by-lci/{product_id}"
+            results.append(
+                await measure_async(
+                    f"GET {url}",
+                    lambda: get(url),
+                    args.repeat,
+                    setup=clear_caches,
+                    rows=row_count,
+                    cache="cold",
+                )
+            )
+            results.append(
+                await measure_async(
+                    f"GET {url}",
+                    lambda: get(url),
+                    args.repeat,
+                    rows=row_count,
+                    cache="warm",
+                )
+            )
+
+            path = write_inventory(directory / f"inventory-{row_count}.csv", row_count)
+            content = path.read_bytes()
+
+            async def upload():
+                response = await client.post(
+                    "/api/calculate/by-file",
+                    files={"file": ("inventory.csv", io.BytesIO(content), "text/csv")},
+                )
+                response.raise_for_status()
+                return response
+
+            results.append(
+                await measure_async(
+                    "POST /api/calculate/by-file",
+                    upload,
+                    args.repeat,
+                    setup=clear_caches,
+                    rows=row_count,
+                    format="csv",
+                )
+            )
+
+        product_ids = list(range(1, len(args.rows) + 1))
+
+        async def batch():
+            response = await client.post(
+                "/api/calculate/by-lci/batch", json={"product_ids": product_ids}
+            )
+            response.raise_for_status()
+            return response
+
+        results.append(
+            await measure_async(
+                "POST /api/calculate/by-lci/batch",
+                batch,
+                args.repeat,
+                setup=clear_caches,
+                products=len(product_ids),
+            )
+        )
+        results.append(
+            await measure_concurrent(
+                "GET /api/calculate/by-lci/1",
+                lambda: get("/api/calculate/by-lci/1"),
+                args.concurrency,
+                args.repeat,
+                setup=clear_caches,
+                rows=args.rows[0],
+            )
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[1_000, 100_000],
+        help="linhas do inventário de cada produto da API LCI simulada",
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    products = {
+        product_id: inventory_flows(row_count, seed=product_id)
+        for product_id, row_count in enumerate(args.rows, start=1)
+    }
+    with StubLCIServer(products) as server, bench_environment(server.url) as directory:
+        configure_logging(args.verbose)
+        results = asyncio.run(run_benchmarks(args, directory))
+    finish("e2e", results, args)
+
+
+if __name__ == "__main__":
+    main()
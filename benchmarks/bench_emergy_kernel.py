@@ -0,0 +1,71 @@
+"""Compara o pipeline de referência baseado em acessores de string com a
+normalização do inventário e o kernel do EmergyAggregator, medidos em separado
+e juntos.
+
+Uso: python -m benchmarks.bench_emergy_kernel [--rows 1000000] [--repeat 5]
+"""
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from app.service.emergy_aggregator import EmergyAggregator
+from app.service.inventory import validate_inventory
+from benchmarks.inventory import synthetic_inventory
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def reference(df: pd.DataFrame) -> pd.Series:
+    # Validação e cálculo anteriores ao inventário normalizado: cada etapa
+    # convertia e normalizava as colunas de novo
+    df = df.copy()
+    df["Amount"] = pd.to_numeric(df["Amount"])
+    pd.to_numeric(df.loc[df["Flow Direction"] != "Output", "UEV"])
+    df = df[df["Flow Direction"].str.strip().str.lower() == "input"].copy()
+    df["UEV"] = pd.to_numeric(df["UEV"], errors="coerce")
+    df = df.dropna(subset=["Amount", "UEV"])
+    df["Emergy"] = df["Amount"] * df["UEV"]
+    return df.groupby(df["Category"].str.strip().str.upper())["Emergy"].sum()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--categories", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = synthetic_inventory(args.rows, args.categories)
+    inventory = validate_inventory(df)
+
+    def aggregate(chunk: pd.DataFrame):
+        return EmergyAggregator().add_chunks([chunk]).result()
+
+    expected = reference(df)
+    totals, _ = aggregate(inventory)
+    assert totals.keys() == expected.to_dict().keys()
+    for category, value in expected.items():
+        assert np.isclose(value, totals[category], rtol=1e-12, atol=0)
+
+    reference_time = best_of(args.repeat, lambda: reference(df))
+    validate_time = best_of(args.repeat, lambda: validate_inventory(df))
+    kernel_time = best_of(args.repeat, lambda: aggregate(inventory))
+    pipeline_time = best_of(args.repeat, lambda: aggregate(validate_inventory(df)))
+    print(f"linhas: {args.rows}")
+    print(f"referência:          {reference_time * 1000:.1f} ms")
+    print(f"validação:           {validate_time * 1000:.1f} ms")
+    print(f"kernel:              {kernel_time * 1000:.1f} ms")
+    print(f"validação + kernel:  {pipeline_time * 1000:.1f} ms")
+    print(f"speedup x referência: {reference_time / pipeline_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
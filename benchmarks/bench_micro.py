@@ -0,0 +1,138 @@
+"""Micro-benchmarks das funções críticas: leitura de arquivos, cálculo de
+emergia, validação do JWT e hash de senha.
+
+Uso: python -m benchmarks.bench_micro [--rows 1000 100000] [--formats csv xlsx parquet arrow]
+       [--output resultados.json] [--baseline baseline.json]
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+from typing import List
+import pandas as pd
+from app.core.auth import create_access_token, get_current_user
+from app.core.security import generate_password_hash, verify_password
+from app.service.data_source import DataSource
+from app.service.emergy_service import EmergyService
+from app.service.file.file_parser import parse_file_to_dataframe
+from benchmarks.harness import (
+    BenchmarkResult,
+    add_report_arguments,
+    configure_logging,
+    finish,
+    measure,
+)
+from benchmarks.inventory import synthetic_inventory, write_inventory
+
+BENCH_PASSWORD = "benchmark-password"
+
+
+class InMemoryDataSource(DataSource):
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+
+    def fetch_data(self) -> pd.DataFrame:
+        return self.df
+
+
+def bench_parsing(
+    rows: List[int],
+    formats: List[str],
+    categories: List[int],
+    xlsx_max_rows: int,
+    repeat: int,
+) -> List[BenchmarkResult]:
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for file_format in formats:
+            for row_count in rows:
+                if file_format == "xlsx" and row_count > xlsx_max_rows:
+                    continue
+                for category_count in categories:
+                    path = write_inventory(
+                        Path(directory) / f"inventory.{file_format}",
+                        row_count,
+                        category_count,
+                    )
+                    results.append(
+                        measure(
+                            "parse_file_to_dataframe",
+                            lambda: parse_file_to_dataframe(path),
+                            repeat,
+                            format=file_format,
+                            rows=row_count,
+                            categories=category_count,
+                        )
+                    )
+    return results
+
+
+def bench_calculation(
+    rows: List[int], categories: List[int], repeat: int
+) -> List[BenchmarkResult]:
+    results = []
+    for row_count in rows:
+        for category_count in categories:
+            service = EmergyService(
+                InMemoryDataSource(synthetic_inventory(row_count, category_count))
+            )
+            results.append(
+                measure(
+                    "EmergyService.calculate",
+                    service.calculate,
+                    repeat,
+                    rows=row_count,
+                    categories=category_count,
+                )
+            )
+    return results
+
+
+def bench_auth(repeat: int) -> List[BenchmarkResult]:
+    token = create_access_token({"sub": "bench@example.com"})
+    hashed_password = generate_password_hash(BENCH_PASSWORD)
+    return [
+        measure("get_current_user", lambda: get_current_user(token), repeat * 20),
+        measure(
+            "verify_password",
+            lambda: verify_password(BENCH_PASSWORD, hashed_password),
+            repeat,
+        ),
+        measure(
+            "generate_password_hash",
+            lambda: generate_password_hash(BENCH_PASSWORD),
+            repeat,
+        ),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--categories", type=int, nargs="+", default=[3])
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=["csv", "xlsx", "parquet", "arrow"],
+        default=["csv", "xlsx", "parquet", "arrow"],
+    )
+    parser.add_argument(
+        "--xlsx-max-rows",
+        type=int,
+        default=100_000,
+        help="tamanhos maiores são ignorados para .xlsx, cuja geração é lenta",
+    )
+    add_report_arguments(parser)
+    args = parser.parse_args()
+    configure_logging(args.verbose)
+
+    results = bench_parsing(
+        args.rows, args.formats, args.categories, args.xlsx_max_rows, args.repeat
+    )
+    results += bench_calculation(args.rows, args.categories, args.repeat)
+    results += bench_auth(args.repeat)
+    finish("micro", results, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Medição, relatório em JSON e comparação com um baseline salvo."""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+REPORT_VERSION = 1
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    name: str
+    params: Dict[str, Any]
+    repeat: int
+    best_ms: float
+    median_ms: float
+    mean_ms: float
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        params = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.name}[{params}]" if params else self.name
+
+
+def _summarize(
+    name: str, timings: List[float], params: Dict[str, Any]
+) -> BenchmarkResult:
+    return BenchmarkResult(
+        name=name,
+        params=params,
+        repeat=len(timings),
+        best_ms=min(timings) * 1000,
+        median_ms=statistics.median(timings) * 1000,
+        mean_ms=statistics.fmean(timings) * 1000,
+    )
+
+
+def measure(
+    name: str,
+    fn: Callable[[], Any],
+    repeat: int = 5,
+    warmup: int = 1,
+    setup: Optional[Callable[[], Any]] = None,
+    **params: Any,
+) -> BenchmarkResult:
+    """Executa `fn` `repeat` vezes; `setup` roda antes de cada execução e não
+    entra na medição."""
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        fn()
+
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return _summarize(name, timings, params)
+
+
+async def measure_async(
+    name: str,
+    fn: Callable[[], Awaitable[Any]],
+    repeat: int = 5,
+    warmup: int = 1,
+    setup: Optional[Callable[[], Any]] = None,
+    **params: Any,
+) -> BenchmarkResult:
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        await fn()
+
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        await fn()
+        timings.append(time.perf_counter() - start)
+    return _summarize(name, timings, params)
+
+
+async def measure_concurrent(
+    name: str,
+    fn: Callable[[], Awaitable[Any]],
+    concurrency: int,
+    repeat: int = 3,
+    setup: Optional[Callable[[], Any]] = None,
+    **params: Any,
+) -> BenchmarkResult:
+    """Mede o tempo para concluir `concurrency` chamadas simultâneas."""
+
+    async def burst():
+        await asyncio.gather(*(fn() for _ in range(concurrency)))
+
+    result = await measure_async(
+        name, burst, repeat, setup=setup, concurrency=concurrency, **params
+    )
+    result.extra["requests_per_second"] = round(
+        concurrency / (result.median_ms / 1000), 1
+    )
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(suite: str, results: List[BenchmarkResult]) -> dict:
+    return {
+        "version": REPORT_VERSION,
+        "suite": suite,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {result.key: asdict(result) for result in results},
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Retorna os benchmarks cujo tempo mediano piorou além da tolerância."""
+    regressions = []
+    for key, result in report["results"].items():
+        previous = baseline.get("results", {}).get(key)
+        if previous is None:
+            continue
+        ratio = result["median_ms"] / previous["median_ms"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{key}: {previous['median_ms']:.2f} ms -> "
+                f"{result['median_ms']:.2f} ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def print_results(results: List[BenchmarkResult], baseline: Optional[dict] = None):
+    previous = (baseline or {}).get("results", {})
+    for result in results:
+        line = (
+            f"{result.key:<60} best {result.best_ms:>10.2f} ms"
+            f"  median {result.median_ms:>10.2f} ms"
+        )
+        if result.key in previous:
+            ratio = result.median_ms / previous[result.key]["median_ms"]
+            line += f"  ({ratio:.2f}x baseline)"
+        for name, value in result.extra.items():
+            line += f"  {name}={value}"
+        print(line)
+
+
+def configure_logging(verbose: bool):
+    # Os logs por requisição da aplicação distorcem as medições e poluem a saída
+    if not verbose:
+        from app.core.logger import logger
+
+        logger.setLevel(logging.WARNING)
+
+
+def add_report_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--verbose", action="store_true", help="mantém os logs da aplicação"
+    )
+    parser.add_argument(
+        "--output", type=Path, help="grava os resultados em JSON neste arquivo"
+    )
+    parser.add_argument(
+        "--baseline", type=Path, help="JSON de uma execução anterior para comparação"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="piora relativa aceita antes de acusar regressão (padrão: 0.10)",
+    )
+
+
+def finish(suite: str, results: List[BenchmarkResult], args: argparse.Namespace):
+    """Imprime e grava o relatório; sai com código 1 se houver regressão."""
+    report = build_report(suite, results)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    print_results(results, baseline)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"Resultados gravados em {args.output}")
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("Regressões encontradas:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("Nenhuma regressão em relação ao baseline.")
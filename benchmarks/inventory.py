@@ -0,0 +1,119 @@
+"""Geradores de inventários sintéticos para os benchmarks.
+
+Uso: python -m benchmarks.inventory saida.csv --rows 10000000 [--categories 3]
+"""
+
+import argparse
+from pathlib import Path
+from typing import Iterator, List
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+
+# Limite de linhas de uma planilha .xlsx, descontando o cabeçalho
+XLSX_MAX_ROWS = 1_048_575
+WRITE_CHUNK_ROWS = 500_000
+
+COLUMNS = ["Flow Name", "Amount", "Unit", "Flow Direction", "UEV", "Category"]
+
+
+def synthetic_inventory(
+    rows: int, categories: int = 3, seed: int = 42, start: int = 0
+) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    labels = np.array(
+        ["R", "N", "F", "r ", " n"] + [f"C{i}" for i in range(categories)]
+    )
+    return pd.DataFrame(
+        {
+            "Flow Name": np.char.add(
+                "flow-", np.arange(start, start + rows).astype(str)
+            ),
+            "Amount": rng.uniform(0, 1e3, rows),
+            "Unit": "kg",
+            "Flow Direction": rng.choice(["Input", "input ", "Output"], rows),
+            "UEV": rng.uniform(1e3, 1e12, rows),
+            "Category": rng.choice(labels[: categories + 2], rows),
+        }
+    )
+
+
+def iter_inventory_chunks(
+    rows: int, categories: int = 3, seed: int = 42, chunk_rows: int = WRITE_CHUNK_ROWS
+) -> Iterator[pd.DataFrame]:
+    # Gera o inventário em blocos para que 10M de linhas não fiquem em memória
+    for index, start in enumerate(range(0, rows, chunk_rows)):
+        yield synthetic_inventory(
+            min(chunk_rows, rows - start), categories, seed + index, start
+        )
+
+
+def write_inventory(path: Path, rows: int, categories: int = 3, seed: int = 42) -> Path:
+    path = Path(path)
+    file_extension = path.suffix.lower()
+
+    if file_extension == ".csv":
+        with open(path, "w", newline="") as file:
+            for index, chunk in enumerate(
+                iter_inventory_chunks(rows, categories, seed)
+            ):
+                chunk.to_csv(file, index=False, header=index == 0)
+        return path
+
+    if file_extension == ".xlsx":
+        if rows > XLSX_MAX_ROWS:
+            raise ValueError(
+                f"Arquivos .xlsx aceitam no máximo {XLSX_MAX_ROWS} linhas."
+            )
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(COLUMNS)
+        for chunk in iter_inventory_chunks(rows, categories, seed):
+            for row in chunk.itertuples(index=False):
+                sheet.append(list(row))
+        workbook.save(path)
+        return path
+
+    if file_extension in {".parquet", ".arrow"}:
+        chunks = (
+            pa.Table.from_pandas(chunk, preserve_index=False)
+            for chunk in iter_inventory_chunks(rows, categories, seed)
+        )
+        first = next(chunks)
+        writer = (
+            pq.ParquetWriter(path, first.schema)
+            if file_extension == ".parquet"
+            else pa.ipc.new_file(str(path), first.schema)
+        )
+        with writer:
+            writer.write_table(first)
+            for table in chunks:
+                writer.write_table(table)
+        return path
+
+    raise ValueError(f"Formato não suportado: {file_extension}")
+
+
+def inventory_flows(rows: int, categories: int = 3, seed: int = 42) -> List[dict]:
+    """Inventário no formato retornado pela API LCI externa."""
+    return synthetic_inventory(rows, categories, seed).to_dict(orient="records")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "path", type=Path, help="arquivo de saída (.csv, .xlsx, .parquet ou .arrow)"
+    )
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--categories", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    write_inventory(args.path, args.rows, args.categories, args.seed)
+    print(f"{args.rows} linhas gravadas em {args.path}")
+
+
+if __name__ == "__main__":
+    main()
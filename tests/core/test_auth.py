@@ -80,3 +80,28 @@ def test_get_current_user_missing_sub():
     token = jwt.encode({"foo": "bar"}, auth.SECRET_KEY, algorithm=auth.ALGORITHM)
     with pytest.raises(UnauthorizedException):
         auth.get_current_user(token)
+
+
+def test_get_current_user_caches_verified_token():
+    token = auth.create_access_token({"sub": "cache@example.com"})
+    cache = auth.get_token_cache()
+    cache.clear()
+
+    with patch("app.core.auth.jwt.decode", wraps=jwt.decode) as mock_decode:
+        assert auth.get_current_user(token) == "cache@example.com"
+        assert auth.get_current_user(token) == "cache@example.com"
+        assert auth.decode_access_token(token) == "cache@example.com"
+
+    mock_decode.assert_called_once()
+    assert len(cache) == 1
+
+
+def test_get_current_user_does_not_cache_expired_token():
+    token = auth.create_access_token(
+        {"sub": "test@example.com"}, expires_delta=timedelta(seconds=-1)
+    )
+    auth.get_token_cache().clear()
+
+    with pytest.raises(UnauthorizedException):
+        auth.get_current_user(token)
+    assert len(auth.get_token_cache()) == 0
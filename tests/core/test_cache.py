@@ -0,0 +1,57 @@
+from app.core.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_returns_value_before_expiration():
+    cache = TTLCache(max_size=2, ttl_seconds=10)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_get_returns_default_after_expiration():
+    clock = FakeClock()
+    cache = TTLCache(max_size=2, ttl_seconds=10, clock=clock)
+    cache.set("a", 1)
+    clock.now = 10
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.stats()["misses"] == 1
+
+
+def test_get_entry_marks_stale_inside_stale_window():
+    clock = FakeClock()
+    cache = TTLCache(max_size=2, ttl_seconds=10, stale_seconds=5, clock=clock)
+    cache.set("a", 1)
+    clock.now = 12
+    entry = cache.get_entry("a")
+    assert entry.value == 1
+    assert entry.stale
+    clock.now = 15
+    assert cache.get_entry("a") is None
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=2, ttl_seconds=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_removes_entry():
+    cache = TTLCache(max_size=2, ttl_seconds=10)
+    cache.set("a", 1)
+    cache.invalidate("a")
+    assert cache.get("a") is None
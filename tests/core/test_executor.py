@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import pytest
+from app.core.executor import BoundedExecutor, get_password_executor
+from app.exceptions.exceptions import (
+    ProcessingTimeoutException,
+    TooManyRequestsException,
+)
+
+
+def build_executor(**overrides) -> BoundedExecutor:
+    options = {
+        "name": "test",
+        "kind": "thread",
+        "max_workers": 1,
+        "max_queue": 0,
+        "timeout_seconds": 1.0,
+    }
+    options.update(overrides)
+    return BoundedExecutor(**options)
+
+
+def test_run_returns_result():
+    executor = build_executor()
+    assert asyncio.run(executor.run(sum, [1, 2, 3])) == 6
+    assert executor.pending == 0
+    executor.shutdown()
+
+
+def test_run_rejects_when_saturated():
+    executor = build_executor()
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(TooManyRequestsException) as exc:
+            await executor.run(sum, [1])
+        release.set()
+        await running
+        return exc.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 429
+    assert error.headers["Retry-After"]
+    executor.shutdown()
+
+
+def test_run_raises_timeout():
+    executor = build_executor(timeout_seconds=0.05)
+    release = threading.Event()
+
+    with pytest.raises(ProcessingTimeoutException) as exc:
+        asyncio.run(executor.run(release.wait))
+    release.set()
+    assert exc.value.status_code == 504
+    executor.shutdown()
+
+
+def test_queue_depth_counts_waiting_tasks():
+    executor = build_executor(max_queue=2)
+    release = threading.Event()
+
+    async def scenario():
+        tasks = [asyncio.create_task(executor.run(release.wait)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        depth = executor.queue_depth
+        release.set()
+        await asyncio.gather(*tasks)
+        return depth
+
+    assert asyncio.run(scenario()) == 2
+    executor.shutdown()
+
+
+def test_password_executor_uses_threads():
+    executor = get_password_executor()
+    assert executor.kind == "thread"
+    assert executor.shares_memory
+    assert asyncio.run(executor.run(sum, [1, 2])) == 3
+
+
+def test_run_local_uses_a_thread_in_process_mode():
+    executor = build_executor(kind="process")
+    calling_thread = threading.get_ident()
+
+    # Uma closure não é serializável e não poderia ir para outro processo
+    thread_id = asyncio.run(executor.run_local(lambda: threading.get_ident()))
+    assert thread_id != calling_thread
+    assert executor.pending == 0
+    executor.shutdown()
@@ -0,0 +1,75 @@
+import json
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueListener
+from app.core.logger import JsonFormatter, LogQueueHandler, get_logger
+
+
+def make_record(msg="Job [%s] concluído.", args=("abc",), **extra):
+    record = logging.LogRecord(
+        "app.service.jobs", logging.INFO, __file__, 1, msg, args, None
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    line = JsonFormatter().format(make_record(rows=10))
+    entry = json.loads(line)
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "app.service.jobs"
+    assert entry["message"] == "Job [abc] concluído."
+    assert entry["rows"] == 10
+    assert entry["timestamp"].endswith("Z")
+
+
+def test_queue_handler_merges_args_and_traceback():
+    try:
+        raise ValueError("falhou")
+    except ValueError:
+        record = make_record()
+        record.exc_info = sys.exc_info()
+
+    prepared = LogQueueHandler(queue.SimpleQueue()).prepare(record)
+    assert prepared.msg == "Job [abc] concluído."
+    assert prepared.args is None
+    assert prepared.exc_info is None
+    assert (
+        "ValueError: falhou"
+        in json.loads(JsonFormatter().format(prepared))["exception"]
+    )
+
+
+def test_get_logger_is_child_of_app_logger():
+    assert get_logger("app.service.emergy_service").name == "app.service.emergy_service"
+    assert get_logger("benchmarks").name == "app.benchmarks"
+
+
+def test_records_are_written_by_listener_thread():
+    class CollectingHandler(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.threads = []
+
+        def emit(self, record):
+            self.threads.append(threading.current_thread())
+
+    log_queue = queue.SimpleQueue()
+    handler = CollectingHandler()
+    listener = QueueListener(log_queue, handler)
+    test_logger = logging.getLogger("app.tests.queue")
+    test_logger.propagate = False
+    queue_handler = LogQueueHandler(log_queue)
+    test_logger.addHandler(queue_handler)
+    listener.start()
+    try:
+        test_logger.warning("fila %d", 1)
+    finally:
+        listener.stop()
+        test_logger.removeHandler(queue_handler)
+
+    # A escrita acontece na thread do listener, não na que registrou o log
+    assert len(handler.threads) == 1
+    assert handler.threads[0] is not threading.current_thread()
@@ -0,0 +1,62 @@
+import pytest
+from app.core.metrics import MetricsRegistry, timed_iter
+
+
+def test_render_counter_and_gauge():
+    registry = MetricsRegistry()
+    requests_total = registry.counter("requests_total", "Requisições.", ["route"])
+    in_flight = registry.gauge("in_flight", "Em andamento.")
+    requests_total.inc(route="/a")
+    requests_total.inc(2, route='/b"x')
+    in_flight.set(3)
+
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{route="/a"} 1' in text
+    assert 'requests_total{route="/b\\"x"} 2' in text
+    assert "# TYPE in_flight gauge\nin_flight 3\n" in text
+
+
+def test_render_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latência.", ["stage"], [0.1, 1])
+    for value in (0.05, 0.5, 0.7, 3):
+        latency.observe(value, stage="parse")
+
+    text = registry.render()
+    assert 'latency_seconds_bucket{stage="parse",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{stage="parse",le="1"} 3' in text
+    assert 'latency_seconds_bucket{stage="parse",le="+Inf"} 4' in text
+    assert 'latency_seconds_sum{stage="parse"} 4.25' in text
+    assert 'latency_seconds_count{stage="parse"} 4' in text
+
+
+def test_callback_values_are_read_at_render_time():
+    registry = MetricsRegistry()
+    depth = registry.gauge("queue_depth", "Fila.", ["executor"])
+    values = {"depth": 1}
+    depth.set_function(lambda: values["depth"], executor="calculation")
+    depth.set_function(lambda: 1 / 0, executor="broken")
+
+    values["depth"] = 7
+    text = registry.render()
+    assert 'queue_depth{executor="calculation"} 7' in text
+    assert "broken" not in text
+
+
+def test_labels_must_match():
+    registry = MetricsRegistry()
+    counter = registry.counter("errors_total", "Erros.", ["status"])
+    with pytest.raises(ValueError):
+        counter.inc(route="/a")
+    with pytest.raises(ValueError):
+        counter.inc(-1, status=500)
+    with pytest.raises(ValueError):
+        registry.counter("errors_total", "Duplicada.")
+
+
+def test_timed_iter_observes_each_item():
+    registry = MetricsRegistry()
+    parse = registry.histogram("parse_seconds", "Parse.")
+    assert list(timed_iter(iter([1, 2, 3]), parse)) == [1, 2, 3]
+    assert parse.count() == 3
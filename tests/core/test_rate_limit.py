@@ -0,0 +1,70 @@
+import pytest
+from app.core.rate_limit import LoginRateLimiter
+from app.exceptions.exceptions import TooManyRequestsException
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def build_limiter(clock, **overrides) -> LoginRateLimiter:
+    options = {
+        "max_failures_per_email": 2,
+        "max_failures_per_ip": 3,
+        "window_seconds": 60,
+        "clock": clock,
+    }
+    options.update(overrides)
+    return LoginRateLimiter(**options)
+
+
+def test_check_blocks_email_after_max_failures():
+    clock = FakeClock()
+    limiter = build_limiter(clock)
+    limiter.record_failure("1.1.1.1", "User@Example.com")
+    clock.now = 10
+    limiter.record_failure("2.2.2.2", "user@example.com")
+
+    with pytest.raises(TooManyRequestsException) as exc:
+        limiter.check("3.3.3.3", "user@example.com")
+    assert exc.value.headers["Retry-After"] == "50"
+    limiter.check("3.3.3.3", "outro@example.com")
+
+
+def test_check_blocks_ip_after_max_failures():
+    limiter = build_limiter(FakeClock())
+    for email in ("a@example.com", "b@example.com", "c@example.com"):
+        limiter.record_failure("1.1.1.1", email)
+
+    with pytest.raises(TooManyRequestsException):
+        limiter.check("1.1.1.1", "d@example.com")
+    limiter.check("2.2.2.2", "d@example.com")
+
+
+def test_failures_expire_after_window():
+    clock = FakeClock()
+    limiter = build_limiter(clock)
+    limiter.record_failure("1.1.1.1", "user@example.com")
+    clock.now = 30
+    limiter.record_failure("1.1.1.1", "user@example.com")
+
+    clock.now = 61
+    limiter.check("1.1.1.1", "user@example.com")
+    limiter.record_failure("1.1.1.1", "user@example.com")
+    with pytest.raises(TooManyRequestsException):
+        limiter.check("1.1.1.1", "user@example.com")
+
+
+def test_reset_clears_email_failures_only():
+    limiter = build_limiter(FakeClock(), max_failures_per_ip=2)
+    limiter.record_failure("1.1.1.1", "user@example.com")
+    limiter.record_failure("1.1.1.1", "user@example.com")
+    limiter.reset("user@example.com")
+
+    limiter.check("2.2.2.2", "user@example.com")
+    with pytest.raises(TooManyRequestsException):
+        limiter.check("1.1.1.1", "outro@example.com")
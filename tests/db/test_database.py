@@ -0,0 +1,48 @@
+import asyncio
+from sqlalchemy import text
+from app.db.database import (
+    async_database_url,
+    create_async_db_engine,
+    create_db_engine,
+)
+
+
+def test_create_db_engine_enables_wal(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'users.db'}")
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        # 1 = NORMAL
+        assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+    assert engine.pool.size() == 5
+    assert engine.echo is False
+    engine.dispose()
+
+
+def test_create_db_engine_in_memory_without_pool_sizing():
+    engine = create_db_engine("sqlite://")
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar() == 1
+    engine.dispose()
+
+
+def test_async_database_url():
+    assert (
+        async_database_url("sqlite:///./users.db") == "sqlite+aiosqlite:///./users.db"
+    )
+    assert (
+        async_database_url("postgresql+asyncpg://u@host/db")
+        == "postgresql+asyncpg://u@host/db"
+    )
+
+
+def test_create_async_db_engine_enables_wal(tmp_path):
+    engine = create_async_db_engine(f"sqlite:///{tmp_path / 'users.db'}")
+
+    async def journal_mode():
+        async with engine.connect() as connection:
+            result = await connection.exec_driver_sql("PRAGMA journal_mode")
+            mode = result.scalar()
+        await engine.dispose()
+        return mode
+
+    assert asyncio.run(journal_mode()) == "wal"
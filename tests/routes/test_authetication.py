@@ -1,13 +1,25 @@
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from app.main import app
+from app.core import auth
+from app.core.rate_limit import LoginRateLimiter, get_login_rate_limiter
 from app.exceptions.exceptions import BadRequestException
 
 
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def rate_limiter():
+    rate_limiter = LoginRateLimiter(
+        max_failures_per_email=2, max_failures_per_ip=10, window_seconds=60
+    )
+    app.dependency_overrides[get_login_rate_limiter] = lambda: rate_limiter
+    yield rate_limiter
+    app.dependency_overrides.pop(get_login_rate_limiter, None)
+
+
 @pytest.fixture
 def register_payload():
     return {
@@ -29,7 +41,7 @@ def test_register_user_success(register_payload):
         mock_user_service = mock_user_service_class.return_value
         mock_user = MagicMock()
         mock_user.id = 123
-        mock_user_service.create_user.return_value = mock_user
+        mock_user_service.create_user_async = AsyncMock(return_value=mock_user)
 
         response = client.post("/api/auth/register", json=register_payload)
         assert response.status_code == 200
@@ -41,8 +53,8 @@ def test_register_user_success(register_payload):
 def test_register_user_email_exists(register_payload):
     with patch("app.routes.authetication.UserService") as mock_user_service_class:
         mock_user_service = mock_user_service_class.return_value
-        mock_user_service.create_user.side_effect = BadRequestException(
-            "Email já está em uso"
+        mock_user_service.create_user_async = AsyncMock(
+            side_effect=BadRequestException("Email já está em uso")
         )
 
         response = client.post("/api/auth/register", json=register_payload)
@@ -73,6 +85,32 @@ def test_login_invalid_credentials(login_payload):
         assert "Credenciais inválidas" in response.text
 
 
+def test_login_blocked_after_repeated_failures(login_payload):
+    with patch(
+        "app.routes.authetication.authenticate_user", return_value=None
+    ) as mock_auth_user:
+        for _ in range(2):
+            response = client.post("/api/auth/login", json=login_payload)
+            assert response.status_code == 401
+
+        response = client.post("/api/auth/login", json=login_payload)
+
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+    assert mock_auth_user.call_count == 2
+
+
+def test_login_success_resets_email_failures(login_payload, rate_limiter):
+    rate_limiter.record_failure("testclient", login_payload["email"])
+    with patch("app.routes.authetication.authenticate_user") as mock_auth_user:
+        mock_auth_user.return_value.email = login_payload["email"]
+        response = client.post("/api/auth/login", json=login_payload)
+
+    assert response.status_code == 200
+    rate_limiter.record_failure("testclient", login_payload["email"])
+    rate_limiter.check("testclient", login_payload["email"])
+
+
 def test_get_current_user_success():
     mock_token = MagicMock()
     mock_token.credentials = "valid_token"
@@ -91,7 +129,7 @@ def test_get_current_user_success():
         patch("app.routes.authetication.UserService") as mock_user_service_class,
     ):
         mock_user_service = mock_user_service_class.return_value
-        mock_user_service.get_user_by_email.return_value = mock_user
+        mock_user_service.get_user_by_email_async = AsyncMock(return_value=mock_user)
 
         response = client.get(
             "/api/auth/me", headers={"Authorization": "Bearer valid_token"}
@@ -131,7 +169,7 @@ def test_get_current_user_not_found():
         patch("app.routes.authetication.UserService") as mock_user_service_class,
     ):
         mock_user_service = mock_user_service_class.return_value
-        mock_user_service.get_user_by_email.return_value = None
+        mock_user_service.get_user_by_email_async = AsyncMock(return_value=None)
 
         response = client.get(
             "/api/auth/me", headers={"Authorization": "Bearer valid_token"}
@@ -139,3 +177,20 @@ def test_get_current_user_not_found():
 
         assert response.status_code == 401
         assert "Could not validate credentials" in response.text
+
+
+def test_auth_cache_stats():
+    previous = app.dependency_overrides.get(auth.get_current_user)
+    app.dependency_overrides[auth.get_current_user] = lambda: "test@example.com"
+    try:
+        response = client.get("/api/auth/cache/stats")
+    finally:
+        if previous is None:
+            app.dependency_overrides.pop(auth.get_current_user, None)
+        else:
+            app.dependency_overrides[auth.get_current_user] = previous
+
+    assert response.status_code == 200
+    data = response.json()
+    assert {"hits", "misses", "hit_rate"} <= data["tokens"].keys()
+    assert {"hits", "misses", "hit_rate"} <= data["users"].keys()
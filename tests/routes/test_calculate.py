@@ -1,9 +1,17 @@
+import hashlib
 import io
+import json
 import pytest
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from app.main import app
 from app.core import auth
+from app.service.calculation_history import get_calculation_history
+from app.exceptions.exceptions import TooManyRequestsException
+from app.service.file.file_storage import save_temp_file
 
 client = TestClient(app)
 
@@ -15,6 +23,14 @@ def override_get_current_user():
 app.dependency_overrides[auth.get_current_user] = override_get_current_user
 
 
+@pytest.fixture(autouse=True)
+def history():
+    history = MagicMock()
+    app.dependency_overrides[get_calculation_history] = lambda: history
+    yield history
+    app.dependency_overrides.pop(get_calculation_history, None)
+
+
 @pytest.fixture
 def csv_file():
     return ("test.csv", io.BytesIO(b"col1,col2\n1,2\n3,4"), "text/csv")
@@ -37,15 +53,15 @@ def fake_result():
     }
 
 
-def test_calculate_emergy_by_file_success(csv_file, fake_result):
+def test_calculate_emergy_by_file_success(csv_file, fake_result, history):
     with (
         patch("app.routes.calculate.validate_file_mime", return_value=True),
-        patch("app.routes.calculate.temporary_upload_file") as mock_temp_file,
+        patch("app.routes.calculate.temporary_upload_file_async") as mock_temp_file,
         patch("app.routes.calculate.EmergyService") as mock_emergy_service,
     ):
-        mock_temp_file.return_value.__enter__.return_value = "fake_path"
+        mock_temp_file.return_value.__aenter__.return_value = "fake_path"
         mock_emergy = MagicMock()
-        mock_emergy.calculate.return_value = fake_result
+        mock_emergy.compute.return_value.to_dict.return_value = fake_result
         mock_emergy_service.return_value = mock_emergy
 
         response = client.post("/api/calculate/by-file", files={"file": csv_file})
@@ -54,6 +70,7 @@ def test_calculate_emergy_by_file_success(csv_file, fake_result):
         assert data["filename"] == "test.csv"
         assert data["emergy"] == fake_result["emergy"]
         assert data["sustainability"] == fake_result["sustainability"]
+        history.record.assert_called_once()
 
 
 def test_calculate_emergy_by_file_invalid_type(csv_file):
@@ -66,10 +83,10 @@ def test_calculate_emergy_by_file_invalid_type(csv_file):
 def test_calculate_emergy_by_file_internal_error(csv_file):
     with (
         patch("app.routes.calculate.validate_file_mime", return_value=True),
-        patch("app.routes.calculate.temporary_upload_file") as mock_temp_file,
+        patch("app.routes.calculate.temporary_upload_file_async") as mock_temp_file,
         patch("app.routes.calculate.EmergyService") as mock_emergy_service,
     ):
-        mock_temp_file.return_value.__enter__.return_value = "fake_path"
+        mock_temp_file.return_value.__aenter__.return_value = "fake_path"
         mock_emergy_service.side_effect = Exception("Unexpected error")
 
         response = client.post("/api/calculate/by-file", files={"file": csv_file})
@@ -77,10 +94,12 @@ def test_calculate_emergy_by_file_internal_error(csv_file):
         assert "Internal Server Error" in response.text
 
 
-def test_calculate_emergy_by_lci_success(fake_result):
+def test_calculate_emergy_by_lci_success(fake_result, history):
     with patch("app.routes.calculate.EmergyService") as mock_emergy_service:
+        result = MagicMock()
+        result.to_dict.return_value = fake_result
         mock_emergy = MagicMock()
-        mock_emergy.calculate.return_value = fake_result
+        mock_emergy.compute_async = AsyncMock(return_value=result)
         mock_emergy_service.return_value = mock_emergy
 
         response = client.get("/api/calculate/by-lci/1")
@@ -89,6 +108,9 @@ def test_calculate_emergy_by_lci_success(fake_result):
         assert data["product_id: "] == 1
         assert data["emergy"] == fake_result["emergy"]
         assert data["sustainability"] == fake_result["sustainability"]
+        history.record.assert_called_once_with(
+            override_get_current_user(), "lci", "1", result
+        )
 
 
 def test_calculate_emergy_by_lci_internal_error():
@@ -98,3 +120,332 @@ def test_calculate_emergy_by_lci_internal_error():
         response = client.get("/api/calculate/by-lci/1")
         assert response.status_code == 500
         assert "Internal Server Error" in response.text
+
+
+def test_calculate_emergy_by_lci_server_busy():
+    with patch("app.routes.calculate.EmergyService") as mock_emergy_service:
+        mock_emergy_service.return_value.compute_async = AsyncMock(
+            side_effect=TooManyRequestsException()
+        )
+
+        response = client.get("/api/calculate/by-lci/1")
+        assert response.status_code == 429
+
+
+def test_calculate_emergy_by_lci_batch_success(fake_result, history):
+    with (
+        patch("app.routes.calculate.ProductBatchDataSource") as mock_data_source,
+        patch("app.routes.calculate.EmergyService") as mock_emergy_service,
+    ):
+        mock_data_source.return_value.product_ids = [1, 2]
+        mock_data_source.return_value.errors = {2: "Erro LCI"}
+        result = MagicMock()
+        result.to_dict.return_value = fake_result
+        mock_emergy = MagicMock()
+        mock_emergy.compute_grouped_async = AsyncMock(return_value=({1: result}, {}))
+        mock_emergy_service.return_value = mock_emergy
+
+        response = client.post(
+            "/api/calculate/by-lci/batch", json={"product_ids": [1, 2]}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["results"] == [{"product_id": 1, **fake_result}]
+        assert data["errors"] == [{"product_id": 2, "detail": "Erro LCI"}]
+        history.record_many.assert_called_once_with(
+            override_get_current_user(), "lci", [("1", result)]
+        )
+
+
+def test_calculate_emergy_by_lci_batch_empty_request():
+    response = client.post("/api/calculate/by-lci/batch", json={"product_ids": []})
+    assert response.status_code == 422
+
+
+def test_calculate_emergy_by_file_server_busy(csv_file):
+    with (
+        patch("app.routes.calculate.validate_file_mime", return_value=True),
+        patch("app.routes.calculate.temporary_upload_file_async") as mock_temp_file,
+        patch("app.routes.calculate.get_calculation_executor") as mock_executor,
+    ):
+        mock_temp_file.return_value.__aenter__.return_value = "fake_path"
+        mock_executor.return_value.run = AsyncMock(
+            side_effect=TooManyRequestsException()
+        )
+
+        response = client.post("/api/calculate/by-file", files={"file": csv_file})
+        assert response.status_code == 429
+        assert response.headers["Retry-After"]
+
+
+def test_calculate_emergy_by_file_streams_csv_without_temp_file(history):
+    content = (
+        b"Flow Name,Amount,Unit,Flow Direction,UEV,Category\n"
+        b"Sol,10,J,Input,1000000,R\n"
+        b"Diesel,5,kg,Input,2000000,F\n"
+        b"Solo,2,kg,Input,10000000,N\n"
+    )
+    with patch("app.routes.calculate.temporary_upload_file_async") as mock_temp_file:
+        response = client.post(
+            "/api/calculate/by-file",
+            files={"file": ("inventario.csv", io.BytesIO(content), "text/csv")},
+        )
+
+    mock_temp_file.assert_not_called()
+    assert response.status_code == 200
+    data = response.json()
+    assert data["emergy"]["Total"]["value"] == "4.00E+07"
+    assert data["sustainability"]["classification"] == "SUSTAINABLE"
+    _, source_type, source, result, filename = history.record.call_args.args
+    assert (source_type, source, filename) == (
+        "file",
+        hashlib.sha256(content).hexdigest(),
+        "inventario.csv",
+    )
+    assert result.totals.total == 4e7
+
+
+def test_calculate_emergy_by_file_with_precision():
+    content = (
+        b"Flow Name,Amount,Unit,Flow Direction,UEV,Category\n"
+        b"Sol,10,J,Input,1000000,R\n"
+        b"Diesel,5,kg,Input,2000000,F\n"
+        b"Solo,2,kg,Input,10000000,N\n"
+    )
+    response = client.post(
+        "/api/calculate/by-file?precision=4",
+        files={"file": ("inventario.csv", io.BytesIO(content), "text/csv")},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["emergy"]["Total"]["value"] == "4.0000E+07"
+    assert data["sustainability"]["ESI"] == 1.3333
+
+
+def test_calculate_emergy_by_lci_rejects_invalid_precision():
+    response = client.get("/api/calculate/by-lci/1?precision=16")
+    assert response.status_code == 422
+
+
+def test_calculate_emergy_by_file_parquet_upload():
+    table = pa.table(
+        {
+            "Flow Name": ["Sol", "Diesel", "Solo"],
+            "Amount": [10.0, 5.0, 2.0],
+            "Unit": ["J", "kg", "kg"],
+            "Flow Direction": ["Input", "Input", "Input"],
+            "UEV": [1e6, 2e6, 1e7],
+            "Category": ["R", "F", "N"],
+        }
+    )
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer)
+    buffer.seek(0)
+
+    response = client.post(
+        "/api/calculate/by-file",
+        files={"file": ("inventario.parquet", buffer, "application/octet-stream")},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["emergy"]["Total"]["value"] == "4.00E+07"
+
+
+def test_calculate_emergy_by_file_xlsx_with_sheet():
+    workbook = Workbook()
+    workbook.active.title = "Resumo"
+    worksheet = workbook.create_sheet("Inventário")
+    worksheet.append(
+        ["Flow Name", "Amount", "Unit", "Flow Direction", "UEV", "Category"]
+    )
+    worksheet.append(["Sol", 10, "J", "Input", 1e6, "R"])
+    worksheet.append(["Diesel", 5, "kg", "Input", 2e6, "F"])
+    worksheet.append(["Solo", 2, "kg", "Input", 1e7, "N"])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+
+    response = client.post(
+        "/api/calculate/by-file?sheet=Inventário",
+        files={
+            "file": (
+                "inventario.xlsx",
+                buffer,
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["emergy"]["Total"]["value"] == "4.00E+07"
+
+
+def test_calculate_emergy_by_file_validate_only_reports_all_rows(history):
+    content = (
+        b"Flow Name,Amount,Unit,Flow Direction,UEV,Category\n"
+        b"Sol,abc,J,Input,1000000,R\n"
+        b"Diesel,5,kg,Input,,F\n"
+        b"Solo,2,kg,Entrada,10000000,X\n"
+    )
+    with patch("app.routes.calculate.EmergyService") as mock_emergy_service:
+        response = client.post(
+            "/api/calculate/by-file?validate_only=true",
+            files={"file": ("inventario.csv", io.BytesIO(content), "text/csv")},
+        )
+
+    mock_emergy_service.assert_not_called()
+    history.record.assert_not_called()
+    assert response.status_code == 200
+    data = response.json()
+    assert data["filename"] == "inventario.csv"
+    assert data["valid"] is False
+    assert data["rows"] == 3
+    assert {issue["code"]: issue["rows"] for issue in data["issues"]} == {
+        "invalid_amount": [2],
+        "missing_uev": [3],
+        "unknown_direction": [4],
+    }
+
+
+def test_calculate_emergy_by_file_validate_only_parquet():
+    table = pa.table(
+        {
+            "Flow Name": ["Sol", "Diesel"],
+            "Amount": [10.0, 5.0],
+            "Unit": ["J", "kg"],
+            "Flow Direction": ["Input", "Input"],
+            "UEV": [1e6, 2e6],
+            "Category": ["R", "F"],
+        }
+    )
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer)
+    buffer.seek(0)
+
+    response = client.post(
+        "/api/calculate/by-file?validate_only=true",
+        files={"file": ("inventario.parquet", buffer, "application/octet-stream")},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "filename": "inventario.parquet",
+        "valid": True,
+        "rows": 2,
+        "issues": [],
+    }
+
+
+def test_calculate_emergy_by_file_streams_ndjson_progress(history):
+    content = (
+        b"Flow Name,Amount,Unit,Flow Direction,UEV,Category\n"
+        b"Sol,10,J,Input,1000000,R\n"
+        b"Diesel,5,kg,Input,2000000,F\n"
+        b"Solo,2,kg,Input,10000000,N\n"
+        b"Vento,,MJ,Input,1000,R\n"
+    )
+    saved = []
+
+    async def save_and_record(file):
+        saved.append(save_temp_file(file))
+        return saved[-1]
+
+    with (
+        patch("app.routes.calculate.get_settings") as mock_settings,
+        patch("app.routes.calculate.save_temp_file_async", save_and_record),
+    ):
+        mock_settings.return_value.csv_chunk_rows = 2
+        response = client.post(
+            "/api/calculate/by-file?progress=ndjson",
+            files={"file": ("inventario.csv", io.BytesIO(content), "text/csv")},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["event"] for event in events] == [
+        "received",
+        "progress",
+        "progress",
+        "result",
+    ]
+    assert events[0]["bytes_received"] == len(content)
+    assert events[1]["rows_parsed"] == 2
+    assert events[1]["emergy"]["Total"]["value"] == "2.00E+07"
+    assert events[2]["rows_parsed"] == 4
+    assert events[2]["rows_rejected"] == 1
+    assert events[3]["emergy"]["Total"]["value"] == "4.00E+07"
+    assert not saved[0].exists()
+    history.record.assert_called_once()
+
+
+def test_calculate_emergy_by_file_streams_sse_error_event():
+    response = client.post(
+        "/api/calculate/by-file?progress=sse",
+        files={"file": ("inventario.csv", io.BytesIO(b"a,b\n1,2\n"), "text/csv")},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    blocks = response.text.strip().split("\n\n")
+    assert blocks[0].startswith("event: received\n")
+    event, data = blocks[-1].split("\n")
+    assert event == "event: error"
+    error = json.loads(data.removeprefix("data: "))
+    assert error["status_code"] == 400
+    assert "Colunas obrigatórias ausentes" in error["detail"]
+
+
+def test_calculate_emergy_combined_merges_file_and_lci():
+    content = (
+        b"Flow Name,Amount,Unit,Flow Direction,UEV,Category\n"
+        b"Sol,10,J,Input,1000000,R\n"
+        b"Solo,2,kg,Input,10000000,N\n"
+    )
+    flow = MagicMock()
+    flow.model_dump.return_value = {
+        "flow_name": "Diesel",
+        "amount": 5,
+        "unit": "kg",
+        "flow_direction": "Input",
+        "uev": 2000000,
+        "category": "F",
+    }
+    mock_lci_service = MagicMock()
+    mock_lci_service.get_flows_by_product_id_async = AsyncMock(return_value=[flow])
+
+    with patch(
+        "app.service.data_source.get_lci_service", return_value=mock_lci_service
+    ):
+        response = client.post(
+            "/api/calculate/combined?product_ids=7",
+            files={"file": ("inventario.csv", io.BytesIO(content), "text/csv")},
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["emergy"]["Total"]["value"] == "4.00E+07"
+    assert [
+        (source["source_type"], source["source"], source["rows"])
+        for source in data["sources"]
+    ] == [("file", "inventario.csv", 2), ("lci", "7", 1)]
+
+
+def test_calculate_emergy_combined_requires_a_source():
+    response = client.post("/api/calculate/combined")
+    assert response.status_code == 400
+    assert "Informe um arquivo" in response.text
+
+
+def test_calculate_emergy_combined_server_busy(csv_file):
+    with (
+        patch("app.routes.calculate.validate_file_mime", return_value=True),
+        patch("app.service.data_source.get_calculation_executor") as mock_executor,
+    ):
+        mock_executor.return_value.run_local = AsyncMock(
+            side_effect=TooManyRequestsException()
+        )
+
+        response = client.post("/api/calculate/combined", files={"file": csv_file})
+        assert response.status_code == 429
@@ -0,0 +1,90 @@
+import json
+import pytest
+from datetime import datetime, timezone
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock
+from app.main import app
+from app.core import auth
+from app.db.models import CalculationRecord
+from app.exceptions.exceptions import NotFoundException
+from app.service.calculation_history import get_calculation_history
+
+client = TestClient(app)
+
+OWNER = "test@example.com"
+
+
+@pytest.fixture(autouse=True)
+def current_user():
+    previous = app.dependency_overrides.get(auth.get_current_user)
+    app.dependency_overrides[auth.get_current_user] = lambda: OWNER
+    yield
+    if previous is None:
+        app.dependency_overrides.pop(auth.get_current_user, None)
+    else:
+        app.dependency_overrides[auth.get_current_user] = previous
+
+
+@pytest.fixture
+def history():
+    history = MagicMock()
+    app.dependency_overrides[get_calculation_history] = lambda: history
+    yield history
+    app.dependency_overrides.pop(get_calculation_history, None)
+
+
+@pytest.fixture
+def record():
+    return CalculationRecord(
+        id=7,
+        owner=OWNER,
+        source_type="file",
+        source="abc",
+        filename="inventario.csv",
+        totals=json.dumps({"R": 1.23456e7}),
+        total=1.23456e7,
+        eyr=1.23456,
+        elr=0.5,
+        esi=2.469,
+        classification="SUSTAINABLE",
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def test_list_calculations_returns_page(history, record):
+    history.list_records.return_value = ([record], 7)
+
+    response = client.get("/api/calculate/history?limit=1&before=9&source_type=file")
+
+    assert response.status_code == 200
+    history.list_records.assert_called_once_with(OWNER, 1, 9, "file", None)
+    data = response.json()
+    assert data["next_before"] == 7
+    assert data["items"][0]["id"] == 7
+    assert data["items"][0]["emergy"]["Total"]["value"] == "1.23E+07"
+
+
+def test_list_calculations_rejects_large_limit(history):
+    response = client.get("/api/calculate/history?limit=1000")
+    assert response.status_code == 422
+
+
+def test_get_calculation_reformats_with_precision(history, record):
+    history.get.return_value = record
+
+    response = client.get("/api/calculate/history/7?precision=4")
+
+    assert response.status_code == 200
+    history.get.assert_called_once_with(OWNER, 7)
+    data = response.json()
+    assert data["filename"] == "inventario.csv"
+    assert data["emergy"]["R"]["value"] == "1.2346E+07"
+    assert data["sustainability"]["EYR"] == 1.2346
+
+
+def test_get_calculation_not_found(history):
+    history.get.side_effect = NotFoundException("Cálculo não encontrado.")
+
+    response = client.get("/api/calculate/history/99")
+
+    assert response.status_code == 404
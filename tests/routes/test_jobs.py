@@ -0,0 +1,117 @@
+import io
+import pytest
+from datetime import datetime, timezone
+from fastapi.testclient import TestClient
+from unittest.mock import patch, MagicMock
+from app.main import app
+from app.core import auth
+from app.db.models import CalculationJob
+from app.exceptions.exceptions import ConflictException, NotFoundException
+from app.models.calculation_job import JobStatus
+
+client = TestClient(app)
+
+OWNER = "test@example.com"
+
+
+@pytest.fixture(autouse=True)
+def current_user():
+    previous = app.dependency_overrides.get(auth.get_current_user)
+    app.dependency_overrides[auth.get_current_user] = lambda: OWNER
+    yield
+    if previous is None:
+        app.dependency_overrides.pop(auth.get_current_user, None)
+    else:
+        app.dependency_overrides[auth.get_current_user] = previous
+
+
+@pytest.fixture
+def job():
+    return CalculationJob(
+        id="abc123",
+        owner=OWNER,
+        filename="inventario.csv",
+        file_path="tmp/uploads/abc123.csv",
+        precision=2,
+        status=JobStatus.PENDING,
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+@pytest.fixture
+def job_queue():
+    with patch("app.routes.jobs.get_calculation_job_queue") as get_queue:
+        yield get_queue.return_value
+
+
+def test_submit_job_returns_accepted(job_queue, job):
+    job_queue.submit.return_value = job
+    with patch("app.routes.jobs.save_temp_file") as save_temp_file:
+        response = client.post(
+            "/api/calculate/jobs?precision=4",
+            files={"file": ("inventario.csv", io.BytesIO(b"a,b\n1,2"), "text/csv")},
+        )
+
+    assert response.status_code == 202
+    assert response.json()["job_id"] == "abc123"
+    assert response.json()["status"] == "PENDING"
+    job_queue.submit.assert_called_once_with(
+        OWNER, "inventario.csv", save_temp_file.return_value, 4, None
+    )
+
+
+def test_submit_job_rejects_unsupported_file(job_queue):
+    response = client.post(
+        "/api/calculate/jobs",
+        files={"file": ("inventario.txt", io.BytesIO(b"x"), "text/plain")},
+    )
+    assert response.status_code == 400
+    job_queue.submit.assert_not_called()
+
+
+def test_get_job_status(job_queue, job):
+    job_queue.get.return_value = job
+    response = client.get("/api/calculate/jobs/abc123")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "PENDING"
+    job_queue.get.assert_called_once_with("abc123", OWNER)
+
+
+def test_get_job_not_found(job_queue):
+    job_queue.get.side_effect = NotFoundException("Job não encontrado.")
+    response = client.get("/api/calculate/jobs/abc123")
+    assert response.status_code == 404
+
+
+def test_get_job_result(job_queue, job):
+    job.status = JobStatus.COMPLETED
+    job_queue.get.return_value = job
+    job_queue.result.return_value = {"emergy": {}, "sustainability": {}}
+
+    response = client.get("/api/calculate/jobs/abc123/result")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "job_id": "abc123",
+        "filename": "inventario.csv",
+        "emergy": {},
+        "sustainability": {},
+    }
+
+
+def test_get_job_result_before_completion(job_queue):
+    job_queue.result.side_effect = ConflictException("sem resultado")
+    response = client.get("/api/calculate/jobs/abc123/result")
+    assert response.status_code == 409
+
+
+def test_cancel_job(job_queue, job):
+    job.status = JobStatus.CANCELLED
+    job_queue.cancel.return_value = job
+
+    response = client.delete("/api/calculate/jobs/abc123")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "CANCELLED"
+    job_queue.cancel.assert_called_once_with("abc123", OWNER)
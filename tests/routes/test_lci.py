@@ -1,8 +1,11 @@
+import httpx
+import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from app.main import app
 from app.core import auth
-import requests
+from app.service.lci_service import AsyncLCIClient, get_settings
+from app.service.cached_lci_service import get_lci_service
 
 client = TestClient(app)
 
@@ -14,39 +17,61 @@ def override_get_current_user():
 app.dependency_overrides[auth.get_current_user] = override_get_current_user
 
 
+@pytest.fixture(autouse=True)
+def clear_lci_cache():
+    get_lci_service().clear_cache()
+
+
+def mock_lci_client(handler) -> AsyncLCIClient:
+    return AsyncLCIClient(get_settings(), transport=httpx.MockTransport(handler))
+
+
 def test_list_lci_products_success():
     fake_products = [
         {"id": 1, "name": "Produto A", "description": "Descricao A"},
         {"id": 2, "name": "Produto B", "description": "Descricao B"},
     ]
-    with patch("app.service.lci_service.requests.get") as mock_get:
-        mock_response = MagicMock()
-        mock_response.raise_for_status.return_value = None
-        mock_response.json.return_value = fake_products
-        mock_get.return_value = mock_response
-
+    lci_client = mock_lci_client(
+        lambda request: httpx.Response(200, json=fake_products)
+    )
+    with patch("app.service.lci_service.async_http_client", lci_client):
         response = client.get("/api/lci/products")
         assert response.status_code == 200
         assert response.json() == fake_products
 
 
 def test_list_lci_products_http_error():
-    with patch("app.service.lci_service.requests.get") as mock_get:
-        mock_response = MagicMock()
-        mock_response.raise_for_status.side_effect = requests.HTTPError(
-            response=MagicMock(status_code=502, text="Erro HTTP")
-        )
-        mock_get.return_value = mock_response
+    lci_client = mock_lci_client(lambda request: httpx.Response(502, text="Erro HTTP"))
+    with patch("app.service.lci_service.async_http_client", lci_client):
+        response = client.get("/api/lci/products")
+        assert response.status_code == 502
+
 
+def test_upstream_client_error_is_reported_as_bad_gateway():
+    lci_client = mock_lci_client(lambda request: httpx.Response(404, text="Not found"))
+    with patch("app.service.lci_service.async_http_client", lci_client):
         response = client.get("/api/lci/products")
         assert response.status_code == 502
+        assert response.json()["detail"] == "Not found"
 
 
 def test_list_lci_products_request_exception():
-    with patch(
-        "app.service.lci_service.requests.get",
-        side_effect=requests.RequestException("Connection error"),
-    ):
+    def handler(request):
+        raise httpx.ConnectError("Connection error", request=request)
+
+    with patch("app.service.lci_service.async_http_client", mock_lci_client(handler)):
         response = client.get("/api/lci/products")
         assert response.status_code == 502
         assert "Erro ao buscar produtos LCI" in response.text
+
+
+def test_lci_cache_stats():
+    fake_products = [{"id": 1, "name": "Produto A", "description": "Descricao A"}]
+    lci_client = mock_lci_client(lambda request: httpx.Response(200, json=fake_products))
+    with patch("app.service.lci_service.async_http_client", lci_client):
+        client.get("/api/lci/products")
+        client.get("/api/lci/products")
+
+    response = client.get("/api/lci/cache/stats")
+    assert response.status_code == 200
+    assert response.json()["products"]["hits"] >= 1
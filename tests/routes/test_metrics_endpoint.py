@@ -0,0 +1,103 @@
+import asyncio
+import io
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock
+from app.main import app
+from app.core import auth
+from app.core.metrics import (
+    MetricsMiddleware,
+    ROWS_PROCESSED,
+    STAGE_SECONDS,
+    UPLOAD_BYTES,
+)
+from app.exceptions.exceptions import NotFoundException
+from app.service.calculation_history import get_calculation_history
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def overrides():
+    previous = app.dependency_overrides.get(auth.get_current_user)
+    app.dependency_overrides[auth.get_current_user] = lambda: "test@example.com"
+    history = MagicMock()
+    history.get.side_effect = NotFoundException()
+    app.dependency_overrides[get_calculation_history] = lambda: history
+    yield
+    app.dependency_overrides.pop(get_calculation_history, None)
+    if previous is None:
+        app.dependency_overrides.pop(auth.get_current_user, None)
+    else:
+        app.dependency_overrides[auth.get_current_user] = previous
+
+
+def test_metrics_exposes_route_latency_and_calculation_stages():
+    content = (
+        b"Flow Name,Amount,Unit,Flow Direction,UEV,Category\n"
+        b"Sol,10,J,Input,1000000,R\n"
+        b"Diesel,5,kg,Input,2000000,F\n"
+    )
+    rows_before = ROWS_PROCESSED.value()
+    uploaded_before = UPLOAD_BYTES.value()
+    compute_before = STAGE_SECONDS.count(stage="compute")
+
+    response = client.post(
+        "/api/calculate/by-file",
+        files={"file": ("inventario.csv", io.BytesIO(content), "text/csv")},
+    )
+    assert response.status_code == 200
+    assert client.get("/api/calculate/history/123456789").status_code == 404
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert (
+        'http_request_duration_seconds_count{method="POST",'
+        'route="/api/calculate/by-file",status="200"}'
+    ) in text
+    assert 'route="/api/calculate/history/{record_id}"' in text
+    assert 'executor_queue_depth{executor="calculation"}' in text
+    assert 'cache_hits_total{cache="lci_flows"}' in text
+    assert ROWS_PROCESSED.value() == rows_before + 2
+    assert UPLOAD_BYTES.value() > uploaded_before + len(content)
+    assert STAGE_SECONDS.count(stage="compute") == compute_before + 1
+
+
+def test_metrics_requires_authentication():
+    app.dependency_overrides.pop(auth.get_current_user)
+    assert client.get("/metrics").status_code == 401
+
+
+def test_upload_bytes_count_received_body_not_content_length():
+    async def consume(scope, receive, send):
+        while (await receive()).get("more_body"):
+            pass
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    messages = iter(
+        [
+            {"type": "http.request", "body": b"a" * 10, "more_body": True},
+            {"type": "http.request", "body": b"b" * 5, "more_body": False},
+        ]
+    )
+
+    async def receive():
+        return next(messages)
+
+    async def send(message):
+        pass
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [
+            (b"content-type", b"multipart/form-data; boundary=x"),
+            (b"content-length", b"1000000"),
+        ],
+    }
+    uploaded_before = UPLOAD_BYTES.value()
+    asyncio.run(MetricsMiddleware(consume)(scope, receive, send))
+    assert UPLOAD_BYTES.value() == uploaded_before + 15
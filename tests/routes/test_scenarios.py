@@ -0,0 +1,93 @@
+import io
+import json
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, patch
+from app.main import app
+from app.core import auth
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def current_user():
+    previous = app.dependency_overrides.get(auth.get_current_user)
+    app.dependency_overrides[auth.get_current_user] = lambda: "test@example.com"
+    yield
+    if previous is None:
+        app.dependency_overrides.pop(auth.get_current_user, None)
+    else:
+        app.dependency_overrides[auth.get_current_user] = previous
+
+
+INVENTORY_CSV = (
+    b"Flow Name,Amount,Unit,Flow Direction,UEV,Category\n"
+    b"Sol,10,J,Input,1000000,R\n"
+    b"Diesel,5,kg,Input,2000000,F\n"
+    b"Solo,2,kg,Input,10000000,N\n"
+)
+
+SPEC = {
+    "scenarios": [{"name": "diesel", "overrides": [{"flow": "Diesel", "amount": 10}]}],
+    "monte_carlo": {
+        "iterations": 100,
+        "seed": 1,
+        "distributions": [{"flow": "Sol", "kind": "lognormal", "sd": 1.1}],
+    },
+}
+
+
+def test_analyze_scenarios_by_file():
+    response = client.post(
+        "/api/calculate/scenarios/by-file?precision=3",
+        files={"file": ("inventario.csv", io.BytesIO(INVENTORY_CSV), "text/csv")},
+        data={"spec": json.dumps(SPEC)},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["filename"] == "inventario.csv"
+    assert data["base"]["emergy"]["Total"]["value"] == "4.000E+07"
+    assert data["scenarios"][0]["name"] == "diesel"
+    assert data["scenarios"][0]["emergy"]["F"]["value"] == "2.000E+07"
+    assert data["monte_carlo"]["iterations"] == 100
+    assert set(data["monte_carlo"]["emergy"]["R"]) >= {"mean", "p5", "p95", "unit"}
+
+
+def test_analyze_scenarios_by_file_invalid_spec():
+    response = client.post(
+        "/api/calculate/scenarios/by-file",
+        files={"file": ("inventario.csv", io.BytesIO(INVENTORY_CSV), "text/csv")},
+        data={"spec": json.dumps({"scenarios": []})},
+    )
+
+    assert response.status_code == 422
+
+
+def test_analyze_scenarios_by_file_unknown_flow():
+    spec = {"scenarios": [{"overrides": [{"flow": "Vento", "uev": 1}]}]}
+    response = client.post(
+        "/api/calculate/scenarios/by-file",
+        files={"file": ("inventario.csv", io.BytesIO(INVENTORY_CSV), "text/csv")},
+        data={"spec": json.dumps(spec)},
+    )
+
+    assert response.status_code == 400
+    assert "Vento" in response.json()["detail"]
+
+
+def test_analyze_scenarios_by_lci():
+    inventory = pd.read_csv(io.BytesIO(INVENTORY_CSV))
+    with patch("app.routes.scenarios.APIDataSource") as mock_data_source:
+        mock_data_source.return_value.fetch_data_async = AsyncMock(
+            return_value=inventory
+        )
+        response = client.post("/api/calculate/scenarios/by-lci/7", json=SPEC)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["product_id"] == 7
+    assert data["scenarios"][0]["sustainability"]["classification"] == (
+        "LOW_SUSTAINABILITY"
+    )
@@ -0,0 +1,100 @@
+import io
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core import auth
+from app.service.inventory_session import (
+    InventorySessionStore,
+    get_inventory_session_store,
+)
+
+client = TestClient(app)
+
+INVENTORY_CSV = (
+    b"Flow Name,Amount,Unit,Flow Direction,UEV,Category\n"
+    b"Sol,10,J,Input,1000000,R\n"
+    b"Diesel,5,kg,Input,2000000,F\n"
+    b"Solo,2,kg,Input,10000000,N\n"
+)
+
+
+@pytest.fixture(autouse=True)
+def current_user():
+    previous = app.dependency_overrides.get(auth.get_current_user)
+    app.dependency_overrides[auth.get_current_user] = lambda: "test@example.com"
+    yield
+    if previous is None:
+        app.dependency_overrides.pop(auth.get_current_user, None)
+    else:
+        app.dependency_overrides[auth.get_current_user] = previous
+
+
+@pytest.fixture(autouse=True)
+def store():
+    store = InventorySessionStore(max_sessions=4, ttl_seconds=60)
+    app.dependency_overrides[get_inventory_session_store] = lambda: store
+    yield store
+    app.dependency_overrides.pop(get_inventory_session_store, None)
+
+
+@pytest.fixture
+def session_id():
+    response = client.post(
+        "/api/calculate/sessions",
+        files={"file": ("inventario.csv", io.BytesIO(INVENTORY_CSV), "text/csv")},
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert data["rows"] == 3
+    assert data["emergy"]["Total"]["value"] == "4.00E+07"
+    return data["session_id"]
+
+
+def test_session_flow_operations(session_id):
+    base = f"/api/calculate/sessions/{session_id}"
+
+    response = client.post(
+        f"{base}/flows",
+        json={
+            "flow_name": "Chuva",
+            "amount": 10,
+            "unit": "m3",
+            "flow_direction": "Input",
+            "uev": 1e6,
+            "category": "R",
+        },
+    )
+    assert response.status_code == 201
+    assert response.json()["flow_id"] == 4
+    assert response.json()["emergy"]["R"]["value"] == "2.00E+07"
+
+    response = client.patch(f"{base}/flows/2?precision=3", json={"amount": 10})
+    assert response.status_code == 200
+    assert response.json()["emergy"]["F"]["value"] == "2.000E+07"
+
+    response = client.delete(f"{base}/flows/1")
+    assert response.json()["emergy"]["Total"]["value"] == "5.00E+07"
+
+    flows = client.get(f"{base}/flows").json()["flows"]
+    assert [flow["flow_id"] for flow in flows] == [2, 3, 4]
+    assert client.get(base).json()["sustainability"]["ESI"] == 0.62
+
+
+def test_session_reports_undefined_indicators(session_id):
+    response = client.delete(f"/api/calculate/sessions/{session_id}/flows/2")
+
+    assert response.status_code == 200
+    assert response.json()["sustainability"] is None
+    assert "R ou F igual a 0" in response.json()["detail"]
+
+
+def test_unknown_flow_returns_404(session_id):
+    response = client.patch(
+        f"/api/calculate/sessions/{session_id}/flows/99", json={"amount": 1}
+    )
+    assert response.status_code == 404
+
+
+def test_closed_session_returns_404(session_id):
+    assert client.delete(f"/api/calculate/sessions/{session_id}").status_code == 204
+    assert client.get(f"/api/calculate/sessions/{session_id}").status_code == 404
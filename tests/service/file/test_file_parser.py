@@ -1,10 +1,20 @@
+import io
 import pytest
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+from openpyxl import Workbook
 from pathlib import Path
 from app.service.file.file_parser import (
+    build_csv_validation_report,
+    build_validation_report,
     detect_delimiter,
+    detect_stream_delimiter,
+    iter_csv_chunks,
     resolve_dataframe,
     parse_file_to_dataframe,
+    REQUIRED_COLUMNS,
 )
 from app.exceptions.exceptions import BadRequestException
 
@@ -125,3 +135,264 @@ def test_parse_file_to_dataframe_invalid_uev(invalid_uev_csv_file):
     assert "Valores inválidos encontrados na coluna 'UEV' para as entradas" in str(
         exc.value.detail
     )
+
+
+SEMICOLON_CSV_CONTENT = """Flow Name;Amount;Unit;Flow Direction;UEV;Category
+Água;100;L;Input;2.5;R
+Energia;200;kWh;Input;1.2;F
+CO2;5;kg;Output;;F
+"""
+
+
+def test_detect_stream_delimiter_keeps_stream_position():
+    stream = io.BytesIO(SEMICOLON_CSV_CONTENT.encode())
+    assert detect_stream_delimiter(stream) == ";"
+    assert stream.tell() == 0
+
+
+def test_iter_csv_chunks_reads_stream_in_chunks():
+    stream = io.BytesIO(SEMICOLON_CSV_CONTENT.encode())
+    chunks = list(iter_csv_chunks(stream, chunk_rows=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert chunks[0]["Amount"].tolist() == [100, 200]
+    assert not stream.closed
+
+
+def test_iter_csv_chunks_reports_row_numbers_across_chunks():
+    content = VALID_CSV_CONTENT + "Vento,10,MJ,Input,,R\n"
+    stream = io.BytesIO(content.encode())
+
+    with pytest.raises(BadRequestException) as exc:
+        list(iter_csv_chunks(stream, chunk_rows=2))
+    assert "Valores de UEV ausentes para entradas nas linhas: 4" in str(
+        exc.value.detail
+    )
+
+
+def test_build_csv_validation_report_collects_errors_across_chunks():
+    content = VALID_CSV_CONTENT + "Vento,10,MJ,Input,,R\n" + "Chuva,abc,L,Input,,N\n"
+    stream = io.BytesIO(content.encode())
+
+    report = build_csv_validation_report(stream, chunk_rows=2)
+
+    assert report.rows == 4
+    assert {issue.code: issue.rows for issue in report.issues} == {
+        "invalid_amount": [5],
+        "missing_uev": [4, 5],
+    }
+
+
+def test_build_validation_report_valid_file(valid_csv_file):
+    report = build_validation_report(valid_csv_file)
+    assert report.to_dict() == {"valid": True, "rows": 2, "issues": []}
+
+
+def test_iter_csv_chunks_missing_columns():
+    stream = io.BytesIO(INVALID_CSV_CONTENT.encode())
+    with pytest.raises(BadRequestException) as exc:
+        list(iter_csv_chunks(stream, chunk_rows=2))
+    assert "Colunas obrigatórias ausentes" in str(exc.value.detail)
+
+
+@pytest.fixture
+def inventory_table() -> pa.Table:
+    return pa.table(
+        {
+            "Flow Name": ["Água", "Energia"],
+            " Amount ": [100.0, 200.0],
+            "Unit": ["L", "kWh"],
+            "Flow Direction": ["Input", "Input"],
+            "UEV": [2.5, 1.2],
+            "Category": ["R", "F"],
+            "Comment": ["não usado", "não usado"],
+        }
+    )
+
+
+def test_resolve_dataframe_parquet_projects_required_columns(tmp_path, inventory_table):
+    file = tmp_path / "inventory.parquet"
+    pq.write_table(inventory_table, file)
+
+    df = parse_file_to_dataframe(file)
+    assert set(df.columns) == REQUIRED_COLUMNS
+    assert df["Amount"].dtype == "float64"
+    assert df["UEV"].tolist() == [2.5, 1.2]
+
+
+def test_resolve_dataframe_arrow_file(tmp_path, inventory_table):
+    file = tmp_path / "inventory.arrow"
+    feather.write_feather(inventory_table, file)
+
+    df = parse_file_to_dataframe(file)
+    assert set(df.columns) == REQUIRED_COLUMNS
+    assert df["Amount"].tolist() == [100.0, 200.0]
+
+
+def test_resolve_dataframe_arrow_stream(tmp_path, inventory_table):
+    file = tmp_path / "inventory.ipc"
+    with pa.OSFile(str(file), "wb") as sink:
+        with pa.ipc.new_stream(sink, inventory_table.schema) as writer:
+            writer.write_table(inventory_table)
+
+    df = parse_file_to_dataframe(file)
+    assert set(df.columns) == REQUIRED_COLUMNS
+    assert df.shape[0] == 2
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+def test_dictionary_encoded_file_is_validated(tmp_path, inventory_table, suffix):
+    # Colunas de texto codificadas como dicionário chegam como categóricas,
+    # com Amount/UEV em float64, e ainda assim precisam ser validadas
+    table = inventory_table.set_column(
+        inventory_table.schema.get_field_index("UEV"),
+        "UEV",
+        pa.array([2.5, None]),
+    )
+    # Valores já no formato normalizado ("input", "R")
+    table = table.set_column(
+        table.schema.get_field_index("Flow Direction"),
+        "Flow Direction",
+        pa.array(["input", "input"]).dictionary_encode(),
+    )
+    table = table.set_column(
+        table.schema.get_field_index("Category"),
+        "Category",
+        table.column("Category").dictionary_encode(),
+    )
+    file = tmp_path / f"inventory{suffix}"
+    if suffix == ".parquet":
+        pq.write_table(table, file)
+    else:
+        feather.write_feather(table, file)
+
+    with pytest.raises(BadRequestException) as exc:
+        parse_file_to_dataframe(file)
+    assert "Valores de UEV ausentes para entradas nas linhas: 3" in str(
+        exc.value.detail
+    )
+
+
+def test_resolve_dataframe_parquet_missing_columns(tmp_path, inventory_table):
+    file = tmp_path / "inventory.parquet"
+    pq.write_table(inventory_table.drop_columns(["UEV"]), file)
+
+    with pytest.raises(BadRequestException) as exc:
+        resolve_dataframe(file)
+    assert "Colunas obrigatórias ausentes: UEV" in str(exc.value.detail)
+
+
+def test_resolve_dataframe_invalid_parquet(tmp_path):
+    file = tmp_path / "inventory.parquet"
+    file.write_bytes(b"not a parquet file")
+
+    with pytest.raises(BadRequestException) as exc:
+        resolve_dataframe(file)
+    assert "Arquivo Parquet inválido" in str(exc.value.detail)
+
+
+XLSX_HEADER = ["Flow Name", "Amount", "Unit", "Flow Direction", "UEV", "Category"]
+
+
+def write_xlsx(path: Path, sheets: dict) -> Path:
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for title, rows in sheets.items():
+        worksheet = workbook.create_sheet(title)
+        for row in rows:
+            worksheet.append(row)
+    workbook.save(path)
+    return path
+
+
+def test_read_xlsx_detects_header_and_projects_columns(tmp_path):
+    file = write_xlsx(
+        tmp_path / "inventory.xlsx",
+        {
+            "Inventário": [
+                ["Inventário da fazenda"],
+                [],
+                ["Notas", *XLSX_HEADER],
+                ["a", "Água", 100, "L", "Input", 2.5, "R"],
+                ["b", "Energia", 200, "kWh", "Input", 1.2, "F"],
+            ]
+        },
+    )
+
+    df = parse_file_to_dataframe(file)
+    assert set(df.columns) == REQUIRED_COLUMNS
+    assert df["Amount"].tolist() == [100, 200]
+    assert df.index.tolist() == [2, 3]
+
+
+def test_read_xlsx_selects_sheet(tmp_path):
+    file = write_xlsx(
+        tmp_path / "inventory.xlsx",
+        {
+            "Resumo": [["Total"], [1]],
+            "Dados": [XLSX_HEADER, ["Água", 100, "L", "Input", 2.5, "R"]],
+        },
+    )
+
+    df = parse_file_to_dataframe(file, sheet="Dados")
+    assert df["Flow Name"].tolist() == ["Água"]
+
+    with pytest.raises(BadRequestException) as exc:
+        parse_file_to_dataframe(file, sheet="Outra")
+    assert "Planilha 'Outra' não encontrada" in str(exc.value.detail)
+
+
+def test_read_xlsx_missing_columns_fails_on_header(tmp_path):
+    file = write_xlsx(
+        tmp_path / "inventory.xlsx",
+        {"Dados": [XLSX_HEADER[:-1], ["Água", 100, "L", "Input", 2.5]]},
+    )
+
+    with pytest.raises(BadRequestException) as exc:
+        resolve_dataframe(file)
+    assert "Colunas obrigatórias ausentes: Category" in str(exc.value.detail)
+
+
+def test_read_xlsx_reports_sheet_row_numbers(tmp_path):
+    file = write_xlsx(
+        tmp_path / "inventory.xlsx",
+        {
+            "Dados": [
+                ["Título"],
+                XLSX_HEADER,
+                ["Água", 100, "L", "Input", 2.5, "R"],
+                [],
+                ["Vento", 10, "MJ", "Input", None, "R"],
+            ]
+        },
+    )
+
+    with pytest.raises(BadRequestException) as exc:
+        parse_file_to_dataframe(file)
+    assert "Valores de UEV ausentes para entradas nas linhas: 5" in str(
+        exc.value.detail
+    )
+
+
+def test_read_xlsx_write_only_workbook(tmp_path):
+    # Planilhas gravadas em streaming usam strings inline e não têm dimensões
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Dados")
+    worksheet.append([*XLSX_HEADER, "Notas"])
+    worksheet.append(["Energia", 200, "kWh", "Input", 1.2, "F", "=B2*2"])
+    file = tmp_path / "write_only.xlsx"
+    workbook.save(file)
+
+    df = parse_file_to_dataframe(file)
+    assert df["Flow Name"].tolist() == ["Energia"]
+    assert df["Amount"].tolist() == [200.0]
+    assert df.index.tolist() == [0]
+
+
+def test_read_xlsx_invalid_file(tmp_path):
+    file = tmp_path / "inventory.xlsx"
+    file.write_bytes(b"not a workbook")
+
+    with pytest.raises(BadRequestException) as exc:
+        resolve_dataframe(file)
+    assert "Arquivo Excel inválido" in str(exc.value.detail)
@@ -1,6 +1,11 @@
+import asyncio
 import pytest
 from fastapi import UploadFile
-from app.service.file.file_storage import save_temp_file, temporary_upload_file
+from app.service.file.file_storage import (
+    save_temp_file,
+    temporary_upload_file,
+    temporary_upload_file_async,
+)
 
 
 @pytest.fixture
@@ -22,3 +27,12 @@ def test_temporary_upload_file(mock_upload_file):
     with temporary_upload_file(mock_upload_file) as temp_path:
         assert temp_path.exists(), "Temporary file should exist within the context."
     assert not temp_path.exists(), "Temporary file should be deleted after the context."
+
+
+def test_temporary_upload_file_async(mock_upload_file):
+    async def run():
+        async with temporary_upload_file_async(mock_upload_file) as temp_path:
+            assert temp_path.read_text() == "This is a test file."
+        return temp_path
+
+    assert not asyncio.run(run()).exists()
@@ -46,3 +46,17 @@ def test_validate_file_mime_invalid(mock_invalid_file):
     assert validate_file_mime(mock_invalid_file) is False, (
         "Invalid file should not be valid."
     )
+
+
+def test_validate_file_mime_parquet():
+    parquet_file = MockUploadFile(
+        "test_file.parquet", b"PAR1", "application/vnd.apache.parquet"
+    )
+    assert validate_file_mime(parquet_file) is True
+
+
+def test_validate_file_mime_octet_stream_uses_extension():
+    arrow_file = MockUploadFile("test_file.arrow", b"", "application/octet-stream")
+    binary_file = MockUploadFile("test_file.bin", b"", "application/octet-stream")
+    assert validate_file_mime(arrow_file) is True
+    assert validate_file_mime(binary_file) is False
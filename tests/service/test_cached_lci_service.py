@@ -0,0 +1,102 @@
+import asyncio
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from app.exceptions.exceptions import LCIServiceException
+from app.models.lci_models import LCIFlow
+from app.service.cached_lci_service import CachedLCIService
+from app.service.lci_service import LCIService
+
+FLOW = LCIFlow(
+    flow_name="A", amount=1.0, unit="kg", flow_direction="Input", uev=2.0, category="R"
+)
+
+
+def test_get_flows_by_product_id_is_cached():
+    service = CachedLCIService()
+    with patch.object(
+        LCIService, "get_flows_by_product_id", return_value=[FLOW]
+    ) as mock_get:
+        assert service.get_flows_by_product_id(1) == [FLOW]
+        assert service.get_flows_by_product_id(1) == [FLOW]
+
+    mock_get.assert_called_once_with(1)
+    stats = service.cache_stats()["flows"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_sync_misses_share_one_load_and_release_key_locks():
+    calls = []
+
+    def fake_get_flows(self, product_id):
+        calls.append(product_id)
+        time.sleep(0.01)
+        return [FLOW]
+
+    service = CachedLCIService()
+    with patch.object(LCIService, "get_flows_by_product_id", fake_get_flows):
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            results = list(pool.map(service.get_flows_by_product_id, [1] * 5 + [2]))
+
+    assert sorted(calls) == [1, 2]
+    assert all(result == [FLOW] for result in results)
+    assert service._key_locks == {}
+
+
+def test_get_flows_by_product_id_async_coalesces_concurrent_misses():
+    calls = []
+
+    async def fake_get_flows(self, product_id):
+        calls.append(product_id)
+        await asyncio.sleep(0.01)
+        return [FLOW]
+
+    async def run(service):
+        return await asyncio.gather(
+            *(service.get_flows_by_product_id_async(1) for _ in range(5))
+        )
+
+    service = CachedLCIService()
+    with patch.object(LCIService, "get_flows_by_product_id_async", fake_get_flows):
+        results = asyncio.run(run(service))
+
+    assert calls == [1]
+    assert all(result == [FLOW] for result in results)
+
+
+def test_stale_entry_is_served_while_revalidating():
+    calls = []
+
+    async def fake_list_products(self):
+        calls.append(1)
+        return [f"produto-{len(calls)}"]
+
+    async def run(service):
+        service.products_cache.set("products", ["produto-0"], ttl_seconds=0)
+        first = await service.list_products_async()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        second = await service.list_products_async()
+        return first, second
+
+    service = CachedLCIService()
+    with patch.object(LCIService, "list_products_async", fake_list_products):
+        first, second = asyncio.run(run(service))
+
+    assert first == ["produto-0"]
+    assert second == ["produto-1"]
+    assert calls == [1]
+
+
+def test_errors_are_not_cached():
+    service = CachedLCIService()
+    with patch.object(
+        LCIService,
+        "get_flows_by_product_id",
+        side_effect=[LCIServiceException("Erro LCI"), [FLOW]],
+    ):
+        with pytest.raises(LCIServiceException):
+            service.get_flows_by_product_id(1)
+        assert service.get_flows_by_product_id(1) == [FLOW]
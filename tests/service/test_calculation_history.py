@@ -0,0 +1,108 @@
+import pytest
+from sqlalchemy import event
+from sqlmodel import SQLModel, create_engine
+from app.exceptions.exceptions import NotFoundException
+from app.models.emergy_result import (
+    EmergyResult,
+    EmergyTotals,
+    SustainabilityIndicators,
+)
+from app.models.sustainability_classification import SustainabilityClassification
+from app.service.calculation_history import CalculationHistory, to_emergy_result
+
+OWNER = "test@example.com"
+
+
+@pytest.fixture
+def history(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'history.db'}")
+    SQLModel.metadata.create_all(engine)
+    yield CalculationHistory(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def result():
+    return EmergyResult(
+        totals=EmergyTotals(by_category={"R": 1.23456789e7, "F": 2e6}, total=1.43e7),
+        indicators=SustainabilityIndicators(
+            eyr=7.123456,
+            elr=0.16,
+            esi=44.5,
+            classification=SustainabilityClassification.HIGHLY_SUSTAINABLE,
+        ),
+    )
+
+
+def test_record_round_trips_without_rounding(history, result):
+    record_id = history.record(OWNER, "file", "abc", result, "inventario.csv")
+
+    record = history.get(OWNER, record_id)
+    assert record.filename == "inventario.csv"
+    assert record.created_at is not None
+    assert to_emergy_result(record) == result
+
+
+def test_get_hides_other_users_records(history, result):
+    record_id = history.record(OWNER, "lci", "1", result)
+
+    with pytest.raises(NotFoundException):
+        history.get("other@example.com", record_id)
+    with pytest.raises(NotFoundException):
+        history.get(OWNER, record_id + 1)
+
+
+def test_list_records_pages_by_keyset(history, result):
+    ids = history.record_many(OWNER, "lci", [(str(i), result) for i in range(5)])
+    history.record("other@example.com", "lci", "9", result)
+
+    first, next_before = history.list_records(OWNER, limit=2)
+    assert [record.id for record in first] == [ids[4], ids[3]]
+    assert next_before == ids[3]
+
+    second, next_before = history.list_records(OWNER, limit=2, before=next_before)
+    assert [record.id for record in second] == [ids[2], ids[1]]
+
+    last, next_before = history.list_records(OWNER, limit=2, before=next_before)
+    assert [record.id for record in last] == [ids[0]]
+    assert next_before is None
+
+
+def test_list_records_filters_by_source(history, result):
+    history.record(OWNER, "file", "abc", result)
+    lci_id = history.record(OWNER, "lci", "abc", result)
+
+    records, _ = history.list_records(OWNER, source_type="lci", source="abc")
+    assert [record.id for record in records] == [lci_id]
+
+
+def test_record_many_does_not_reload_records(history, result):
+    statements = []
+
+    def track(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(history.engine, "before_cursor_execute", track)
+    try:
+        ids = history.record_many(OWNER, "lci", [(str(i), result) for i in range(3)])
+    finally:
+        event.remove(history.engine, "before_cursor_execute", track)
+
+    assert len(ids) == 3 and None not in ids
+    assert not any(statement.startswith("SELECT") for statement in statements)
+
+
+def test_record_failure_does_not_raise(tmp_path, result):
+    # Sem as tabelas criadas, a gravação falha e o cálculo segue normalmente
+    history = CalculationHistory(create_engine(f"sqlite:///{tmp_path / 'x.db'}"))
+    assert history.record(OWNER, "lci", "1", result) is None
+
+
+def test_list_records_uses_owner_index(history):
+    with history.engine.connect() as connection:
+        plan = connection.exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT * FROM calculationrecord "
+            "WHERE owner = ? AND id < ? ORDER BY id DESC LIMIT 3",
+            (OWNER, 10),
+        ).all()
+    assert "ix_calculationrecord_owner_id" in " ".join(row[-1] for row in plan)
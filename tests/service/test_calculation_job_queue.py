@@ -0,0 +1,214 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from sqlmodel import Session, SQLModel, create_engine
+from app.db.models import CalculationJob
+from app.exceptions.exceptions import (
+    BadRequestException,
+    ConflictException,
+    NotFoundException,
+    TooManyRequestsException,
+)
+from app.models.calculation_job import JobStatus
+from app.service.calculation_job_queue import CalculationJobQueue
+
+OWNER = "test@example.com"
+
+INVENTORY_CSV = (
+    "Flow Name,Amount,Unit,Flow Direction,UEV,Category\n"
+    "Sol,10,J,Input,1000000,R\n"
+    "Diesel,5,kg,Input,2000000,F\n"
+    "Solo,2,kg,Input,10000000,N\n"
+)
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    # Banco em arquivo: os workers usam conexões próprias, como em produção
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def queue(db_engine):
+    queue = CalculationJobQueue(db_engine, max_workers=1, max_queue=1)
+    yield queue
+    queue.shutdown()
+
+
+@pytest.fixture
+def inventory_file(tmp_path) -> Path:
+    path = tmp_path / "inventario.csv"
+    path.write_text(INVENTORY_CSV)
+    return path
+
+
+def wait_for(queue: CalculationJobQueue, job_id: str) -> CalculationJob:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        job = queue.get(job_id, OWNER)
+        if job.status not in (JobStatus.PENDING, JobStatus.RUNNING):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("Job não terminou a tempo.")
+
+
+def test_job_completes_and_stores_result(queue, inventory_file):
+    job = queue.submit(OWNER, "inventario.csv", inventory_file, precision=4)
+
+    finished = wait_for(queue, job.id)
+    assert finished.status == JobStatus.COMPLETED
+    assert finished.started_at is not None and finished.finished_at is not None
+    assert queue.result(job.id, OWNER)["emergy"]["Total"]["value"] == "4.0000E+07"
+    assert not inventory_file.exists()
+
+
+def test_job_failure_keeps_error_detail(queue, tmp_path):
+    path = tmp_path / "inventario.csv"
+    path.write_text("Flow Name,Amount\nSol,10\n")
+    job = queue.submit(OWNER, "inventario.csv", path, precision=2)
+
+    finished = wait_for(queue, job.id)
+    assert finished.status == JobStatus.FAILED
+    assert "Colunas obrigatórias ausentes" in finished.error
+    with pytest.raises(ConflictException):
+        queue.result(job.id, OWNER)
+
+
+def test_jobs_are_isolated_by_owner(queue, inventory_file):
+    job = queue.submit(OWNER, "inventario.csv", inventory_file, precision=2)
+    with pytest.raises(NotFoundException):
+        queue.get(job.id, "other@example.com")
+    wait_for(queue, job.id)
+
+
+def test_pending_job_is_cancelled_and_queue_rejects_overflow(queue, tmp_path):
+    release = threading.Event()
+
+    def blocking_calculation(path, precision, sheet, cancelled):
+        release.wait(5)
+        raise BadRequestException("interrompido")
+
+    paths = [tmp_path / f"inventario-{i}.csv" for i in range(3)]
+    for path in paths:
+        path.write_text(INVENTORY_CSV)
+
+    with patch(
+        "app.service.calculation_job_queue.calculate_job_file", blocking_calculation
+    ):
+        running = queue.submit(OWNER, "a.csv", paths[0], precision=2)
+        pending = queue.submit(OWNER, "b.csv", paths[1], precision=2)
+        with pytest.raises(TooManyRequestsException):
+            queue.submit(OWNER, "c.csv", paths[2], precision=2)
+
+        cancelled = queue.cancel(pending.id, OWNER)
+        assert cancelled.status == JobStatus.CANCELLED
+        assert not paths[1].exists()
+
+        release.set()
+        assert wait_for(queue, running.id).status == JobStatus.FAILED
+
+    with pytest.raises(ConflictException):
+        queue.cancel(pending.id, OWNER)
+
+
+def test_running_job_cancellation_is_not_overwritten(queue, inventory_file):
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_calculation(path, precision, sheet, cancelled):
+        started.set()
+        release.wait(5)
+        return {"emergy": {}}
+
+    with patch(
+        "app.service.calculation_job_queue.calculate_job_file", slow_calculation
+    ):
+        job = queue.submit(OWNER, "inventario.csv", inventory_file, precision=2)
+        assert started.wait(5)
+        queue.cancel(job.id, OWNER)
+        release.set()
+        queue.shutdown()
+        time.sleep(0.05)
+
+    assert queue.get(job.id, OWNER).status == JobStatus.CANCELLED
+
+
+def add_job(db_engine, job_id: str, path: Path, **values) -> CalculationJob:
+    job = CalculationJob(
+        id=job_id,
+        owner=OWNER,
+        filename="inventario.csv",
+        file_path=str(path),
+        precision=2,
+        status=JobStatus.RUNNING,
+        **values,
+    )
+    with Session(db_engine) as session:
+        session.add(job)
+        session.commit()
+    return job
+
+
+def test_recover_fails_interrupted_jobs(queue, db_engine, tmp_path):
+    path = tmp_path / "inventario.csv"
+    path.write_text(INVENTORY_CSV)
+    add_job(
+        db_engine,
+        "interrompido",
+        path,
+        worker_id="outra-instancia",
+        lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1),
+    )
+    add_job(db_engine, "sem-reserva", tmp_path / "outro.csv")
+
+    queue.recover()
+
+    recovered = queue.get("interrompido", OWNER)
+    assert recovered.status == JobStatus.FAILED
+    assert "reinício" in recovered.error
+    assert not path.exists()
+    assert queue.get("sem-reserva", OWNER).status == JobStatus.FAILED
+
+
+def test_recover_keeps_jobs_leased_by_other_instances(queue, db_engine, tmp_path):
+    path = tmp_path / "inventario.csv"
+    path.write_text(INVENTORY_CSV)
+    add_job(
+        db_engine,
+        "em-andamento",
+        path,
+        worker_id="outra-instancia",
+        lease_expires_at=datetime.now(timezone.utc) + timedelta(seconds=60),
+    )
+
+    queue.recover()
+
+    assert queue.get("em-andamento", OWNER).status == JobStatus.RUNNING
+    assert path.exists()
+
+
+def test_renew_leases_extends_only_own_jobs(db_engine, tmp_path):
+    queue = CalculationJobQueue(
+        db_engine, max_workers=1, max_queue=1, lease_seconds=60, worker_id="esta"
+    )
+    expired = datetime.now(timezone.utc) - timedelta(seconds=1)
+    add_job(db_engine, "proprio", tmp_path / "a.csv", worker_id="esta")
+    add_job(db_engine, "alheio", tmp_path / "b.csv", worker_id="outra")
+    for job_id in ("proprio", "alheio"):
+        with Session(db_engine) as session:
+            job = session.get(CalculationJob, job_id)
+            job.lease_expires_at = expired
+            session.add(job)
+            session.commit()
+
+    assert queue.renew_leases() == 1
+    queue.recover()
+
+    assert queue.get("proprio", OWNER).status == JobStatus.RUNNING
+    assert queue.get("alheio", OWNER).status == JobStatus.FAILED
@@ -1,8 +1,24 @@
+import asyncio
+import io
+import threading
 import pandas as pd
 import pytest
 from unittest.mock import patch, MagicMock
-from app.service.data_source import FileDataSource, APIDataSource
-from app.exceptions.exceptions import LCIServiceException
+from app.service.data_source import (
+    FileDataSource,
+    APIDataSource,
+    CompositeDataSource,
+    CSVStreamDataSource,
+    DataSource,
+    ProductBatchDataSource,
+    PRODUCT_ID_COLUMN,
+    SOURCE_COLUMN,
+    SOURCE_TYPE_COLUMN,
+    create_data_source,
+    register_data_source,
+    registered_data_sources,
+)
+from app.exceptions.exceptions import BadRequestException, LCIServiceException
 
 
 def test_file_data_source_fetch_data():
@@ -13,7 +29,7 @@ def test_file_data_source_fetch_data():
     ) as mock_parse:
         ds = FileDataSource(fake_path)
         df = ds.fetch_data()
-        mock_parse.assert_called_once_with(fake_path)
+        mock_parse.assert_called_once_with(fake_path, sheet=None)
         pd.testing.assert_frame_equal(df, fake_df)
 
 
@@ -45,3 +61,160 @@ def test_api_data_source_fetch_data_lci_service_exception():
     with pytest.raises(LCIServiceException) as exc:
         ds.fetch_data()
     assert "Erro LCI" in str(exc.value)
+
+
+def test_product_batch_data_source_fetch_data_success():
+    flow = {
+        "flow_name": "A",
+        "amount": 1.0,
+        "unit": "kg",
+        "flow_direction": "Input",
+        "uev": 2.0,
+        "category": "R",
+    }
+    mock_lci_service = MagicMock()
+    mock_lci_service.get_flows_by_product_id.return_value = [
+        MagicMock(model_dump=MagicMock(return_value=flow))
+    ]
+
+    ds = ProductBatchDataSource([1, 2, 1], mock_lci_service)
+    df = ds.fetch_data()
+
+    assert ds.product_ids == [1, 2]
+    assert df[PRODUCT_ID_COLUMN].tolist() == [1, 2]
+    assert df["Flow Name"].tolist() == ["A", "A"]
+    assert ds.errors == {}
+
+
+def test_product_batch_data_source_collects_errors():
+    def get_flows(product_id):
+        if product_id == 2:
+            raise LCIServiceException("Erro LCI")
+        return []
+
+    mock_lci_service = MagicMock()
+    mock_lci_service.get_flows_by_product_id.side_effect = get_flows
+
+    ds = ProductBatchDataSource([1, 2], mock_lci_service)
+    df = ds.fetch_data()
+
+    assert df.empty
+    assert ds.errors[2] == "Erro LCI"
+    assert "Nenhum flow encontrado" in ds.errors[1]
+
+
+def test_product_batch_data_source_fetch_data_async():
+    flow = MagicMock(model_dump=MagicMock(return_value={"flow_name": "A"}))
+
+    async def get_flows(product_id):
+        if product_id == 2:
+            raise LCIServiceException("Erro LCI")
+        return [flow]
+
+    mock_lci_service = MagicMock()
+    mock_lci_service.get_flows_by_product_id_async.side_effect = get_flows
+
+    ds = ProductBatchDataSource([1, 2], mock_lci_service)
+    df = asyncio.run(ds.fetch_data_async())
+
+    assert df[PRODUCT_ID_COLUMN].tolist() == [1]
+    assert ds.errors == {2: "Erro LCI"}
+
+
+def test_csv_stream_data_source_fetch_data():
+    content = b"Flow Name,Amount,Unit,Flow Direction,UEV,Category\nA,1,kg,Input,2,R\nB,3,kg,Input,4,F\n"
+    ds = CSVStreamDataSource(io.BytesIO(content), chunk_rows=1)
+
+    assert [len(chunk) for chunk in ds.iter_chunks()] == [1, 1]
+    ds.stream.seek(0)
+    assert ds.fetch_data()["Flow Name"].tolist() == ["A", "B"]
+
+
+class StaticDataSource(DataSource):
+    source_type = "static"
+
+    def __init__(self, name: str, rows: int):
+        self.name = name
+        self.rows = rows
+
+    @property
+    def source_id(self) -> str:
+        return self.name
+
+    def fetch_data(self) -> pd.DataFrame:
+        return pd.DataFrame({"Flow Name": [self.name] * self.rows})
+
+
+def test_composite_data_source_adds_provenance_and_timings():
+    ds = CompositeDataSource(
+        [
+            StaticDataSource("a", 2),
+            StaticDataSource("vazio", 0),
+            StaticDataSource("b", 1),
+        ]
+    )
+    df = ds.fetch_data()
+
+    assert df["Flow Name"].tolist() == ["a", "a", "b"]
+    assert df[SOURCE_TYPE_COLUMN].unique().tolist() == ["static"]
+    assert df[SOURCE_COLUMN].tolist() == ["a", "a", "b"]
+    assert [(t.source, t.rows) for t in ds.timings] == [
+        ("a", 2),
+        ("vazio", 0),
+        ("b", 1),
+    ]
+    assert all(t.seconds >= 0 for t in ds.timings)
+
+
+def test_composite_data_source_fetches_concurrently():
+    started = []
+
+    async def get_flows(product_id):
+        started.append(product_id)
+        # Só termina depois que as duas buscas começaram
+        while len(started) < 2:
+            await asyncio.sleep(0)
+        return [MagicMock(model_dump=MagicMock(return_value={"flow_name": "A"}))]
+
+    mock_lci_service = MagicMock()
+    mock_lci_service.get_flows_by_product_id_async.side_effect = get_flows
+    ds = CompositeDataSource(
+        [APIDataSource(1, mock_lci_service), APIDataSource(2, mock_lci_service)]
+    )
+
+    df = asyncio.run(asyncio.wait_for(ds.fetch_data_async(), timeout=1))
+    assert df[SOURCE_COLUMN].tolist() == ["1", "2"]
+    assert df[SOURCE_TYPE_COLUMN].tolist() == ["lci", "lci"]
+
+
+def test_composite_data_source_reads_files_in_executor():
+    loop_threads = []
+
+    class ThreadDataSource(StaticDataSource):
+        def fetch_data(self) -> pd.DataFrame:
+            loop_threads.append(threading.get_ident())
+            return super().fetch_data()
+
+    async def scenario():
+        ds = CompositeDataSource([ThreadDataSource("a", 1)])
+        return await ds.fetch_data_async(), threading.get_ident()
+
+    df, loop_thread = asyncio.run(scenario())
+    assert df[SOURCE_COLUMN].tolist() == ["a"]
+    assert loop_threads and loop_threads[0] != loop_thread
+
+
+def test_composite_data_source_without_rows():
+    with pytest.raises(BadRequestException):
+        CompositeDataSource([StaticDataSource("vazio", 0)]).fetch_data()
+
+
+def test_data_source_registry():
+    register_data_source("static", StaticDataSource)
+
+    ds = create_data_source("static", name="x", rows=1)
+    assert isinstance(ds, StaticDataSource)
+    assert {"file", "lci", "static"} <= set(registered_data_sources())
+    assert create_data_source("file", file_path="dados/inv.csv").source_id == "inv.csv"
+    with pytest.raises(BadRequestException):
+        create_data_source("ftp")
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.exceptions.exceptions import BadRequestException
+from app.service.emergy_aggregator import EmergyAggregator, NeumaierSum
+from app.service.inventory import normalize_inventory
+
+
+@pytest.fixture
+def inventory():
+    return pd.DataFrame(
+        {
+            "Flow Name": ["A", "B", "C", "D", "E"],
+            "Amount": [10, 5, 2, "x", 1],
+            "Unit": ["kg", "kg", "kg", "kg", "kg"],
+            "Flow Direction": [" Input", "input", "INPUT ", "Input", "Output"],
+            "UEV": [1e6, 2e6, 1e7, 1e6, 1e6],
+            "Category": ["r ", "F", None, "R", "F"],
+        }
+    )
+
+
+def test_neumaier_sum_compensates_cancellation():
+    accumulator = NeumaierSum()
+    for value in [1e16, 1.0, -1e16]:
+        accumulator.add(value)
+    assert accumulator.value == 1.0
+
+
+def test_add_chunk_normalizes_direction_and_category(inventory):
+    totals, total = EmergyAggregator().add_chunks([inventory]).result()
+
+    assert totals == {"F": 1e7, "R": 1e7}
+    assert total == 4e7
+
+
+def test_chunked_result_matches_single_chunk(inventory):
+    single = EmergyAggregator().add_chunks([inventory]).result()
+    chunks = [inventory.iloc[i : i + 2] for i in range(0, len(inventory), 2)]
+    assert EmergyAggregator().add_chunks(chunks).result() == single
+
+
+def test_result_without_inputs_raises(inventory):
+    aggregator = EmergyAggregator().add_chunks([inventory.iloc[4:]])
+    with pytest.raises(BadRequestException) as exc:
+        aggregator.result()
+    assert "Nenhuma entrada válida com Flow Direction" in str(exc.value.detail)
+
+
+def test_result_without_valid_rows_raises(inventory):
+    aggregator = EmergyAggregator().add_chunks([inventory.iloc[3:4]])
+    with pytest.raises(BadRequestException) as exc:
+        aggregator.result()
+    assert "Nenhuma linha com Amount e UEV válidos." in str(exc.value.detail)
+
+
+@pytest.mark.parametrize("normalized", [False, True])
+def test_raw_and_normalized_chunks_match(inventory, normalized):
+    chunk = normalize_inventory(inventory) if normalized else inventory
+    totals, total = EmergyAggregator().add_chunks([chunk]).result()
+    assert totals == {"F": 1e7, "R": 1e7}
+    assert total == 4e7
+
+
+def test_large_inventory_matches_groupby():
+    rows = 5_000
+    df = pd.DataFrame(
+        {
+            "Flow Name": ["f"] * rows,
+            "Amount": np.linspace(0.1, 100, rows),
+            "Unit": ["kg"] * rows,
+            "Flow Direction": np.resize(["Input", " input", "Output"], rows),
+            "UEV": np.linspace(1e3, 1e9, rows),
+            "Category": np.resize(["R", "n ", "F", None], rows),
+        }
+    )
+    totals, total = EmergyAggregator().add_chunks([df]).result()
+
+    inputs = df[df["Flow Direction"].str.strip().str.lower() == "input"]
+    emergy = inputs["Amount"] * inputs["UEV"]
+    expected = emergy.groupby(inputs["Category"].str.strip().str.upper()).sum()
+
+    assert totals.keys() == expected.to_dict().keys()
+    for category, value in expected.items():
+        assert totals[category] == pytest.approx(value, rel=1e-12)
+    assert total == pytest.approx(emergy.sum(), rel=1e-12)
+
+
+def test_chunk_without_inputs(inventory):
+    aggregator = EmergyAggregator().add_chunks([inventory.iloc[4:]])
+    assert aggregator.input_rows == 0
+    assert aggregator.totals_by_category == {}
+
+
+def test_progress_counts_rejected_rows(inventory):
+    aggregator = EmergyAggregator().add_chunks([inventory.iloc[:2], inventory.iloc[2:]])
+    progress = aggregator.progress()
+
+    assert progress.rows == 5
+    assert progress.rejected_rows == 1
+    assert progress.totals.by_category == {"F": 1e7, "R": 1e7}
@@ -0,0 +1,100 @@
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from sqlmodel import SQLModel, create_engine
+from sqlalchemy.pool import StaticPool
+from app.models.emergy_result import (
+    EmergyResult,
+    EmergyTotals,
+    SustainabilityIndicators,
+)
+from app.models.sustainability_classification import SustainabilityClassification
+from app.service.emergy_result_cache import EmergyResultCache, inventory_fingerprint
+
+
+def make_result(total: float) -> EmergyResult:
+    return EmergyResult(
+        totals=EmergyTotals(by_category={"R": total}, total=total),
+        indicators=SustainabilityIndicators(
+            eyr=1.0,
+            elr=0.5,
+            esi=2.0,
+            classification=SustainabilityClassification.SUSTAINABLE,
+        ),
+    )
+
+
+@pytest.fixture
+def inventory():
+    return pd.DataFrame(
+        {
+            "Flow Name": ["A", "B"],
+            "Amount": [10, 5],
+            "Unit": ["kg", "kg"],
+            "Flow Direction": ["Input", "Input"],
+            "UEV": [1e6, 2e6],
+            "Category": ["R", "F"],
+        }
+    )
+
+
+@pytest.fixture
+def memory_engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with patch("app.service.emergy_result_cache.engine", engine):
+        yield engine
+
+
+def test_inventory_fingerprint_is_stable(inventory):
+    assert inventory_fingerprint(inventory) == inventory_fingerprint(inventory.copy())
+
+
+def test_inventory_fingerprint_ignores_extra_columns_and_numeric_types(inventory):
+    other = inventory.assign(Extra=[1, 2], Amount=["10", "5.0"])
+    assert inventory_fingerprint(inventory) == inventory_fingerprint(other)
+
+
+def test_inventory_fingerprint_changes_with_values(inventory):
+    other = inventory.assign(UEV=[1e6, 3e6])
+    assert inventory_fingerprint(inventory) != inventory_fingerprint(other)
+
+
+def test_cache_returns_copies():
+    cache = EmergyResultCache(max_size=2, ttl_seconds=60)
+    result = make_result(1.0)
+    cache.set("abc", result)
+
+    cached = cache.get("abc")
+    cached.totals.by_category["R"] = 2.0
+    assert cache.get("abc") == result
+
+
+def test_cache_evicts_least_recently_used():
+    cache = EmergyResultCache(max_size=1, ttl_seconds=60)
+    cache.set("a", make_result(1.0))
+    cache.set("b", make_result(2.0))
+    assert cache.get("a") is None
+    assert cache.get("b") == make_result(2.0)
+
+
+def test_cache_persists_results(memory_engine):
+    cache = EmergyResultCache(max_size=2, ttl_seconds=60, persist=True)
+    cache.set("abc", make_result(1.0 / 3))
+
+    restarted = EmergyResultCache(max_size=2, ttl_seconds=60, persist=True)
+    assert restarted.get("abc") == make_result(1.0 / 3)
+
+
+def test_cache_prunes_persisted_results(memory_engine):
+    cache = EmergyResultCache(max_size=1, ttl_seconds=60, persist=True, max_persisted=1)
+    cache.set("a", make_result(1.0))
+    cache.set("b", make_result(2.0))
+
+    restarted = EmergyResultCache(max_size=2, ttl_seconds=60, persist=True)
+    assert restarted.get("a") is None
+    assert restarted.get("b") == make_result(2.0)
@@ -1,8 +1,11 @@
 import pytest
+from unittest.mock import patch
 import pandas as pd
 from app.service.emergy_service import EmergyService
 from app.service.data_source import DataSource
 from app.exceptions.exceptions import BadRequestException
+from app.service.emergy_result_cache import EmergyResultCache
+from app.models.emergy_result import EmergyTotals
 
 
 class DummyDataSource(DataSource):
@@ -112,15 +115,12 @@ def test_calculate_emergy_with_invalid_amounts_raises(
 
 
 def test_calculate_sustainability_indicators_valid(valid_input_dataframe):
-    emergy_totals = {
-        "R": {"value": "1.00E+06", "unit": "sej"},
-        "N": {"value": "2.00E+06", "unit": "sej"},
-        "F": {"value": "1.00E+06", "unit": "sej"},
-        "Total": {"value": "4.00E+06", "unit": "sej"},
-    }
+    emergy_totals = EmergyTotals(
+        by_category={"R": 1e6, "N": 2e6, "F": 1e6}, total=4e6
+    )
 
     service = EmergyService(DummyDataSource(valid_input_dataframe))
-    result = service._calculate_sustainability_indicators(emergy_totals)
+    result = service.calculate_sustainability_indicators(emergy_totals).to_dict()
 
     assert result["EYR"] == 4.0
     assert result["ELR"] == 3.0
@@ -131,44 +131,150 @@ def test_calculate_sustainability_indicators_valid(valid_input_dataframe):
 def test_sustainability_indicators_with_zero_R_raises(
     dataframe_with_invalid_numeric_data,
 ):
-    emergy_totals = {
-        "R": {"value": "0", "unit": "sej"},
-        "N": {"value": "2.00E+06", "unit": "sej"},
-        "F": {"value": "1.00E+06", "unit": "sej"},
-    }
+    emergy_totals = EmergyTotals(
+        by_category={"R": 0.0, "N": 2e6, "F": 1e6}, total=3e6
+    )
 
     service = EmergyService(DummyDataSource(dataframe_with_invalid_numeric_data))
 
     with pytest.raises(BadRequestException) as exc:
-        service._calculate_sustainability_indicators(emergy_totals)
+        service.calculate_sustainability_indicators(emergy_totals)
     assert "R ou F igual a 0" in str(exc.value.detail)
 
 
 def test_sustainability_indicators_with_zero_F_raises(
     dataframe_with_invalid_numeric_data,
 ):
-    emergy_totals = {
-        "R": {"value": "1.00E+06", "unit": "sej"},
-        "N": {"value": "2.00E+06", "unit": "sej"},
-        "F": {"value": "0", "unit": "sej"},
-    }
+    emergy_totals = EmergyTotals(
+        by_category={"R": 1e6, "N": 2e6, "F": 0.0}, total=3e6
+    )
 
     service = EmergyService(DummyDataSource(dataframe_with_invalid_numeric_data))
 
     with pytest.raises(BadRequestException) as exc:
-        service._calculate_sustainability_indicators(emergy_totals)
+        service.calculate_sustainability_indicators(emergy_totals)
     assert "R ou F igual a 0" in str(exc.value.detail)
 
 
 def test_classification_of_ESI_correctly_returns_category(valid_input_dataframe):
-    emergy_totals = {
-        "R": {"value": "1.00E+06", "unit": "sej"},
-        "N": {"value": "2.00E+06", "unit": "sej"},
-        "F": {"value": "1.00E+05", "unit": "sej"},
-    }
+    emergy_totals = EmergyTotals(
+        by_category={"R": 1e6, "N": 2e6, "F": 1e5}, total=3.1e6
+    )
 
     service = EmergyService(DummyDataSource(valid_input_dataframe))
-    result = service._calculate_sustainability_indicators(emergy_totals)
+    result = service.calculate_sustainability_indicators(emergy_totals).to_dict()
 
     assert result["ESI"] > 10
     assert result["classification"] == "HIGHLY_SUSTAINABLE"
+
+
+def test_indicators_use_unformatted_totals(valid_input_dataframe):
+    # Com R formatado como "1.00E+06" o ESI cairia para 2.0
+    emergy_totals = EmergyTotals(by_category={"R": 1.004e6, "F": 1e6}, total=2.004e6)
+
+    service = EmergyService(DummyDataSource(valid_input_dataframe))
+    indicators = service.calculate_sustainability_indicators(emergy_totals)
+
+    assert indicators.esi == pytest.approx(2.004 * 1.004)
+    assert indicators.to_dict()["ESI"] == 2.01
+
+
+def test_compute_keeps_full_precision_totals(valid_input_dataframe):
+    service = EmergyService(DummyDataSource(valid_input_dataframe))
+    result = service.compute()
+
+    assert result.totals.by_category == {"F": 1e7, "N": 2e7, "R": 1e7}
+    assert result.totals.total == 4e7
+
+
+def test_calculate_formats_with_requested_precision(valid_input_dataframe):
+    service = EmergyService(DummyDataSource(valid_input_dataframe))
+    result = service.calculate(precision=4)
+
+    assert result["emergy"]["Total"]["value"] == "4.0000E+07"
+
+
+@pytest.fixture
+def dataframe_with_products():
+    return pd.DataFrame(
+        {
+            "Flow Name": ["A", "B", "C", "D", "E"],
+            "Amount": [10, 5, 2, 1, 3],
+            "Unit": ["kg", "kg", "kg", "kg", "kg"],
+            "Flow Direction": ["Input", "Input", "Input", "Input", "Output"],
+            "UEV": [1e6, 2e6, 1e7, 1e6, 1e6],
+            "Category": ["R", "F", "N", "R", "F"],
+            "Product ID": [1, 1, 1, 2, 3],
+        }
+    )
+
+
+def test_calculate_grouped_returns_results_per_group(
+    dataframe_with_products, valid_input_dataframe
+):
+    service = EmergyService(DummyDataSource(dataframe_with_products))
+    results, errors = service.calculate_grouped("Product ID")
+
+    expected = EmergyService(DummyDataSource(valid_input_dataframe)).calculate()
+    assert results[1] == expected
+    assert list(results) == [1]
+
+
+def test_calculate_grouped_reports_errors_per_group(dataframe_with_products):
+    service = EmergyService(DummyDataSource(dataframe_with_products))
+    _, errors = service.calculate_grouped("Product ID")
+
+    assert "R ou F igual a 0" in errors[2]
+    assert "Amount e UEV válidos" in errors[3]
+
+
+def test_calculate_grouped_with_empty_dataframe():
+    service = EmergyService(DummyDataSource(pd.DataFrame()))
+    assert service.calculate_grouped("Product ID") == ({}, {})
+
+
+def test_calculate_uses_result_cache(valid_input_dataframe):
+    cache = EmergyResultCache(max_size=4, ttl_seconds=60)
+    service = EmergyService(DummyDataSource(valid_input_dataframe), result_cache=cache)
+    first = service.calculate()
+
+    with patch.object(EmergyService, "_calculate_emergy") as mock_calculate:
+        second = service.calculate()
+
+    mock_calculate.assert_not_called()
+    assert second == first
+    assert cache.stats()["hits"] == 1
+
+
+def test_calculate_chunks_matches_calculate(valid_input_dataframe):
+    service = EmergyService(DummyDataSource(valid_input_dataframe))
+    chunks = [valid_input_dataframe.iloc[:1], valid_input_dataframe.iloc[1:]]
+    assert service.calculate_chunks(iter(chunks)) == service.calculate()
+
+
+def test_calculate_chunks_with_only_outputs_raises(dataframe_with_only_outputs):
+    service = EmergyService(DummyDataSource(dataframe_with_only_outputs))
+    with pytest.raises(BadRequestException) as exc:
+        service.calculate_chunks([dataframe_with_only_outputs])
+    assert "Nenhuma entrada válida com Flow Direction" in str(exc.value.detail)
+
+
+def test_calculate_chunks_with_invalid_amounts_raises(
+    dataframe_with_invalid_numeric_data,
+):
+    service = EmergyService(DummyDataSource(dataframe_with_invalid_numeric_data))
+    with pytest.raises(BadRequestException) as exc:
+        service.calculate_chunks([dataframe_with_invalid_numeric_data])
+    assert "Nenhuma linha com Amount e UEV válidos." in str(exc.value.detail)
+
+
+def test_iter_compute_chunks_reports_progress_then_result(valid_input_dataframe):
+    service = EmergyService(DummyDataSource(valid_input_dataframe))
+    chunks = [valid_input_dataframe.iloc[:1], valid_input_dataframe.iloc[1:]]
+
+    *progress, result = EmergyService.iter_compute_chunks(iter(chunks))
+
+    assert [item.rows for item in progress] == [1, 3]
+    assert progress[0].totals.by_category == {"R": 1e7}
+    assert progress[1].totals.total == result.totals.total
+    assert result == service.compute()
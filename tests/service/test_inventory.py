@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.exceptions.exceptions import BadRequestException
+from app.service.inventory import (
+    MAX_REPORTED_ROWS,
+    InventoryValidator,
+    is_normalized,
+    normalize_inventory,
+    validate_inventory,
+)
+
+
+@pytest.fixture
+def inventory():
+    return pd.DataFrame(
+        {
+            " Flow Name": ["A", "B", "C", "D"],
+            "Amount": ["10", "20", "5", "1"],
+            "Unit": ["kg", "kg", "kg", "kg"],
+            "Flow Direction ": ["Input", " input", "Output", "INPUT"],
+            "UEV": ["1e6", "2e6", None, "3e6"],
+            "Category": ["r", " F", "N", None],
+        }
+    )
+
+
+def test_validate_inventory_types_and_normalizes_columns(inventory):
+    result = validate_inventory(inventory)
+
+    assert list(result.columns) == [
+        "Flow Name",
+        "Amount",
+        "Unit",
+        "Flow Direction",
+        "UEV",
+        "Category",
+    ]
+    assert result["Amount"].dtype == np.float64
+    assert result["UEV"].dtype == np.float64
+    assert list(result["Flow Direction"].cat.categories) == ["input", "output"]
+    assert result["Flow Direction"].tolist() == ["input", "input", "output", "input"]
+    assert result["Category"].tolist()[:3] == ["R", "F", "N"]
+    assert pd.isna(result["Category"].iloc[3])
+    assert is_normalized(result)
+
+
+def test_validate_inventory_does_not_modify_input(inventory):
+    validate_inventory(inventory)
+    assert inventory["Amount"].tolist() == ["10", "20", "5", "1"]
+    assert "Flow Direction " in inventory.columns
+
+
+def test_normalized_inventory_is_returned_unchanged(inventory):
+    result = validate_inventory(inventory)
+    assert validate_inventory(result) is result
+    assert normalize_inventory(result) is result
+
+
+def test_normalized_types_do_not_skip_validation(inventory):
+    # Mesmos tipos de um inventário normalizado, mas nunca validado
+    inventory["UEV"] = ["1e6", None, None, "3e6"]
+    normalized = normalize_inventory(inventory)
+    assert is_normalized(normalized)
+
+    with pytest.raises(BadRequestException) as exc:
+        validate_inventory(normalized)
+    assert "UEV ausentes para entradas nas linhas: 3" in exc.value.detail
+
+
+def test_is_normalized_rejects_raw_inventory(inventory):
+    assert not is_normalized(inventory)
+    assert not is_normalized(inventory.drop(columns=["Category"]))
+
+
+def test_validate_inventory_reports_invalid_amount_rows(inventory):
+    inventory["Amount"] = ["10", "abc", "5", "x"]
+    with pytest.raises(BadRequestException) as exc:
+        validate_inventory(inventory)
+    assert exc.value.detail == (
+        "Valores inválidos encontrados na coluna 'Amount' nas linhas: 3, 5"
+    )
+
+
+def test_validate_inventory_ignores_invalid_uev_on_outputs(inventory):
+    inventory["UEV"] = ["1e6", "2e6", "abc", "3e6"]
+    result = validate_inventory(inventory)
+    assert np.isnan(result["UEV"].iloc[2])
+
+
+def test_validate_inventory_reports_invalid_uev_before_missing(inventory):
+    inventory["UEV"] = ["1e6", None, None, "abc"]
+    with pytest.raises(BadRequestException) as exc:
+        validate_inventory(inventory)
+    assert exc.value.detail == (
+        "Valores inválidos encontrados na coluna 'UEV' para as entradas nas "
+        "linhas: 5"
+    )
+
+
+def test_validate_inventory_limits_reported_rows():
+    rows = MAX_REPORTED_ROWS + 5
+    df = pd.DataFrame(
+        {
+            "Flow Name": ["f"] * rows,
+            "Amount": [1.0] * rows,
+            "Unit": ["kg"] * rows,
+            "Flow Direction": ["Input"] * rows,
+            "UEV": [None] * rows,
+            "Category": ["R"] * rows,
+        }
+    )
+    with pytest.raises(BadRequestException) as exc:
+        validate_inventory(df)
+    assert exc.value.detail.endswith(f"{MAX_REPORTED_ROWS + 1}, e mais 5")
+
+
+def test_validate_inventory_missing_columns(inventory):
+    with pytest.raises(BadRequestException) as exc:
+        validate_inventory(inventory.drop(columns=["UEV"]))
+    assert "Colunas obrigatórias ausentes: UEV" in exc.value.detail
+
+
+def test_validator_collects_every_issue(inventory):
+    inventory["Amount"] = ["10", "abc", "5", "x"]
+    inventory["Flow Direction "] = ["Input", "Entrada", "Output", None]
+    inventory["UEV"] = ["1e6", None, "abc", None]
+
+    report = InventoryValidator().add_chunks([inventory]).report()
+
+    assert not report.valid
+    assert report.rows == 4
+    assert {issue.code: issue.rows for issue in report.issues} == {
+        "invalid_amount": [3, 5],
+        "missing_uev": [3, 5],
+        "unknown_direction": [3, 5],
+    }
+
+
+def test_validator_warnings_keep_report_valid(inventory):
+    inventory["UEV"] = ["1e6", "2e6", None, "3e6"]
+    report = InventoryValidator().add_chunks([inventory]).report()
+
+    assert report.valid
+    assert [(issue.code, issue.severity) for issue in report.issues] == [
+        ("unknown_category", "warning")
+    ]
+
+
+def test_validator_counts_beyond_listed_rows(inventory):
+    chunks = [
+        inventory.assign(UEV=None),
+        inventory.assign(UEV=None).set_axis(range(4, 8)),
+    ]
+    report = InventoryValidator(max_rows=4).add_chunks(chunks).report()
+
+    missing_uev = next(issue for issue in report.issues if issue.code == "missing_uev")
+    assert missing_uev.count == 6
+    assert missing_uev.rows == [2, 3, 5, 6]
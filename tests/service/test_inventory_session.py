@@ -0,0 +1,144 @@
+import pandas as pd
+import pytest
+from app.exceptions.exceptions import (
+    BadRequestException,
+    NotFoundException,
+    TooManyRequestsException,
+)
+from app.models.inventory_session import InventoryFlow, InventoryFlowUpdate
+from app.service.emergy_service import EmergyService
+from app.service.inventory_session import InventorySessionStore
+
+OWNER = "test@example.com"
+
+
+@pytest.fixture
+def inventory():
+    return pd.DataFrame(
+        {
+            "Flow Name": ["Sol", "Diesel", "Solo", "Produto"],
+            "Amount": [10.0, 5.0, 2.0, 1.0],
+            "Unit": ["J", "kg", "kg", "kg"],
+            "Flow Direction": ["Input", "Input", "Input", "Output"],
+            "UEV": [1e6, 2e6, 1e7, None],
+            "Category": ["R", "F", "N", None],
+        }
+    )
+
+
+@pytest.fixture
+def store():
+    return InventorySessionStore(max_sessions=4, ttl_seconds=60)
+
+
+def recompute(inventory: pd.DataFrame):
+    return EmergyService(None)._compute_dataframe(inventory)
+
+
+def test_session_starts_with_full_calculation(store, inventory):
+    state = store.create(OWNER, inventory).state()
+
+    expected = recompute(inventory)
+    assert state.rows == 4
+    assert state.totals == expected.totals
+    assert state.indicators == expected.indicators
+
+
+def test_changes_match_recalculation(store, inventory):
+    session = store.create(OWNER, inventory)
+
+    flow_id, _ = session.add(
+        InventoryFlow(
+            flow_name="Chuva",
+            amount=4,
+            unit="m3",
+            flow_direction=" Input",
+            uev=5e5,
+            category="r ",
+        )
+    )
+    session.update(2, InventoryFlowUpdate(amount=8))
+    state = session.delete(3)
+
+    inventory.loc[1, "Amount"] = 8.0
+    inventory = inventory.drop(index=2)
+    inventory.loc[len(inventory) + 1] = ["Chuva", 4.0, "m3", "Input", 5e5, "R"]
+    expected = recompute(inventory)
+    assert flow_id == 5
+    assert state.rows == 4
+    assert state.totals.by_category == pytest.approx(expected.totals.by_category)
+    assert state.totals.total == pytest.approx(expected.totals.total)
+    assert state.indicators.classification == expected.indicators.classification
+
+
+def test_removing_last_flow_of_category_drops_it(store, inventory):
+    session = store.create(OWNER, inventory)
+    state = session.update(3, InventoryFlowUpdate(flow_direction="Output"))
+
+    assert "N" not in state.totals.by_category
+    assert session.update(3, InventoryFlowUpdate(flow_direction="Input")).totals == (
+        store.create(OWNER, inventory).state().totals
+    )
+
+
+def test_state_reports_error_when_indicators_are_undefined(store, inventory):
+    state = store.create(OWNER, inventory).delete(2)
+
+    assert state.indicators is None
+    assert "R ou F igual a 0" in state.error
+    assert state.totals.total == pytest.approx(1e7 + 2e7)
+
+
+def test_input_without_uev_is_rejected(store, inventory):
+    session = store.create(OWNER, inventory)
+    with pytest.raises(BadRequestException):
+        session.update(4, InventoryFlowUpdate(flow_direction="Input"))
+    assert session.flows[4].flow_direction == "output"
+
+
+def test_unknown_flow_and_session(store, inventory):
+    session = store.create(OWNER, inventory)
+    with pytest.raises(NotFoundException):
+        session.delete(99)
+    with pytest.raises(NotFoundException):
+        store.get("other@example.com", session.id)
+
+    store.close(OWNER, session.id)
+    with pytest.raises(NotFoundException):
+        store.get(OWNER, session.id)
+
+
+def test_list_flows_is_paginated(store, inventory):
+    session = store.create(OWNER, inventory)
+    flows = session.list_flows(offset=1, limit=2)
+    assert [(flow_id, flow.flow_name) for flow_id, flow in flows] == [
+        (2, "Diesel"),
+        (3, "Solo"),
+    ]
+
+
+def test_store_rejects_sessions_over_the_owner_limit(inventory):
+    store = InventorySessionStore(
+        max_sessions=4, ttl_seconds=60, max_sessions_per_owner=2
+    )
+    first = store.create(OWNER, inventory)
+    store.create(OWNER, inventory)
+
+    with pytest.raises(TooManyRequestsException) as exc:
+        store.create(OWNER, inventory)
+    assert exc.value.headers["Retry-After"] == "60"
+
+    # Outro usuário ainda abre sessões, e fechar uma libera a vaga
+    store.create("other@example.com", inventory)
+    store.close(OWNER, first.id)
+    store.create(OWNER, inventory)
+
+
+def test_store_rejects_instead_of_evicting_when_full(inventory):
+    store = InventorySessionStore(max_sessions=2, ttl_seconds=60)
+    sessions = [store.create(owner, inventory) for owner in ("a", "b")]
+
+    with pytest.raises(TooManyRequestsException):
+        store.create("c", inventory)
+    for session in sessions:
+        assert store.get(session.owner, session.id) is session
@@ -1,9 +1,12 @@
+import asyncio
+import httpx
 import pytest
 import requests
 from unittest.mock import patch, MagicMock
-from app.service.lci_service import LCIService
+from app.service.lci_service import LCIService, AsyncLCIClient, get_settings
 from app.models.lci_models import LCIProduct, LCIFlow
 from app.exceptions.exceptions import LCIServiceException
+from app.core.metrics import LCI_REQUEST_ERRORS, LCI_REQUEST_SECONDS
 
 
 def test_list_products_success():
@@ -11,7 +14,7 @@ def test_list_products_success():
         {"id": 1, "name": "Produto A", "description": "Descricao A"},
         {"id": 2, "name": "Produto B", "description": "Descricao B"},
     ]
-    with patch("app.service.lci_service.requests.get") as mock_get:
+    with patch("app.service.lci_service.http_session.get") as mock_get:
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
         mock_response.json.return_value = fake_products
@@ -26,7 +29,7 @@ def test_list_products_success():
 
 
 def test_list_products_http_error():
-    with patch("app.service.lci_service.requests.get") as mock_get:
+    with patch("app.service.lci_service.http_session.get") as mock_get:
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.HTTPError("HTTP error")
         mock_get.return_value = mock_response
@@ -36,29 +39,35 @@ def test_list_products_http_error():
             service.list_products()
 
 
+FAKE_FLOWS = [
+    {
+        "Flow Name": "Eletricidade (hidrelétrica)",
+        "Amount": 0.1,
+        "Unit": "MJ",
+        "Flow Direction": "Input",
+        "UEV": 123,
+        "Category": "F",
+    },
+    {
+        "Flow Name": "Cavacos de madeira",
+        "Amount": 0.2,
+        "Unit": "ton",
+        "Flow Direction": "Input",
+        "UEV": 456,
+        "Category": "R",
+    },
+]
+
+
+def mock_lci_client(handler) -> AsyncLCIClient:
+    return AsyncLCIClient(get_settings(), transport=httpx.MockTransport(handler))
+
+
 def test_get_flows_by_product_id_success():
-    fake_flows = [
-        {
-            "Flow Name": "Eletricidade (hidrelétrica)",
-            "Amount": 0.1,
-            "Unit": "MJ",
-            "Flow Direction": "Input",
-            "UEV": 123,
-            "Category": "F",
-        },
-        {
-            "Flow Name": "Cavacos de madeira",
-            "Amount": 0.2,
-            "Unit": "ton",
-            "Flow Direction": "Input",
-            "UEV": 456,
-            "Category": "R",
-        },
-    ]
-    with patch("app.service.lci_service.requests.get") as mock_get:
+    with patch("app.service.lci_service.http_session.get") as mock_get:
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
-        mock_response.json.return_value = fake_flows
+        mock_response.json.return_value = FAKE_FLOWS
         mock_get.return_value = mock_response
 
         service = LCIService()
@@ -70,7 +79,7 @@ def test_get_flows_by_product_id_success():
 
 
 def test_get_flows_by_product_id_http_error():
-    with patch("app.service.lci_service.requests.get") as mock_get:
+    with patch("app.service.lci_service.http_session.get") as mock_get:
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.HTTPError("HTTP error")
         mock_get.return_value = mock_response
@@ -78,3 +87,101 @@ def test_get_flows_by_product_id_http_error():
         service = LCIService()
         with pytest.raises(LCIServiceException):
             service.get_flows_by_product_id(1)
+
+
+def test_list_products_async_success():
+    fake_products = [{"id": 1, "name": "Produto A", "description": "Descricao A"}]
+    lci_client = mock_lci_client(
+        lambda request: httpx.Response(200, json=fake_products)
+    )
+    with patch("app.service.lci_service.async_http_client", lci_client):
+        result = asyncio.run(LCIService().list_products_async())
+        assert result == [LCIProduct(**fake_products[0])]
+
+
+def test_get_flows_by_product_id_async_success():
+    requested_urls = []
+
+    def handler(request):
+        requested_urls.append(str(request.url))
+        return httpx.Response(200, json=FAKE_FLOWS)
+
+    with patch("app.service.lci_service.async_http_client", mock_lci_client(handler)):
+        result = asyncio.run(LCIService().get_flows_by_product_id_async(7))
+        assert requested_urls[0].endswith("/products/7")
+        assert result[1].flow_name == "Cavacos de madeira"
+
+
+def test_get_flows_by_product_id_async_http_error():
+    lci_client = mock_lci_client(lambda request: httpx.Response(404, text="Not found"))
+    with patch("app.service.lci_service.async_http_client", lci_client):
+        with pytest.raises(LCIServiceException) as exc:
+            asyncio.run(LCIService().get_flows_by_product_id_async(1))
+        assert exc.value.status_code == 502
+        assert exc.value.upstream_status == 404
+        assert exc.value.detail == "Not found"
+
+
+def test_get_flows_by_product_id_async_timeout():
+    def handler(request):
+        raise httpx.ReadTimeout("timeout", request=request)
+
+    with patch("app.service.lci_service.async_http_client", mock_lci_client(handler)):
+        with pytest.raises(LCIServiceException) as exc:
+            asyncio.run(LCIService().get_flows_by_product_id_async(1))
+        assert exc.value.status_code == 502
+
+
+def test_async_lci_client_limits_concurrency():
+    active = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return httpx.Response(200, json=[])
+
+    lci_client = mock_lci_client(handler)
+    lci_client.max_concurrency = 2
+
+    async def run():
+        await asyncio.gather(*(lci_client.get("http://lci/products") for _ in range(6)))
+        await lci_client.aclose()
+
+    asyncio.run(run())
+    assert peak == 2
+
+
+def test_get_flows_records_latency_and_errors():
+    errors_before = LCI_REQUEST_ERRORS.value(operation="get_flows", status=503)
+    calls_before = LCI_REQUEST_SECONDS.count(operation="get_flows")
+    with patch("app.service.lci_service.http_session.get") as mock_get:
+        mock_response = MagicMock()
+        mock_response.status_code = 503
+        mock_response.raise_for_status.side_effect = requests.HTTPError(
+            response=mock_response
+        )
+        mock_get.return_value = mock_response
+
+        with pytest.raises(LCIServiceException):
+            LCIService().get_flows_by_product_id(1)
+
+    assert LCI_REQUEST_ERRORS.value(operation="get_flows", status=503) == (
+        errors_before + 1
+    )
+    assert LCI_REQUEST_SECONDS.count(operation="get_flows") == calls_before + 1
+
+
+def test_async_lci_client_closes_client_from_previous_loop():
+    lci_client = mock_lci_client(lambda request: httpx.Response(200, json=[]))
+
+    asyncio.run(lci_client.get("http://lci.test/products"))
+    first_client = lci_client._client
+    asyncio.run(lci_client.get("http://lci.test/products"))
+
+    assert first_client.is_closed
+    assert lci_client._client is not first_client
+    asyncio.run(lci_client.aclose())
@@ -0,0 +1,208 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from pydantic import ValidationError
+from app.exceptions.exceptions import BadRequestException
+from app.models.scenario_models import ScenarioRequest
+from app.service.emergy_service import EmergyService
+from app.models.sustainability_classification import ESI_CLASSES, ESI_THRESHOLDS
+from app.service.scenario_service import ScenarioService
+
+
+@pytest.fixture
+def inventory():
+    return pd.DataFrame(
+        {
+            "Flow Name": ["Sol", "Diesel", "Solo", "Produto", "Chuva", "Diesel"],
+            "Amount": [10.0, 5.0, 2.0, 1.0, 3.0, 1.0],
+            "Unit": ["J", "kg", "kg", "kg", "m3", "kg"],
+            "Flow Direction": ["Input", "Input", "Input", "Output", "Input", "Input"],
+            "UEV": [1e6, 2e6, 1e7, None, 1e5, 1e6],
+            "Category": ["R", "F", "N", None, None, "F"],
+        }
+    )
+
+
+def scenario_request(**values) -> ScenarioRequest:
+    return ScenarioRequest.model_validate(values)
+
+
+def test_base_matches_emergy_service(inventory):
+    analysis = ScenarioService(inventory).analyze(
+        scenario_request(scenarios=[{"overrides": [{"flow": "Sol", "amount": 10}]}])
+    )
+
+    expected = EmergyService(None)._compute_dataframe(inventory)
+    assert analysis.base.totals.by_category == pytest.approx(
+        expected.totals.by_category
+    )
+    assert analysis.base.totals.total == pytest.approx(expected.totals.total)
+    assert analysis.base.indicators.classification == (
+        expected.indicators.classification
+    )
+    assert analysis.scenarios[0].result == analysis.base
+
+
+def test_overrides_apply_to_every_row_of_the_flow(inventory):
+    analysis = ScenarioService(inventory).analyze(
+        scenario_request(
+            scenarios=[
+                {"name": "valor", "overrides": [{"flow": "Diesel", "amount": 2}]},
+                {
+                    "name": "fatores",
+                    "overrides": [
+                        {"flow": "Diesel", "uev_factor": 0.5},
+                        {"flow": "Sol", "amount_factor": 2, "uev": 2e6},
+                    ],
+                },
+            ]
+        )
+    )
+
+    by_name = {outcome.name: outcome.result for outcome in analysis.scenarios}
+    assert by_name["valor"].totals.by_category["F"] == pytest.approx(2 * 2e6 + 2 * 1e6)
+    assert by_name["fatores"].totals.by_category == pytest.approx(
+        {"F": 5.5e6, "N": 2e7, "R": 4e7}
+    )
+    # Linhas sem categoria entram apenas no total
+    assert by_name["fatores"].totals.total == pytest.approx(5.5e6 + 2e7 + 4e7 + 3e5)
+
+
+def test_scenario_without_f_reports_error(inventory):
+    analysis = ScenarioService(inventory).analyze(
+        scenario_request(
+            scenarios=[
+                {"name": "sem F", "overrides": [{"flow": "Diesel", "amount": 0}]}
+            ]
+        )
+    )
+
+    outcome = analysis.scenarios[0]
+    assert outcome.result is None
+    assert "R ou F igual a 0" in outcome.error
+
+
+def test_unknown_flow_is_rejected(inventory):
+    with pytest.raises(BadRequestException) as exc:
+        ScenarioService(inventory).analyze(
+            scenario_request(
+                scenarios=[{"overrides": [{"flow": "Produto", "amount": 1}]}]
+            )
+        )
+    assert "Produto" in exc.value.detail
+
+
+def test_monte_carlo_is_reproducible_with_seed(inventory):
+    request = scenario_request(
+        monte_carlo={
+            "iterations": 2000,
+            "seed": 42,
+            "distributions": [
+                {"flow": "Diesel", "kind": "lognormal", "sd": 1.2},
+                {
+                    "flow": "Sol",
+                    "field": "amount",
+                    "kind": "uniform",
+                    "low": 0.5,
+                    "high": 1.5,
+                },
+            ],
+        }
+    )
+    service = ScenarioService(inventory)
+    first = service.analyze(request).monte_carlo
+    second = service.analyze(request).monte_carlo
+
+    assert first == second
+    assert first.iterations == 2000
+    assert first.failed_iterations == 0
+    assert first.emergy["N"].std == 0
+    assert first.emergy["R"].min >= 0.5 * 1e7
+    assert first.emergy["R"].max <= 1.5 * 1e7
+    assert first.emergy["F"].p50 == pytest.approx(1.1e7, rel=0.05)
+    assert sum(first.classification.values()) == pytest.approx(1)
+
+
+def test_monte_carlo_counts_failed_iterations(inventory):
+    analysis = ScenarioService(inventory).analyze(
+        scenario_request(
+            monte_carlo={
+                "iterations": 10,
+                "distributions": [
+                    {"flow": "Diesel", "kind": "uniform", "low": 0, "high": 0}
+                ],
+            }
+        )
+    )
+
+    assert analysis.monte_carlo.failed_iterations == 10
+    assert analysis.monte_carlo.indicators == {}
+
+
+def test_monte_carlo_classification_shares_ignore_failed_iterations(inventory):
+    service = ScenarioService(inventory)
+    indicators = service._indicators
+
+    def half_failed(totals):
+        eyr, elr, esi, valid = indicators(totals)
+        return eyr, elr, esi, valid & (np.arange(len(valid)) % 2 == 0)
+
+    with patch.object(service, "_indicators", side_effect=half_failed):
+        summary = service.analyze(
+            scenario_request(
+                monte_carlo={
+                    "iterations": 10,
+                    "distributions": [{"flow": "Sol", "kind": "normal", "sd": 0.1}],
+                }
+            )
+        ).monte_carlo
+
+    assert summary.failed_iterations == 5
+    assert sum(summary.classification.values()) == pytest.approx(1)
+
+
+def test_esi_classes_match_classify_esi():
+    for esi in (0.05, 0.1, 0.5, 1, 5, 10, 50):
+        index = np.searchsorted(ESI_THRESHOLDS, esi)
+        assert ESI_CLASSES[index] == EmergyService.classify_esi(esi)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        {},
+        {"scenarios": [{"overrides": [{"flow": "Sol"}]}]},
+        {
+            "scenarios": [
+                {"overrides": [{"flow": "Sol", "amount": 1, "amount_factor": 2}]}
+            ]
+        },
+        {
+            "scenarios": [
+                {
+                    "overrides": [
+                        {"flow": "Sol", "amount": 1},
+                        {"flow": "Sol ", "uev": 2},
+                    ]
+                }
+            ]
+        },
+        {"monte_carlo": {"distributions": [{"flow": "Sol", "kind": "normal"}]}},
+        {
+            "monte_carlo": {
+                "distributions": [{"flow": "Sol", "kind": "lognormal", "sd": 0.5}]
+            }
+        },
+        {
+            "monte_carlo": {
+                "distributions": [
+                    {"flow": "Sol", "kind": "triangular", "low": 1.2, "high": 2}
+                ]
+            }
+        },
+    ],
+)
+def test_invalid_requests_are_rejected(values):
+    with pytest.raises(ValidationError):
+        ScenarioRequest.model_validate(values)
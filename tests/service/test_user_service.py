@@ -1,10 +1,23 @@
+import asyncio
 import pytest
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 from unittest.mock import patch, MagicMock
-from app.service.user_service import UserService
+from app.db.database import create_async_db_engine, create_db_engine
+from app.db.models import User
+from app.service.user_service import UserService, get_user_cache
 from app.exceptions.exceptions import BadRequestException
 from app.models.authentication import RegisterRequest
 
 
+@pytest.fixture(autouse=True)
+def user_cache():
+    cache = get_user_cache()
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
 @pytest.fixture
 def mock_session():
     return MagicMock()
@@ -21,6 +34,17 @@ def register_request():
     )
 
 
+def make_user(email="test@example.com"):
+    return User(
+        id=1,
+        name="Test",
+        surname="User",
+        email=email,
+        hashed_password="hashed",
+        mobile_number="11999999999",
+    )
+
+
 def test_get_user_by_email_found(mock_session):
     fake_user = MagicMock()
     with patch(
@@ -63,3 +87,70 @@ def test_create_user_email_exists(mock_session, register_request):
         with pytest.raises(BadRequestException) as exc:
             service.create_user(register_request)
         assert "Email já está em uso" in str(exc.value)
+
+
+def test_get_user_by_email_uses_cache(mock_session, user_cache):
+    with patch(
+        "app.service.user_service.get_user_by_email", return_value=make_user()
+    ) as mock_get:
+        service = UserService(mock_session)
+        service.get_user_by_email("test@example.com")
+        user = UserService(MagicMock()).get_user_by_email("test@example.com")
+
+    mock_get.assert_called_once()
+    assert user.email == "test@example.com"
+    assert user.hashed_password == "hashed"
+    assert UserService.cache_stats()["hits"] == 1
+
+
+def test_get_user_by_email_does_not_cache_missing_user(mock_session):
+    with patch(
+        "app.service.user_service.get_user_by_email", return_value=None
+    ) as mock_get:
+        service = UserService(mock_session)
+        service.get_user_by_email("notfound@example.com")
+        service.get_user_by_email("notfound@example.com")
+
+    assert mock_get.call_count == 2
+
+
+def test_create_user_invalidates_cached_user(
+    mock_session, register_request, user_cache
+):
+    user_cache.set(register_request.email, make_user("antigo@example.com"))
+    with (
+        patch.object(user_cache, "get", return_value=None),
+        patch("app.service.user_service.get_user_by_email", return_value=None),
+        patch("app.service.user_service.create_user", return_value=make_user()),
+    ):
+        UserService(mock_session).create_user(register_request)
+
+    assert user_cache.get(register_request.email) is None
+
+
+def test_async_user_store_round_trip(tmp_path, register_request):
+    url = f"sqlite:///{tmp_path / 'users.db'}"
+    sync_engine = create_db_engine(url)
+    SQLModel.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+    engine = create_async_db_engine(url)
+
+    async def scenario():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            created = await UserService(session).create_user_async(register_request)
+        async with AsyncSession(engine) as session:
+            found = await UserService(session).get_user_by_email_async(
+                register_request.email
+            )
+            with pytest.raises(BadRequestException):
+                await UserService(session).create_user_async(register_request)
+        await engine.dispose()
+        return created, found
+
+    with patch(
+        "app.service.user_service.generate_password_hash", return_value="hashed"
+    ):
+        created, found = asyncio.run(scenario())
+
+    assert created.id == found.id
+    assert found.hashed_password == "hashed"